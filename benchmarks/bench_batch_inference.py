@@ -0,0 +1,57 @@
+"""
+Benchmark de inferencia por lotes de DonutAdapter.
+
+Mide páginas/segundo de ``extract_text_batch`` con distintos tamaños de lote.
+
+Uso:
+    python benchmarks/bench_batch_inference.py documento.pdf --pages 8
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from pdf2image import convert_from_path  # noqa: E402
+
+from config.settings import Settings  # noqa: E402
+from infrastructure.donut_adapter import DonutAdapter  # noqa: E402
+
+
+def run(pdf_path: Path, pages: int, batch_sizes: list, repeats: int) -> None:
+    settings = Settings()
+    adapter = DonutAdapter(settings)
+    images = [
+        image.convert("RGB")
+        for image in convert_from_path(
+            pdf_path, dpi=settings.pdf_dpi, first_page=1, last_page=pages
+        )
+    ]
+
+    # Calentamiento para no medir la primera inferencia
+    adapter.extract_text_batch(images[:1])
+
+    print(f"{'batch':>6} {'pages':>6} {'seconds':>9} {'pages/s':>9}")
+    for batch_size in batch_sizes:
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for i in range(0, len(images), batch_size):
+                adapter.extract_text_batch(images[i:i + batch_size])
+            best = min(best, time.perf_counter() - start)
+        print(f"{batch_size:>6} {len(images):>6} {best:>9.2f} {len(images) / best:>9.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("pdf", type=Path)
+    parser.add_argument("--pages", type=int, default=8)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeats", type=int, default=2)
+    args = parser.parse_args()
+    run(args.pdf, args.pages, args.batch_sizes, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Microbenchmark del caché en disco frente a Redis.
+
+Mide la latencia media de ``set`` y de ``get`` (acierto) de ``DiskCache``
+y de ``RedisCache`` con documentos del mismo tamaño. Sin ``--redis-url``,
+RedisCache usa fakeredis como sustituto en memoria.
+
+Uso:
+    python benchmarks/bench_disk_cache.py --path /tmp/ocr-llm/bench.db
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from infrastructure.disk_cache import DiskCache  # noqa: E402
+from infrastructure.redis_cache import RedisCache  # noqa: E402
+
+
+def build_redis(redis_url: str) -> RedisCache:
+    """RedisCache real o sobre fakeredis"""
+    if redis_url:
+        return RedisCache(redis_url)
+    import fakeredis.aioredis
+
+    cache = RedisCache("redis://localhost:6379/0")
+    cache.client = fakeredis.aioredis.FakeRedis()
+    return cache
+
+
+async def measure(cache, document: dict, entries: int) -> tuple:
+    """Latencia media en microsegundos de set y get"""
+    keys = [f"ocr:document:bench:{n}" for n in range(entries)]
+
+    start = time.perf_counter()
+    for key in keys:
+        await cache.set(key, document)
+    write = (time.perf_counter() - start) / entries * 1e6
+
+    start = time.perf_counter()
+    for key in keys:
+        await cache.get(key)
+    read = (time.perf_counter() - start) / entries * 1e6
+
+    await cache.delete_matching("ocr:document:bench:*")
+    return write, read
+
+
+async def run(redis_url: str, path: str, pages: int, entries: int) -> None:
+    document = {
+        "name": "bench.pdf",
+        "pages": [{"number": n, "raw_text": "lorem ipsum " * 200} for n in range(pages)],
+        "metadata": {"ocr_engine": "donut"}
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        disk = DiskCache(Path(path) if path else Path(tmp) / "bench.db")
+        redis_cache = build_redis(redis_url)
+
+        results = {
+            "DiskCache": await measure(disk, document, entries),
+            "RedisCache": await measure(redis_cache, document, entries)
+        }
+        await disk.close()
+        await redis_cache.close()
+
+    print(f"document pages     {pages}")
+    print(f"{'backend':<18} {'set (us)':>10} {'get (us)':>10}")
+    for name, (write, read) in results.items():
+        print(f"{name:<18} {write:10.1f} {read:10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--redis-url", default="")
+    parser.add_argument("--path", default="", help="Archivo SQLite (por defecto, temporal)")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--entries", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.redis_url, args.path, args.pages, args.entries))
+
+
+if __name__ == "__main__":
+    main()
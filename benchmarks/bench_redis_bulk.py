@@ -0,0 +1,123 @@
+"""
+Benchmark de operaciones en bloque y codificación de RedisCache.
+
+Reporta, para un conjunto de páginas:
+- bytes almacenados con JSON plano frente a CacheCodec
+- viajes de red y tiempo de get/set clave a clave frente a get_many/set_many
+
+Sin ``--redis-url`` usa fakeredis como sustituto en memoria.
+
+Uso:
+    python benchmarks/bench_redis_bulk.py --pages 300
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from infrastructure.cache_codec import CacheCodec  # noqa: E402
+from infrastructure.redis_cache import RedisCache  # noqa: E402
+
+
+class CountingClient:
+    """Proxy del cliente Redis que cuenta los viajes de red"""
+
+    def __init__(self, client):
+        self._client = client
+        self.round_trips = 0
+
+    def pipeline(self, *args, **kwargs):
+        pipe = self._client.pipeline(*args, **kwargs)
+        execute = pipe.execute
+
+        async def counted_execute(*a, **k):
+            self.round_trips += 1
+            return await execute(*a, **k)
+
+        pipe.execute = counted_execute
+        return pipe
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+
+        async def counted(*args, **kwargs):
+            self.round_trips += 1
+            return await attr(*args, **kwargs)
+
+        return counted
+
+
+def build_cache(redis_url: str) -> RedisCache:
+    """RedisCache real o sobre fakeredis, con el cliente instrumentado"""
+    cache = RedisCache(redis_url or "redis://localhost:6379/0")
+    if not redis_url:
+        import fakeredis.aioredis
+
+        cache.client = fakeredis.aioredis.FakeRedis()
+    cache.client = CountingClient(cache.client)
+    return cache
+
+
+async def timed(cache: RedisCache, coro) -> tuple:
+    """Ejecuta una operación y devuelve (segundos, viajes de red)"""
+    cache.client.round_trips = 0
+    start = time.perf_counter()
+    await coro
+    return time.perf_counter() - start, cache.client.round_trips
+
+
+async def run(redis_url: str, pages: int) -> None:
+    cache = build_cache(redis_url)
+    items = {
+        f"ocr:page:bench:{n}": f"Página {n}. " + "Texto extraído de ejemplo. " * 80
+        for n in range(pages)
+    }
+    keys = list(items)
+
+    json_bytes = sum(len(json.dumps(v).encode()) for v in items.values())
+    codec_bytes = sum(len(CacheCodec().encode(v)) for v in items.values())
+
+    async def set_each():
+        for key, value in items.items():
+            await cache.set(key, value)
+
+    async def get_each():
+        for key in keys:
+            await cache.get(key)
+
+    set_single = await timed(cache, set_each())
+    get_single = await timed(cache, get_each())
+    set_bulk = await timed(cache, cache.set_many(items))
+    get_bulk = await timed(cache, cache.get_many(keys))
+
+    print(f"pages                  {pages}")
+    print(f"bytes json             {json_bytes}")
+    print(f"bytes codec            {codec_bytes} ({codec_bytes / json_bytes:.0%})")
+    print(f"{'operation':<22} {'seconds':>9} {'round trips':>12}")
+    for name, (seconds, trips) in (
+        ("set (one by one)", set_single),
+        ("set_many", set_bulk),
+        ("get (one by one)", get_single),
+        ("get_many", get_bulk)
+    ):
+        print(f"{name:<22} {seconds:>9.4f} {trips:>12}")
+
+    await cache.client._client.delete(*keys)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--redis-url", default="")
+    parser.add_argument("--pages", type=int, default=300)
+    args = parser.parse_args()
+    asyncio.run(run(args.redis_url, args.pages))
+
+
+if __name__ == "__main__":
+    main()
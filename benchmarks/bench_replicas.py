@@ -0,0 +1,77 @@
+"""
+Benchmark de escalado de ReplicaPool con el número de réplicas.
+
+Mide páginas/segundo de ``process_pages`` sobre las mismas páginas con
+distintos números de réplicas. En un host con muchos núcleos, cada réplica
+recibe un grupo de núcleos propio; la comparación con 1 réplica muestra
+cuánto se gana al evitar la contención por el GIL y el pool intra-op.
+
+Uso:
+    python benchmarks/bench_replicas.py documento.pdf --pages 32 --replicas 1,2,4,8
+"""
+import argparse
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from pdf2image import convert_from_path  # noqa: E402
+
+from config.settings import Settings  # noqa: E402
+from infrastructure.donut_adapter import DonutAdapter  # noqa: E402
+from infrastructure.replica_pool import ReplicaPool  # noqa: E402
+from infrastructure.thread_budget import available_cores  # noqa: E402
+
+
+def run(pdf_path: Path, pages: int, replica_counts: list, pin_cores: bool) -> None:
+    # Sin omitir páginas en blanco: todas las páginas pasan por el modelo
+    settings = Settings(skip_blank_pages=False)
+    images = [
+        image.convert("RGB")
+        for image in convert_from_path(
+            pdf_path, dpi=settings.pdf_dpi, first_page=1, last_page=pages
+        )
+    ]
+
+    print(f"cores {len(available_cores())}, pages {len(images)}, batch {settings.inference_batch_size}")
+    print(f"{'replicas':>8} {'seconds':>9} {'pages/s':>9} {'speedup':>8}")
+    baseline = None
+    for count in replica_counts:
+        pool = ReplicaPool(
+            settings,
+            adapter_factory=partial(DonutAdapter, settings),
+            replica_count=count,
+            pin_cores=pin_cores
+        )
+        try:
+            pool.warmup()
+            start = time.perf_counter()
+            pool.process_pages(images)
+            elapsed = time.perf_counter() - start
+        finally:
+            pool.close()
+
+        throughput = len(images) / elapsed
+        baseline = baseline or throughput
+        print(f"{count:>8} {elapsed:>9.2f} {throughput:>9.2f} {throughput / baseline:>7.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("pdf", type=Path)
+    parser.add_argument("--pages", type=int, default=32)
+    parser.add_argument("--replicas", default="1,2,4,8")
+    parser.add_argument("--no-pin", action="store_true", help="No fijar las réplicas a núcleos")
+    args = parser.parse_args()
+    run(
+        args.pdf,
+        args.pages,
+        [int(count) for count in args.replicas.split(",")],
+        pin_cores=not args.no_pin
+    )
+
+
+if __name__ == "__main__":
+    main()
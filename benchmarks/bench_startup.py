@@ -0,0 +1,87 @@
+"""
+Benchmark de tiempo de arranque de la CLI y de la API.
+
+Mide:
+- ``ocr-llm --help``: coste de importar la CLI sin cargar el modelo
+- importación de la aplicación FastAPI
+- tiempo hasta que la API responde en /health y en /ready (modelo cargado
+  y calentado)
+
+Uso:
+    python benchmarks/bench_startup.py --runs 5 --port 8099
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+ENV = {**os.environ, "PYTHONPATH": os.pathsep.join([str(ROOT / "src"), str(ROOT)])}
+
+
+def time_command(args: list, runs: int) -> float:
+    """Mediana del tiempo de pared de un comando"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(args, env=ENV, cwd=ROOT, check=True, capture_output=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def wait_for(url: str, timeout: float) -> float:
+    """Segundos hasta que la URL responde 200"""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - start
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(url)
+
+
+def time_api(port: int, timeout: float) -> tuple:
+    """Tiempo hasta /health y hasta /ready de un servidor uvicorn nuevo"""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.interfaces.api.app:app", "--port", str(port)],
+        env=ENV, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        start = time.perf_counter()
+        health = wait_for(f"http://127.0.0.1:{port}/health", timeout)
+        ready = wait_for(f"http://127.0.0.1:{port}/ready", timeout - health)
+        return health, health + ready, time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    args = parser.parse_args()
+
+    cli = time_command([sys.executable, "-m", "interfaces.cli", "--help"], args.runs)
+    api_import = time_command(
+        [sys.executable, "-c", "import src.interfaces.api.app"], args.runs
+    )
+    health, ready, _ = time_api(args.port, args.timeout)
+
+    print(f"cli --help        {cli:8.2f}s")
+    print(f"api import        {api_import:8.2f}s")
+    print(f"api /health       {health:8.2f}s")
+    print(f"api /ready        {ready:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
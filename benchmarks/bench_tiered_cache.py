@@ -0,0 +1,74 @@
+"""
+Microbenchmark de latencia de un acierto en caché caliente.
+
+Compara ``RedisCache.get`` con ``TieredCache.get`` sobre la misma clave.
+Sin ``--redis-url`` usa fakeredis como sustituto en memoria (sin red, así
+que la diferencia medida es solo la deserialización y el cliente).
+
+Uso:
+    python benchmarks/bench_tiered_cache.py --redis-url redis://localhost:6379/0
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from infrastructure.redis_cache import RedisCache  # noqa: E402
+from infrastructure.tiered_cache import TieredCache  # noqa: E402
+
+
+def build_backend(redis_url: str) -> RedisCache:
+    """RedisCache real o sobre fakeredis"""
+    if redis_url:
+        return RedisCache(redis_url)
+    import fakeredis.aioredis
+
+    cache = RedisCache("redis://localhost:6379/0")
+    cache.client = fakeredis.aioredis.FakeRedis()
+    return cache
+
+
+async def measure(cache, key: str, iterations: int) -> float:
+    """Latencia media en microsegundos de get sobre una clave caliente"""
+    await cache.get(key)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await cache.get(key)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def run(redis_url: str, pages: int, iterations: int) -> None:
+    backend = build_backend(redis_url)
+    document = {
+        "name": "bench.pdf",
+        "pages": [{"number": n, "raw_text": "lorem ipsum " * 200} for n in range(pages)],
+        "metadata": {"ocr_engine": "donut"}
+    }
+    key = "ocr:document:bench"
+    await backend.set(key, document)
+
+    remote = await measure(backend, key, iterations)
+    tiered = await measure(TieredCache(backend), key, iterations)
+
+    print(f"document pages     {pages}")
+    print(f"RedisCache.get     {remote:10.1f} us")
+    print(f"TieredCache.get    {tiered:10.1f} us")
+    print(f"speedup            {remote / tiered:10.1f}x")
+    await backend.delete(key)
+    await backend.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--redis-url", default="")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.redis_url, args.pages, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
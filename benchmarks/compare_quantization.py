@@ -0,0 +1,90 @@
+"""
+Compara precisión y velocidad del motor int8 frente a fp32.
+
+El directorio de fixtures contiene imágenes de página (``.png``/``.jpg``) y,
+opcionalmente, su transcripción de referencia en un ``.txt`` con el mismo
+nombre. Se reporta el CER (character error rate) de cada motor contra la
+referencia y el CER de int8 tomando la salida fp32 como referencia.
+
+Uso:
+    python benchmarks/compare_quantization.py fixtures/pages
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from PIL import Image  # noqa: E402
+
+from config.settings import Settings  # noqa: E402
+from infrastructure.donut_adapter import DonutAdapter  # noqa: E402
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg"}
+
+
+def levenshtein(a: str, b: str) -> int:
+    """Distancia de edición entre dos cadenas"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        previous = current
+    return previous[-1]
+
+
+def cer(prediction: str, reference: str) -> float:
+    """Character error rate de una predicción respecto a la referencia"""
+    return levenshtein(prediction, reference) / max(len(reference), 1)
+
+
+def run_engine(engine: str, images: list) -> tuple:
+    """Ejecuta el OCR con un motor y devuelve (textos, segundos por página)"""
+    adapter = DonutAdapter(Settings(inference_engine=engine))
+    adapter.extract_text(images[0])  # calentamiento
+    start = time.perf_counter()
+    texts = [adapter.extract_text(image) for image in images]
+    return texts, (time.perf_counter() - start) / len(images)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("fixtures", type=Path)
+    args = parser.parse_args()
+
+    paths = sorted(p for p in args.fixtures.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    if not paths:
+        parser.error(f"No hay imágenes en {args.fixtures}")
+    images = [Image.open(p).convert("RGB") for p in paths]
+    references = {
+        p: p.with_suffix(".txt").read_text(encoding="utf-8").strip()
+        for p in paths if p.with_suffix(".txt").exists()
+    }
+
+    fp32_texts, fp32_latency = run_engine("fp32", images)
+    int8_texts, int8_latency = run_engine("int8", images)
+
+    print(f"{'engine':>6} {'s/page':>8} {'CER ref':>8}")
+    for engine, texts, latency in (
+        ("fp32", fp32_texts, fp32_latency),
+        ("int8", int8_texts, int8_latency)
+    ):
+        scores = [cer(text, references[p]) for p, text in zip(paths, texts) if p in references]
+        score = f"{sum(scores) / len(scores):8.4f}" if scores else f"{'-':>8}"
+        print(f"{engine:>6} {latency:>8.3f} {score}")
+
+    drift = sum(cer(q, f) for q, f in zip(int8_texts, fp32_texts)) / len(paths)
+    print(f"\nCER int8 vs fp32: {drift:.4f}")
+    print(f"speedup int8: {fp32_latency / int8_latency:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
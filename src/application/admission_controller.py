@@ -0,0 +1,158 @@
+"""
+Control de admisión: rechaza trabajo que no se podría terminar a tiempo.
+"""
+import asyncio
+import math
+import time
+from typing import Callable, Optional
+
+import structlog
+
+from domain.exceptions import OverloadedError
+
+logger = structlog.get_logger(__name__)
+
+# Motivos de rechazo
+QUEUE_FULL = "queue_full"
+DRAIN_TIME = "drain_time"
+
+class AdmissionController:
+    """
+    Decide si el proceso acepta un documento más.
+
+    Lleva la cuenta de las páginas admitidas y aún sin terminar y estima el
+    ritmo al que se vacían (páginas por segundo) con una media móvil
+    exponencial (EWMA) del rendimiento observado. Un documento se rechaza
+    si con él se superaría ``max_inflight_pages`` ("queue_full") o si el
+    tiempo estimado para terminar todo lo admitido superaría
+    ``max_wait_seconds`` ("drain_time"). El rechazo indica cuándo volver a
+    intentarlo: el tiempo que tardaría en vaciarse el exceso.
+
+    Con el proceso ocioso se admite siempre, aunque el documento por sí
+    solo supere los límites, para que ningún documento quede sin servicio.
+    Un límite a 0 se desactiva.
+    """
+
+    def __init__(
+        self,
+        max_inflight_pages: float = 500,
+        max_wait_seconds: float = 300.0,
+        initial_pages_per_second: float = 1.0,
+        smoothing: float = 0.2,
+        cost_estimator: Optional[Callable[[str], float]] = None,
+        on_update: Optional[Callable[["AdmissionController"], None]] = None,
+        on_rejected: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Args:
+            max_inflight_pages: Páginas admitidas y sin terminar como máximo
+            max_wait_seconds: Tiempo estimado de vaciado máximo
+            initial_pages_per_second: Ritmo supuesto hasta tener mediciones
+            smoothing: Peso de cada medición nueva en la EWMA (0-1)
+            cost_estimator: Estima las páginas de un documento a partir de su
+                            ruta; es bloqueante y se ejecuta en un hilo
+            on_update: Se llama tras cada cambio (ej: para publicar métricas)
+            on_rejected: Se llama con el motivo de cada rechazo
+        """
+        self.max_inflight_pages = max_inflight_pages
+        self.max_wait_seconds = max_wait_seconds
+        self.smoothing = min(1.0, max(0.0, smoothing))
+        self.cost_estimator = cost_estimator
+        self.on_update = on_update
+        self.on_rejected = on_rejected
+        self.drain_rate = max(initial_pages_per_second, 1e-3)
+        self.inflight_pages = 0.0
+        self.inflight_requests = 0
+        # Inicio del intervalo de la próxima medición del ritmo
+        self._measure_since: Optional[float] = None
+
+    @property
+    def estimated_wait(self) -> float:
+        """Segundos estimados para terminar todo lo admitido"""
+        return self.inflight_pages / self.drain_rate
+
+    async def estimate(self, path: str) -> float:
+        """
+        Estima las páginas de un documento.
+
+        Args:
+            path: Ruta al documento
+
+        Returns:
+            float: Páginas equivalentes (1 si no hay estimador)
+        """
+        if self.cost_estimator is None:
+            return 1.0
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.cost_estimator, path)
+
+    def admit(self, pages: float):
+        """
+        Admite trabajo o lo rechaza si no se podría atender a tiempo.
+
+        Args:
+            pages: Páginas equivalentes del trabajo
+
+        Raises:
+            OverloadedError: Con el motivo y el tiempo hasta reintentar
+        """
+        if self.inflight_requests:
+            total = self.inflight_pages + pages
+            if self.max_inflight_pages and total > self.max_inflight_pages:
+                self._reject(QUEUE_FULL, (total - self.max_inflight_pages) / self.drain_rate)
+            wait = total / self.drain_rate
+            if self.max_wait_seconds and wait > self.max_wait_seconds:
+                self._reject(DRAIN_TIME, wait - self.max_wait_seconds)
+        else:
+            self._measure_since = time.monotonic()
+
+        self.inflight_pages += pages
+        self.inflight_requests += 1
+        self._publish()
+
+    def release(self, pages: float, processed: bool = True):
+        """
+        Devuelve el trabajo admitido al terminarlo.
+
+        Args:
+            pages: Páginas indicadas al admitirlo
+            processed: Si se procesó; los fallos no cuentan para el ritmo
+        """
+        now = time.monotonic()
+        if processed and self._measure_since is not None and now > self._measure_since:
+            # Rendimiento desde la última finalización (o desde que hay trabajo)
+            sample = pages / (now - self._measure_since)
+            self.drain_rate = max(
+                self.smoothing * sample + (1 - self.smoothing) * self.drain_rate,
+                1e-3
+            )
+            self._measure_since = now
+
+        self.inflight_pages = max(0.0, self.inflight_pages - pages)
+        self.inflight_requests = max(0, self.inflight_requests - 1)
+        if not self.inflight_requests:
+            self.inflight_pages = 0.0
+            self._measure_since = None
+        self._publish()
+
+    def _reject(self, reason: str, retry_after: float):
+        retry_after = max(1, math.ceil(retry_after))
+        if self.on_rejected:
+            self.on_rejected(reason)
+        logger.warning(
+            "admission_rejected",
+            reason=reason,
+            inflight_pages=round(self.inflight_pages, 1),
+            estimated_wait=round(self.estimated_wait, 1),
+            retry_after=retry_after
+        )
+        raise OverloadedError(
+            "El servicio está saturado; reintente más tarde",
+            reason=reason,
+            retry_after_seconds=retry_after,
+            context={"inflight_pages": self.inflight_pages, "estimated_wait": self.estimated_wait}
+        )
+
+    def _publish(self):
+        if self.on_update:
+            self.on_update(self)
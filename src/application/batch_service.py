@@ -1,13 +1,61 @@
 """
 Servicio para el procesamiento por lotes de documentos.
 """
-from typing import List, Optional
-from dataclasses import dataclass
+import asyncio
+import time
+import uuid
+from typing import Callable, List, Optional
+from dataclasses import dataclass, field
 from datetime import datetime
 
-from domain.models import Document
+import structlog
+
 from .document_service import DocumentService
 
+logger = structlog.get_logger(__name__)
+
+@dataclass
+class BatchItemResult:
+    """
+    Resultado de un documento del lote.
+
+    El documento ya está guardado por DocumentService: el lote solo
+    conserva dónde quedó, no su contenido.
+
+    Attributes:
+        path: Ruta del documento procesado
+        storage_path: Dónde se guardó el resultado (None si falló)
+        page_count: Páginas procesadas
+        processing_time: Segundos dedicados al documento
+        error: Mensaje del error si falló
+        error_type: Clase de la excepción si falló
+    """
+    path: str
+    storage_path: Optional[str] = None
+    page_count: int = 0
+    processing_time: float = 0.0
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+@dataclass
+class BatchProgress:
+    """
+    Progreso de un lote en curso.
+    """
+    total: int
+    processed: int = 0
+    failed: int = 0
+
+    @property
+    def remaining(self) -> int:
+        return self.total - self.processed - self.failed
+
+BatchProgressCallback = Callable[[BatchProgress, BatchItemResult], None]
+
 @dataclass
 class BatchProcessingResult:
     """
@@ -18,45 +66,96 @@ class BatchProcessingResult:
     total_documents: int
     processed_documents: int
     failed_documents: int
-    documents: List[Document]
+    results: List[BatchItemResult]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    @property
+    def errors(self) -> List[BatchItemResult]:
+        """Registros de los documentos que fallaron"""
+        return [result for result in self.results if not result.ok]
 
 class BatchService:
     """
     Servicio para procesar lotes de documentos con seguimiento
     del progreso y manejo de errores.
+
+    Procesa hasta ``concurrency`` documentos a la vez; un fallo queda
+    registrado en su documento sin detener el resto del lote.
     """
-    
-    def __init__(self, document_service: DocumentService):
+
+    def __init__(self, document_service: DocumentService, concurrency: int = 4):
+        """
+        Args:
+            document_service: Servicio que procesa y guarda cada documento
+            concurrency: Documentos procesados a la vez
+        """
         self.document_service = document_service
-        
-    async def process_batch(self, paths: List[str]) -> BatchProcessingResult:
+        self.concurrency = max(1, concurrency)
+
+    async def process_batch(
+        self,
+        paths: List[str],
+        content_hashes: Optional[List[Optional[str]]] = None,
+        on_progress: Optional[BatchProgressCallback] = None
+    ) -> BatchProcessingResult:
         """
         Procesa un lote de documentos manteniendo estadísticas.
-        
+
         Args:
             paths: Lista de rutas a documentos
-            
+            content_hashes: Hash del contenido de cada ruta, si ya se calculó
+            on_progress: Llamado tras cada documento con el progreso acumulado
+                         y el resultado de ese documento
+
         Returns:
-            BatchProcessingResult: Resultado del procesamiento por lotes
+            BatchProcessingResult: Resultado del procesamiento por lotes,
+                                   con un registro por ruta en el mismo orden
         """
         started_at = datetime.now()
-        processed = []
-        failed = 0
-        
-        for path in paths:
-            try:
-                doc = await self.document_service.process_one(path)
-                processed.append(doc)
-            except Exception:
-                failed += 1
-                
-        completed_at = datetime.now()
-        
+        progress = BatchProgress(total=len(paths))
+        results: List[Optional[BatchItemResult]] = [None] * len(paths)
+        hashes = content_hashes or [None] * len(paths)
+        pending = iter(range(len(paths)))
+
+        async def worker():
+            # Cada worker toma el siguiente documento: no se crea una tarea por ruta
+            for index in pending:
+                result = await self._process_item(paths[index], hashes[index])
+                results[index] = result
+                if result.ok:
+                    progress.processed += 1
+                else:
+                    progress.failed += 1
+                if on_progress:
+                    on_progress(progress, result)
+
+        await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(paths)))))
+
         return BatchProcessingResult(
             started_at=started_at,
-            completed_at=completed_at,
+            completed_at=datetime.now(),
             total_documents=len(paths),
-            processed_documents=len(processed),
-            failed_documents=failed,
-            documents=processed
+            processed_documents=progress.processed,
+            failed_documents=progress.failed,
+            results=results
+        )
+
+    async def _process_item(self, path: str, content_hash: Optional[str]) -> BatchItemResult:
+        """Procesa un documento y lo reduce a su registro en el lote"""
+        started = time.perf_counter()
+        try:
+            document = await self.document_service.process_one(path, content_hash)
+        except Exception as e:
+            logger.warning("batch_document_failed", path=path, error=str(e))
+            return BatchItemResult(
+                path=path,
+                processing_time=time.perf_counter() - started,
+                error=str(e),
+                error_type=type(e).__name__
+            )
+        return BatchItemResult(
+            path=path,
+            storage_path=document.metadata.get("storage_path"),
+            page_count=len(document.pages),
+            processing_time=time.perf_counter() - started
         )
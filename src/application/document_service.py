@@ -1,78 +1,280 @@
 """
 Servicio de aplicación para el procesamiento de documentos.
 """
-from typing import List, Optional
+from typing import TYPE_CHECKING, AsyncIterator, Callable, List, Optional, Union
 import asyncio
-import hashlib
-from datetime import datetime, timedelta
+import threading
+from dataclasses import asdict
+from datetime import timedelta
+from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
 
-from domain.models import Document, ProcessDocumentRequest
-from domain.ports import OcrPort, StoragePort
+from domain.models import Document, Page
+from domain.ports import OcrPort, ProgressCallback, StoragePort
 from domain.cache_port import CachePort
+from domain.lock_port import LockPort
+from domain.cache_keys import document_cache_key, document_cache_prefix, file_content_hash
+from application.single_flight import SingleFlight
+
+if TYPE_CHECKING:
+    from domain.use_cases import ProcessDocumentRequest
+
+# Marca de fin del flujo de páginas entre el hilo del OCR y el event loop
+_END_OF_PAGES = object()
 
 class DocumentService:
     """
     Servicio principal para el procesamiento de documentos.
     Coordina las operaciones entre el OCR y el almacenamiento.
+
+    Las peticiones concurrentes de un mismo documento (mismo contenido y
+    configuración) se resuelven con un único OCR: dentro del proceso con
+    SingleFlight y, si se configura un bloqueo distribuido, también entre
+    réplicas, que esperan el resultado de la primera en el caché.
     """
     
-    def __init__(self, ocr: OcrPort, storage: StoragePort, cache: Optional[CachePort] = None, max_workers: int = 4):
+    def __init__(
+        self,
+        ocr: OcrPort,
+        storage: StoragePort,
+        cache: Optional[CachePort] = None,
+        max_workers: int = 4,
+        config_fingerprint: str = "",
+        lock: Optional[LockPort] = None,
+        lock_ttl_seconds: float = 600.0,
+        lock_poll_seconds: float = 0.5,
+        on_coalesced: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Args:
+            ocr: Motor de OCR
+            storage: Almacenamiento de los documentos procesados
+            cache: Caché de documentos procesados (opcional)
+            max_workers: Hilos para el OCR y las operaciones de archivo
+            config_fingerprint: Huella de la configuración de OCR
+            lock: Bloqueo distribuido para coalescer entre réplicas (requiere caché)
+            lock_ttl_seconds: Caducidad del bloqueo si su dueño no lo libera
+            lock_poll_seconds: Intervalo de espera del resultado de otra réplica
+            on_coalesced: Se llama con "local" o "distributed" por cada
+                          petición resuelta con el resultado de otra
+        """
         self.ocr = ocr
         self.storage = storage
         self.cache = cache
         self.cache_ttl = timedelta(hours=24)  # Cache por 24 horas por defecto
+        self.config_fingerprint = config_fingerprint
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.lock = lock if cache else None
+        self.lock_ttl_seconds = lock_ttl_seconds
+        self.lock_poll_seconds = lock_poll_seconds
+        self.on_coalesced = on_coalesced
+        self.single_flight = SingleFlight(on_coalesced=lambda _: self._record_coalesced("local"))
+
+    def _record_coalesced(self, scope: str):
+        if self.on_coalesced:
+            self.on_coalesced(scope)
         
-    def _generate_cache_key(self, path: str) -> str:
-        """Genera una clave única para el caché basada en el path y el contenido del archivo"""
-        return f"ocr:document:{hashlib.sha256(path.encode()).hexdigest()}"
-        
-    async def process_one(self, path: str) -> Document:
+    async def _generate_cache_key(self, path: str, content_hash: Optional[str] = None) -> str:
         """
-        Procesa un único documento.
+        Genera la clave de caché a partir del contenido del archivo y de la
+        huella de configuración de OCR.
         
         Args:
-            path: Ruta al documento a procesar
+            path: Ruta al documento
+            content_hash: Hash del contenido si ya se calculó (ej: al subirlo)
             
         Returns:
-            Document: Documento procesado con su texto extraído
+            str: Clave de caché del documento
         """
-        # Verificar caché si está disponible
-        if self.cache:
-            cache_key = self._generate_cache_key(path)
-            cached_doc = await self.cache.get(cache_key)
-            if cached_doc:
-                return Document(**cached_doc)
+        if content_hash is None:
+            loop = asyncio.get_running_loop()
+            content_hash = await loop.run_in_executor(self.executor, file_content_hash, path)
+        return document_cache_key(content_hash, self.config_fingerprint)
         
-        # Extraer texto usando OCR
-        text = await self.ocr.extract_text(path)
+    async def purge_stale_cache(self) -> int:
+        """
+        Elimina del caché los documentos generados con otra configuración.
         
-        # Crear documento
-        document = Document(
-            path=path,
-            text=text,
-            processed_at=datetime.now()
+        Returns:
+            int: Número de entradas eliminadas
+        """
+        if not self.cache:
+            return 0
+        return await self.cache.delete_matching(
+            "ocr:document:*",
+            exclude_prefix=document_cache_prefix(self.config_fingerprint)
         )
         
-        # Guardar documento
-        saved_path = await self.storage.save_document(document)
-        document.storage_path = saved_path
+    async def process_one(
+        self,
+        path: str,
+        content_hash: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> Document:
+        """
+        Procesa un único documento.
         
+        Args:
+            path: Ruta al documento a procesar
+            content_hash: Hash del contenido si ya se calculó (ej: al subirlo)
+            progress: Se llama con (páginas procesadas, páginas totales),
+                      también desde hilos del executor; las peticiones
+                      coalescidas y los aciertos de caché solo informan al terminar
+            
+        Returns:
+            Document: Documento procesado con su texto extraído
+        """
+        cache_key = await self._generate_cache_key(path, content_hash)
+        document = await self.single_flight.do(
+            cache_key,
+            lambda: self._process_uncoalesced(path, cache_key, progress)
+        )
+        if progress:
+            progress(len(document.pages), len(document.pages))
+        return document
+
+    async def _process_uncoalesced(
+        self,
+        path: str,
+        cache_key: str,
+        progress: Optional[ProgressCallback] = None
+    ) -> Document:
+        """Consulta el caché y, si no está, procesa el documento bajo el bloqueo"""
+        document = await self._load_cached(cache_key)
+        if document:
+            return document
+        if not self.lock:
+            return await self._run_ocr(path, cache_key, progress)
+
+        token = await self.lock.acquire(cache_key, self.lock_ttl_seconds)
+        waited = token is None
+        while token is None:
+            # Otra réplica procesa el mismo documento: esperar su resultado
+            await asyncio.sleep(self.lock_poll_seconds)
+            document = await self._load_cached(cache_key)
+            if document:
+                self._record_coalesced("distributed")
+                return document
+            token = await self.lock.acquire(cache_key, self.lock_ttl_seconds)
+
+        try:
+            # La otra réplica pudo guardar el resultado justo antes de liberar
+            if waited:
+                document = await self._load_cached(cache_key)
+                if document:
+                    self._record_coalesced("distributed")
+                    return document
+            return await self._run_ocr(path, cache_key, progress)
+        finally:
+            await self.lock.release(cache_key, token)
+
+    async def _load_cached(self, cache_key: str) -> Optional[Document]:
+        """Recupera un documento del caché si está disponible"""
+        if not self.cache:
+            return None
+        cached_doc = await self.cache.get(cache_key)
+        return Document.from_dict(cached_doc) if cached_doc else None
+
+    async def _run_ocr(
+        self,
+        path: str,
+        cache_key: str,
+        progress: Optional[ProgressCallback] = None
+    ) -> Document:
+        """Ejecuta el OCR, guarda el documento y lo almacena en caché"""
+        loop = asyncio.get_running_loop()
+
+        # El OCR es bloqueante: fuera del event loop
+        document = await loop.run_in_executor(self.executor, self.ocr.process_pdf, Path(path), progress)
+        await self._save(document, cache_key)
+        return document
+
+    async def _save(self, document: Document, cache_key: str):
+        """Guarda el documento y lo almacena en caché"""
+        loop = asyncio.get_running_loop()
+        saved_path = await loop.run_in_executor(self.executor, self.storage.save_document, document)
+        document.metadata["storage_path"] = str(saved_path)
+
         # Guardar en caché si está disponible
         if self.cache:
-            cache_key = self._generate_cache_key(path)
             await self.cache.set(
-                cache_key, 
-                document.dict(), 
+                cache_key,
+                asdict(document),
                 ttl=self.cache_ttl
             )
-        
-        return document
+
+    async def stream_one(
+        self,
+        path: str,
+        content_hash: Optional[str] = None
+    ) -> AsyncIterator[Union[Page, Document]]:
+        """
+        Procesa un documento entregando cada página en cuanto está lista.
+
+        Genera las páginas en orden y, al final, el Document completo (ya
+        guardado y en caché). Si el consumidor deja de iterar (ej: el cliente
+        se desconecta), el OCR se detiene tras la página en curso. Los
+        flujos no se coalescen con otras peticiones, pero un documento ya
+        en caché se entrega sin OCR.
+
+        Args:
+            path: Ruta al documento a procesar
+            content_hash: Hash del contenido si ya se calculó (ej: al subirlo)
+
+        Yields:
+            Union[Page, Document]: Cada página y, por último, el documento
+        """
+        cache_key = await self._generate_cache_key(path, content_hash)
+        document = await self._load_cached(cache_key)
+        if document:
+            for page in document.pages:
+                yield page
+            yield document
+            return
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+
+        def produce():
+            pages = self.ocr.iter_pdf_pages(Path(path))
+            try:
+                for page in pages:
+                    loop.call_soon_threadsafe(queue.put_nowait, page)
+                    if stop.is_set():
+                        return
+                loop.call_soon_threadsafe(queue.put_nowait, _END_OF_PAGES)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                # Cerrar el generador cancela el trabajo pendiente del motor
+                pages.close()
+
+        loop.run_in_executor(self.executor, produce)
+        pages: List[Page] = []
+        try:
+            while True:
+                item = await queue.get()
+                if item is _END_OF_PAGES:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                pages.append(item)
+                yield item
+        finally:
+            stop.set()
+
+        document = Document(
+            name=Path(path).name,
+            pages=pages,
+            metadata=self.ocr.document_metadata()
+        )
+        await self._save(document, cache_key)
+        yield document
         
     async def process_documents_async(
         self, 
-        requests: List[ProcessDocumentRequest]
+        requests: List["ProcessDocumentRequest"]
     ) -> List[Document]:
         """Procesa múltiples documentos de forma asíncrona"""
         loop = asyncio.get_event_loop()
@@ -90,7 +292,7 @@ class DocumentService:
     
     def process_batch(
         self, 
-        requests: List[ProcessDocumentRequest],
+        requests: List["ProcessDocumentRequest"],
         batch_size: int = 3
     ) -> List[Document]:
         """Procesa en lotes para optimizar memoria"""
@@ -0,0 +1,56 @@
+"""
+Política de planificación de trabajos por coste con envejecimiento.
+"""
+from typing import Dict, Optional
+
+from domain.models import Job
+
+class CostAwareScheduler:
+    """
+    Ordena los trabajos para minimizar la latencia media sin inanición.
+
+    La prioridad de un trabajo es su momento de llegada retrasado en
+    proporción a su coste: ``created_at + cost * seconds_per_page / weight``.
+    Ordenar por este valor fijo equivale a shortest-job-first con
+    envejecimiento lineal: un documento de 500 páginas cede el paso a las
+    facturas de una página, pero tras esperar su retraso adelanta a todo lo
+    que llegue después, de modo que siempre progresa. Al ser un valor fijo,
+    las colas lo guardan tal cual (heap, sorted set de Redis).
+
+    Los pesos por cliente reparten la capacidad: un cliente con peso 2 ve
+    sus trabajos tratados como si costaran la mitad.
+    """
+
+    def __init__(
+        self,
+        seconds_per_page: float = 2.0,
+        client_weights: Optional[Dict[str, float]] = None,
+        default_weight: float = 1.0
+    ):
+        """
+        Args:
+            seconds_per_page: Retraso por página equivalente (0 = FIFO)
+            client_weights: Peso de cada cliente en el reparto
+            default_weight: Peso de los clientes sin peso propio
+        """
+        self.seconds_per_page = seconds_per_page
+        self.client_weights = client_weights or {}
+        self.default_weight = default_weight
+
+    def weight(self, client_id: Optional[str]) -> float:
+        """Peso del cliente en el reparto de capacidad"""
+        weight = self.client_weights.get(client_id, self.default_weight) if client_id else self.default_weight
+        return max(weight, 1e-6)
+
+    def priority(self, job: Job) -> float:
+        """
+        Calcula la prioridad de un trabajo (menor sale antes).
+
+        Args:
+            job: Trabajo con su coste estimado
+
+        Returns:
+            float: Prioridad en segundos desde epoch
+        """
+        cost = job.cost if job.cost is not None else 1.0
+        return job.created_at + cost * self.seconds_per_page / self.weight(job.client_id)
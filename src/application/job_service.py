@@ -0,0 +1,227 @@
+"""
+Servicio de trabajos de OCR asíncronos con workers en segundo plano.
+"""
+import asyncio
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, List, Optional, Set
+
+import structlog
+
+from domain.job_queue_port import JobQueuePort
+from domain.models import Job, JobStatus
+from .admission_controller import AdmissionController
+from .document_service import DocumentService
+from .job_scheduler import CostAwareScheduler
+
+logger = structlog.get_logger(__name__)
+
+class JobService:
+    """
+    Recibe documentos como trabajos y los procesa en segundo plano.
+
+    El envío solo encola el trabajo, de modo que la petición HTTP termina
+    enseguida; ``workers`` tareas consumen la cola, procesan cada documento
+    con DocumentService y guardan su progreso por páginas y su resultado.
+
+    Con un planificador, cada trabajo se encola con una prioridad calculada
+    a partir de su coste estimado antes del OCR, para que los documentos
+    cortos no esperen detrás de los largos.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueuePort,
+        document_service_factory: Callable[[], DocumentService],
+        workers: int = 2,
+        poll_seconds: float = 1.0,
+        scheduler: Optional[CostAwareScheduler] = None,
+        cost_estimator: Optional[Callable[[str], float]] = None,
+        admission: Optional[AdmissionController] = None,
+        on_finished: Optional[Callable[[Job], None]] = None
+    ):
+        """
+        Args:
+            queue: Cola y almacén de estado de los trabajos
+            document_service_factory: Devuelve el servicio de documentos; se
+                                      resuelve al arrancar los workers para
+                                      no cargar el modelo al encolar
+            workers: Trabajos procesados a la vez en este proceso
+            poll_seconds: Espera máxima de cada worker sobre la cola vacía
+            scheduler: Política de prioridad (sin ella, FIFO)
+            cost_estimator: Estima el coste de un documento a partir de su
+                            ruta; es bloqueante y se ejecuta en un hilo
+            admission: Control de admisión; los trabajos cuentan como
+                       trabajo admitido desde que se encolan hasta que
+                       terminan (requiere que este proceso los ejecute)
+            on_finished: Se llama con cada trabajo terminado (ej: para métricas)
+        """
+        self.queue = queue
+        self.document_service_factory = document_service_factory
+        self.workers = max(1, workers)
+        self.poll_seconds = poll_seconds
+        self.scheduler = scheduler
+        self.cost_estimator = cost_estimator
+        self.admission = admission
+        self.on_finished = on_finished
+        self._tasks: List[asyncio.Task] = []
+
+    async def submit(
+        self,
+        path: str,
+        content_hash: Optional[str] = None,
+        client_id: Optional[str] = None,
+        cleanup: bool = False
+    ) -> Job:
+        """
+        Crea un trabajo para el documento y lo encola.
+
+        Args:
+            path: Ruta al documento
+            content_hash: Hash del contenido si ya se calculó
+            client_id: Cliente que envía el trabajo
+            cleanup: Eliminar el archivo al terminar (subidas temporales)
+
+        Returns:
+            Job: Trabajo encolado
+
+        Raises:
+            OverloadedError: Si el control de admisión rechaza el trabajo
+        """
+        job = Job(path=path, content_hash=content_hash, client_id=client_id, cleanup=cleanup)
+        if self.cost_estimator:
+            loop = asyncio.get_running_loop()
+            job.cost = await loop.run_in_executor(None, self.cost_estimator, path)
+        if self.scheduler:
+            job.priority = self.scheduler.priority(job)
+        if self.admission:
+            self.admission.admit(self._admitted_pages(job))
+        try:
+            await self.queue.enqueue(job)
+        except Exception:
+            if self.admission:
+                self.admission.release(self._admitted_pages(job), processed=False)
+            raise
+        logger.info("job_queued", job_id=job.id, client_id=client_id, cost=job.cost)
+        return job
+
+    @staticmethod
+    def _admitted_pages(job: Job) -> float:
+        return job.cost if job.cost is not None else 1.0
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        """
+        Recupera el estado de un trabajo.
+
+        Args:
+            job_id: Identificador del trabajo
+
+        Returns:
+            Optional[Job]: Trabajo o None si no existe
+        """
+        return await self.queue.get(job_id)
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self):
+        """
+        Arranca los workers en el event loop actual.
+        """
+        if self._tasks:
+            return
+        document_service = self.document_service_factory()
+        self._tasks = [
+            asyncio.create_task(self._worker(document_service))
+            for _ in range(self.workers)
+        ]
+
+    async def stop(self):
+        """
+        Detiene los workers; los trabajos en curso quedan sin terminar.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self, document_service: DocumentService):
+        """Consume la cola de trabajos hasta que se cancela"""
+        while True:
+            try:
+                job = await self.queue.dequeue(self.poll_seconds)
+            except Exception as e:
+                logger.warning("job_queue_unavailable", error=str(e))
+                await asyncio.sleep(self.poll_seconds)
+                continue
+            if job is None:
+                continue
+            try:
+                await self.run(job, document_service)
+            except Exception as e:
+                # Un fallo al guardar el estado no debe detener el worker
+                logger.error("job_worker_error", job_id=job.id, error=str(e))
+
+    async def run(self, job: Job, document_service: DocumentService) -> Job:
+        """
+        Procesa un trabajo y guarda su resultado o su error.
+
+        Args:
+            job: Trabajo tomado de la cola
+            document_service: Servicio que procesa el documento
+
+        Returns:
+            Job: Trabajo terminado
+        """
+        loop = asyncio.get_running_loop()
+        updates: Set[asyncio.Task] = set()
+
+        def report(done: int, total: int):
+            job.pages_done = done
+            job.pages_total = total or job.pages_total
+            task = asyncio.ensure_future(self.queue.update(job))
+            updates.add(task)
+            task.add_done_callback(updates.discard)
+
+        def progress(done: int, total: int):
+            # Llega desde los hilos del OCR: se aplica en el event loop
+            loop.call_soon_threadsafe(report, done, total)
+
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        await self.queue.update(job)
+
+        try:
+            document = await document_service.process_one(job.path, job.content_hash, progress)
+            job.result = asdict(document)
+            job.status = JobStatus.DONE
+        except Exception as e:
+            job.error = str(e)
+            job.status = JobStatus.FAILED
+            logger.error("job_failed", job_id=job.id, error=str(e))
+        finally:
+            if job.cleanup:
+                Path(job.path).unlink(missing_ok=True)
+            if self.admission:
+                self.admission.release(
+                    self._admitted_pages(job),
+                    processed=job.status == JobStatus.DONE
+                )
+
+        job.finished_at = time.time()
+        # Que ninguna actualización de progreso pendiente pise el estado final
+        await asyncio.sleep(0)
+        await asyncio.gather(*updates, return_exceptions=True)
+        await self.queue.update(job)
+        if self.on_finished:
+            self.on_finished(job)
+        logger.info(
+            "job_finished",
+            job_id=job.id,
+            status=job.status.value,
+            wait_seconds=round(job.started_at - job.created_at, 3),
+            seconds=round(job.finished_at - job.started_at, 3)
+        )
+        return job
@@ -0,0 +1,59 @@
+"""
+Coalescencia de peticiones concurrentes idénticas.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class SingleFlight:
+    """
+    Ejecuta una sola vez cada operación en curso por clave.
+
+    La primera petición con una clave ejecuta la operación; las que llegan
+    mientras sigue en curso esperan el mismo resultado (o la misma
+    excepción). Cuando termina, la clave se libera y la siguiente petición
+    vuelve a ejecutarla, de modo que no actúa como caché.
+    """
+
+    def __init__(self, on_coalesced: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            on_coalesced: Se llama con la clave cada vez que una petición
+                          reutiliza una operación en curso (ej: para métricas)
+        """
+        self.on_coalesced = on_coalesced
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._inflight
+
+    async def do(self, key: str, operation: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Ejecuta la operación o espera a la que ya está en curso con la misma clave.
+
+        Args:
+            key: Identidad de la operación (ej: hash del contenido)
+            operation: Función que crea la corrutina a ejecutar
+
+        Returns:
+            Any: Resultado de la operación
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            if self.on_coalesced:
+                self.on_coalesced(key)
+            # shield: si este llamador se cancela, la operación compartida sigue
+            return await asyncio.shield(future)
+
+        # La operación corre en su propia tarea para que la cancelación del
+        # primer llamador no deje sin resultado a los demás
+        task = asyncio.ensure_future(operation())
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Future):
+        """Libera la clave y marca la excepción como leída aunque nadie espere"""
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()
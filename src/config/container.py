@@ -1,36 +1,264 @@
+from datetime import timedelta
 from dependency_injector import containers, providers
-from infrastructure.donut_adapter import DonutAdapter
 from infrastructure.file_storage import LocalFileStorage
+from infrastructure.cache_codec import CacheCodec
+from infrastructure.circuit_breaker import CircuitBreaker
+from infrastructure.disk_cache import DiskCache
+from infrastructure.monitoring import MetricsCollector
 from infrastructure.redis_cache import RedisCache
-from domain.use_cases import DocumentProcessor
+from infrastructure.redis_lock import RedisLock
+from infrastructure.tiered_cache import TieredCache
+from application.admission_controller import AdmissionController
+from application.batch_service import BatchService
+from application.document_service import DocumentService
+from application.job_scheduler import CostAwareScheduler
+from application.job_service import JobService
+from infrastructure.job_cost import estimate_pdf_cost
+from infrastructure.memory_job_queue import InMemoryJobQueue
+from infrastructure.redis_job_queue import RedisJobQueue
 from config.settings import Settings
 
+# Los adaptadores de OCR importan torch/transformers: se importan al construir
+# el proveedor, no al cargar el contenedor, para que la CLI y la API arranquen
+# sin pagar ese coste hasta que se necesite un motor.
+
+def _build_thread_budget(settings: Settings):
+    from infrastructure.thread_budget import ThreadBudget
+    budget = ThreadBudget.from_settings(settings)
+    budget.report()
+    return budget
+
+def _build_donut_adapter(settings: Settings, page_cache, thread_budget):
+    from infrastructure.donut_adapter import DonutAdapter
+    if thread_budget is not None:
+        thread_budget.apply()
+    return DonutAdapter(
+        settings,
+        page_cache=page_cache if settings.enable_cache else None,
+        thread_budget=thread_budget
+    )
+
+def _build_replica_adapter(settings: Settings):
+    # Se ejecuta dentro de cada réplica: construye su propio caché de páginas.
+    # Los hilos de torch ya los fija la réplica según su grupo de núcleos.
+    # Cada réplica procesa un lote a la vez: no hay peticiones que agrupar
+    container = Container()
+    container.settings.override(providers.Object(
+        settings.model_copy(update={"micro_batching": False})
+    ))
+    container.thread_budget.override(providers.Object(None))
+    return container.donut_adapter()
+
+def _build_replica_pool(settings: Settings, thread_budget):
+    from functools import partial
+    from infrastructure.replica_pool import ReplicaPool
+    return ReplicaPool(
+        settings,
+        adapter_factory=partial(_build_replica_adapter, settings),
+        thread_budget=thread_budget
+    )
+
+def _cache_backend_name(settings: Settings) -> str:
+    return settings.cache_backend if settings.enable_cache else "none"
+
+def _build_document_cache(backend, max_bytes: int, local_ttl: timedelta):
+    return TieredCache(backend, max_bytes=max_bytes, local_ttl=local_ttl) if backend else None
+
+def _build_document_lock(settings: Settings):
+    # El bloqueo solo tiene sentido si las réplicas comparten el caché de Redis
+    if settings.distributed_lock and _cache_backend_name(settings) == "redis":
+        return RedisLock(settings.redis_url, timeout=settings.redis_timeout_seconds)
+    return None
+
+def _job_admission(settings: Settings, admission):
+    # Con la cola de Redis un trabajo puede ejecutarse en otro proceso, que
+    # no podría devolver lo admitido aquí: solo se admite con la cola local
+    return admission if settings.job_queue_backend == "memory" else None
+
+def _build_document_processor(ocr, storage, cache):
+    from domain.use_cases import DocumentProcessor
+    return DocumentProcessor(ocr=ocr, storage=storage, cache=cache)
+
 class Container(containers.DeclarativeContainer):
     # Configuración
     config = providers.Configuration()
     settings = providers.Singleton(Settings)
-    
+
+    # Reparto de los núcleos entre rasterización, inferencia y E/S
+    thread_budget = providers.Singleton(_build_thread_budget, settings)
+
     # Servicios de infraestructura
+    cache_codec = providers.Singleton(
+        CacheCodec,
+        compress_threshold=settings.provided.cache_compress_threshold
+    )
+
+    # Backend del caché compartido, elegido con Settings.cache_backend
+    cache_backend_name = providers.Callable(_cache_backend_name, settings)
+
+    redis_cache = providers.Singleton(
+        RedisCache,
+        redis_url=settings.provided.redis_url,
+        ttl_hours=settings.provided.redis_cache_ttl_hours,
+        codec=cache_codec,
+        max_connections=settings.provided.redis_max_connections,
+        timeout=settings.provided.redis_timeout_seconds,
+        breaker=providers.Factory(
+            CircuitBreaker,
+            name="redis_cache",
+            failure_threshold=settings.provided.cache_breaker_failures,
+            reset_timeout=settings.provided.cache_breaker_reset_seconds
+        )
+    )
+
+    # Caché en disco para nodos sin Redis; es seguro entre hilos y procesos
+    disk_cache = providers.Singleton(
+        DiskCache,
+        path=settings.provided.disk_cache_path,
+        max_bytes=providers.Callable(
+            lambda settings: settings.disk_cache_max_mb * 1024 * 1024,
+            settings
+        ),
+        codec=cache_codec
+    )
+
+    shared_cache = providers.Selector(
+        cache_backend_name,
+        redis=redis_cache,
+        disk=disk_cache,
+        none=providers.Object(None)
+    )
+
+    # El caché de páginas de Redis usa su propio cliente: opera desde el
+    # event loop interno de PageCache, no desde el de la aplicación
+    page_cache = providers.Selector(
+        cache_backend_name,
+        redis=providers.Singleton(
+            RedisCache,
+            redis_url=settings.provided.redis_url,
+            ttl_hours=settings.provided.redis_cache_ttl_hours,
+            codec=cache_codec,
+            max_connections=settings.provided.redis_max_connections,
+            timeout=settings.provided.redis_timeout_seconds,
+            breaker=providers.Factory(
+                CircuitBreaker,
+                name="page_cache",
+                failure_threshold=settings.provided.cache_breaker_failures,
+                reset_timeout=settings.provided.cache_breaker_reset_seconds
+            )
+        ),
+        disk=disk_cache,
+        none=providers.Object(None)
+    )
+
+    # LRU en proceso delante del caché compartido para los documentos más consultados
+    document_cache = providers.Singleton(
+        _build_document_cache,
+        backend=shared_cache,
+        max_bytes=providers.Callable(
+            lambda settings: settings.local_cache_max_mb * 1024 * 1024,
+            settings
+        ),
+        local_ttl=providers.Callable(
+            lambda settings: timedelta(seconds=settings.local_cache_ttl_seconds),
+            settings
+        )
+    )
+
+    document_lock = providers.Singleton(_build_document_lock, settings)
+
     donut_adapter = providers.Singleton(
-        DonutAdapter,
-        config=config.donut
+        _build_donut_adapter,
+        settings=settings,
+        page_cache=page_cache,
+        thread_budget=thread_budget
+    )
+
+    # Motor OCR: un adaptador en proceso o K réplicas en procesos separados
+    ocr_engine = providers.Selector(
+        providers.Callable(
+            lambda settings: "replicas" if settings.replica_count > 1 else "single",
+            settings
+        ),
+        single=donut_adapter,
+        replicas=providers.Singleton(_build_replica_pool, settings, thread_budget)
     )
-    
+
     file_storage = providers.Singleton(
         LocalFileStorage,
         base_path=settings.provided.output_dir
     )
-    
-    redis_cache = providers.Singleton(
-        RedisCache,
-        redis_url=settings.provided.redis_url,
-        ttl_hours=settings.provided.redis_cache_ttl_hours
-    )
-    
+
     # Casos de uso
     document_processor = providers.Singleton(
-        DocumentProcessor,
-        ocr=donut_adapter,
+        _build_document_processor,
+        ocr=ocr_engine,
         storage=file_storage,
-        cache=redis_cache
-    )
\ No newline at end of file
+        cache=shared_cache
+    )
+
+    # Servicios de aplicación
+    document_service = providers.Singleton(
+        DocumentService,
+        ocr=ocr_engine,
+        storage=file_storage,
+        cache=document_cache,
+        max_workers=thread_budget.provided.io_threads,
+        config_fingerprint=providers.Callable(
+            lambda settings: settings.ocr_fingerprint(),
+            settings
+        ),
+        lock=document_lock,
+        lock_ttl_seconds=settings.provided.lock_ttl_seconds,
+        lock_poll_seconds=settings.provided.lock_poll_seconds,
+        on_coalesced=providers.Object(MetricsCollector.record_coalesced)
+    )
+
+    batch_service = providers.Factory(
+        BatchService,
+        document_service=document_service,
+        concurrency=settings.provided.batch_concurrency
+    )
+
+    # Control de admisión del trabajo de este proceso
+    admission_controller = providers.Singleton(
+        AdmissionController,
+        max_inflight_pages=settings.provided.admission_max_inflight_pages,
+        max_wait_seconds=settings.provided.admission_max_wait_seconds,
+        initial_pages_per_second=settings.provided.admission_initial_pages_per_second,
+        cost_estimator=providers.Object(estimate_pdf_cost),
+        on_update=providers.Object(MetricsCollector.record_admission),
+        on_rejected=providers.Object(MetricsCollector.record_admission_rejection)
+    )
+
+    # Trabajos asíncronos: la cola se elige con Settings.job_queue_backend
+    job_queue = providers.Selector(
+        settings.provided.job_queue_backend,
+        memory=providers.Singleton(
+            InMemoryJobQueue,
+            ttl_seconds=providers.Callable(
+                lambda settings: settings.job_ttl_hours * 3600,
+                settings
+            )
+        ),
+        redis=providers.Singleton(
+            RedisJobQueue,
+            redis_url=settings.provided.redis_url,
+            ttl_hours=settings.provided.job_ttl_hours
+        )
+    )
+
+    job_service = providers.Singleton(
+        JobService,
+        queue=job_queue,
+        document_service_factory=document_service.provider,
+        workers=settings.provided.job_workers,
+        scheduler=providers.Singleton(
+            CostAwareScheduler,
+            seconds_per_page=settings.provided.scheduler_seconds_per_page,
+            client_weights=settings.provided.scheduler_client_weights
+        ),
+        cost_estimator=providers.Object(estimate_pdf_cost),
+        admission=providers.Callable(_job_admission, settings, admission_controller),
+        on_finished=providers.Object(MetricsCollector.record_job)
+    )
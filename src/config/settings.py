@@ -2,12 +2,14 @@
 Configuración principal del proyecto OCR-LLM usando Donut.
 """
 
-from dependency_injector import containers, providers
-from infrastructure.donut_adapter import DonutAdapter
-from infrastructure.file_storage import LocalFileStorage
-from domain.use_cases import DocumentProcessor
 from pydantic_settings import BaseSettings
 from pathlib import Path
+from typing import Dict
+from domain.cache_keys import params_fingerprint
+
+# Versión del pipeline de OCR: incrementarla cuando un cambio de código altere
+# el texto extraído, para invalidar los resultados en caché
+OCR_ENGINE_VERSION = "1"
 
 class Settings(BaseSettings):
     """
@@ -16,33 +18,119 @@ class Settings(BaseSettings):
     Attributes:
         model_name: Nombre del modelo pre-entrenado de Donut
         use_gpu: Si se debe usar GPU para el procesamiento
+        inference_engine: Motor de inferencia ("fp32" o "int8" cuantizado, solo CPU)
         pdf_dpi: Resolución para la conversión de PDF a imagen
         max_output_length: Longitud máxima del texto generado
         num_beams: Número de beams para la búsqueda
+        adaptive_decoding: Decodificar en greedy y usar beams solo si la confianza media por token es menor que DocumentQualityService.min_confidence
         num_threads: Hilos para procesamiento paralelo
+        inference_batch_size: Páginas apiladas por llamada a generate
+        micro_batching: Agrupar en una llamada al modelo páginas de peticiones concurrentes
+        micro_batch_max_size: Páginas por llamada al modelo como máximo al agrupar
+        micro_batch_wait_ms: Espera máxima de una página hasta completar su lote
+        max_inflight_pages: Páginas renderizadas en memoria como máximo
+        pipeline_preprocess_workers: Hilos de preprocesado del pipeline
+        pipeline_infer_workers: Hilos de inferencia del pipeline
+        pipeline_queue_size: Lotes en espera entre etapas del pipeline
+        replica_count: Réplicas del modelo en procesos separados (1 = sin procesos)
+        replica_pin_cores: Fijar cada réplica a su grupo de núcleos (Linux)
+        cpu_cores: Núcleos que puede usar la aplicación (0 = todos los disponibles)
+        api_workers: Procesos de la API en el host (debe coincidir con uvicorn --workers)
+        rasterize_core_share: Fracción de los núcleos de cada proceso para poppler y preprocesado
+        io_threads: Hilos del executor de documentos (0 = según los núcleos)
+        pin_cpu_affinity: Fijar los hilos del pipeline a los núcleos de su rol (Linux)
+        skip_blank_pages: Omitir el modelo en páginas en blanco o casi en blanco
+        blank_page_ink_ratio: Proporción máxima del área con tinta de una página casi vacía
         temperature: Temperatura para la generación de texto
         redis_url: URL de conexión a Redis
         redis_cache_ttl_hours: Tiempo de vida del caché en horas
+        redis_max_connections: Tamaño del pool de conexiones a Redis
+        redis_timeout_seconds: Timeout por operación de caché en Redis
+        cache_breaker_failures: Fallos seguidos que abren el circuit breaker del caché
+        cache_breaker_reset_seconds: Segundos que se omite el caché con el circuito abierto
         enable_cache: Si se debe utilizar el caché
+        cache_backend: Backend del caché compartido ("redis", "disk" o "none")
+        disk_cache_path: Archivo SQLite del caché en disco
+        disk_cache_max_mb: Tamaño máximo del caché en disco
+        distributed_lock: Coalescer el OCR de un mismo documento entre réplicas con un bloqueo en Redis
+        lock_ttl_seconds: Caducidad del bloqueo si la réplica que procesa muere
+        lock_poll_seconds: Intervalo con el que las demás réplicas esperan el resultado
+        job_queue_backend: Cola de trabajos asíncronos ("memory" o "redis")
+        job_workers: Trabajos procesados a la vez por cada proceso de la API
+        job_ttl_hours: Tiempo que se conserva el estado de un trabajo
+        scheduler_seconds_per_page: Retraso de prioridad por página estimada (0 = FIFO)
+        scheduler_client_weights: Peso de cada cliente (X-Client-Id) en el reparto
+        max_upload_mb: Tamaño máximo de un archivo subido a la API
+        batch_concurrency: Documentos de un lote procesados a la vez
+        admission_max_inflight_pages: Páginas admitidas y sin terminar como máximo (0 = sin límite)
+        admission_max_wait_seconds: Tiempo estimado de vaciado máximo antes de rechazar (0 = sin límite)
+        admission_initial_pages_per_second: Ritmo de vaciado supuesto hasta medirlo
+        cache_compress_threshold: Bytes a partir de los que se comprimen los valores en caché
+        local_cache_max_mb: Tamaño máximo del caché LRU en proceso
+        local_cache_ttl_seconds: Tiempo de vida de las entradas del caché en proceso
+        model_cache_dir: Directorio de los modelos cuantizados (debe ser privado del usuario)
     """
     # Configuración de Donut
     model_name: str = "naver-clova-ix/donut-base-finetuned-cord-v2"
     use_gpu: bool = False
+    inference_engine: str = "fp32"
     pdf_dpi: int = 200
     max_output_length: int = 1024
     num_beams: int = 4
+    adaptive_decoding: bool = True
     num_threads: int = 4
+    inference_batch_size: int = 4
+    micro_batching: bool = False
+    micro_batch_max_size: int = 8
+    micro_batch_wait_ms: float = 10.0
+    max_inflight_pages: int = 8
+    pipeline_preprocess_workers: int = 2
+    pipeline_infer_workers: int = 1
+    pipeline_queue_size: int = 2
+    replica_count: int = 1
+    replica_pin_cores: bool = True
+    cpu_cores: int = 0
+    api_workers: int = 1
+    rasterize_core_share: float = 0.25
+    io_threads: int = 0
+    pin_cpu_affinity: bool = False
+    skip_blank_pages: bool = True
+    blank_page_ink_ratio: float = 0.002
     temperature: float = 0.8
     
     # Configuración de Redis
     redis_url: str = "redis://localhost:6379/0"
     redis_cache_ttl_hours: int = 24
+    redis_max_connections: int = 20
+    redis_timeout_seconds: float = 0.5
+    cache_breaker_failures: int = 5
+    cache_breaker_reset_seconds: float = 30.0
     enable_cache: bool = True
+    cache_backend: str = "redis"
+    disk_cache_path: Path = Path("/tmp/ocr-llm/cache.db")
+    disk_cache_max_mb: int = 1024
+    distributed_lock: bool = False
+    lock_ttl_seconds: float = 600.0
+    lock_poll_seconds: float = 0.5
+    job_queue_backend: str = "memory"
+    job_workers: int = 2
+    job_ttl_hours: int = 24
+    scheduler_seconds_per_page: float = 2.0
+    scheduler_client_weights: Dict[str, float] = {}
+    max_upload_mb: int = 100
+    batch_concurrency: int = 4
+    admission_max_inflight_pages: int = 500
+    admission_max_wait_seconds: float = 300.0
+    admission_initial_pages_per_second: float = 1.0
+    cache_compress_threshold: int = 1024
+    local_cache_max_mb: int = 64
+    local_cache_ttl_seconds: int = 300
     
     # Paths
     temp_dir: Path = Path("/tmp/ocr-llm")
     input_dir: Path = Path("pdfs")
     output_dir: Path = Path("output")
+    model_cache_dir: Path = Path.home() / ".cache" / "ocr-llm" / "models"
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -50,4 +138,27 @@ class Settings(BaseSettings):
         self.input_dir.mkdir(parents=True, exist_ok=True)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+    def ocr_fingerprint(self) -> str:
+        """
+        Huella de la configuración que afecta al resultado del OCR.
+
+        Forma parte de las claves de caché de documentos: cambiar el modelo,
+        el motor, los parámetros de generación o el filtro de páginas en
+        blanco invalida las entradas previas.
+
+        Returns:
+            str: Hash corto de la configuración
+        """
+        return params_fingerprint({
+            "engine_version": OCR_ENGINE_VERSION,
+            "model": self.model_name,
+            "engine": self.inference_engine,
+            "dpi": self.pdf_dpi,
+            "num_beams": self.num_beams,
+            "max_output_length": self.max_output_length,
+            "adaptive_decoding": self.adaptive_decoding,
+            "skip_blank_pages": self.skip_blank_pages,
+            "blank_page_ink_ratio": self.blank_page_ink_ratio
+        })
+
 # La clase Container se ha movido a container.py
\ No newline at end of file
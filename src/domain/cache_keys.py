@@ -0,0 +1,101 @@
+"""
+Construcción de claves de caché reutilizable entre adaptadores.
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Union
+
+# Tamaño de bloque para hashear archivos sin cargarlos completos
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def params_fingerprint(params: Dict[str, Any]) -> str:
+    """
+    Huella estable de un conjunto de parámetros.
+
+    Args:
+        params: Parámetros serializables a JSON (el orden no importa)
+
+    Returns:
+        str: Hash hexadecimal corto
+    """
+    encoded = json.dumps(params, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def page_cache_key(image: Any, params: Dict[str, Any]) -> str:
+    """
+    Clave direccionada por contenido para el OCR de una página.
+
+    La clave combina el hash de los píxeles renderizados con la huella de
+    los parámetros que afectan al resultado (modelo, prompt, DPI,
+    parámetros de generación), de forma que la misma página en otro PDF
+    reutiliza la entrada y cambiar la configuración la invalida.
+
+    Args:
+        image: Página renderizada (cualquier objeto con mode, size y tobytes(),
+               como una imagen PIL)
+        params: Parámetros que afectan al texto extraído
+
+    Returns:
+        str: Clave de caché de la página
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode())
+    digest.update(image.tobytes())
+    return f"ocr:page:{params_fingerprint(params)}:{digest.hexdigest()}"
+
+
+def content_hasher() -> "hashlib._Hash":
+    """
+    Hash incremental del contenido de un documento.
+
+    Permite hashear un archivo mientras se recibe (ej: al subirlo) con el
+    mismo algoritmo que file_content_hash, de modo que ambos producen la
+    misma clave de caché.
+
+    Returns:
+        hashlib._Hash: Objeto hash vacío (SHA-256)
+    """
+    return hashlib.sha256()
+
+
+def file_content_hash(path: Union[str, Path], chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """
+    Hash SHA-256 del contenido de un archivo, leído por bloques.
+
+    Args:
+        path: Ruta al archivo
+        chunk_size: Bytes leídos por iteración
+
+    Returns:
+        str: Hash hexadecimal del contenido
+    """
+    digest = content_hasher()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def document_cache_prefix(config_fingerprint: str) -> str:
+    """Prefijo común de las claves de documento de una configuración"""
+    return f"ocr:document:{config_fingerprint}:"
+
+
+def document_cache_key(content_hash: str, config_fingerprint: str) -> str:
+    """
+    Clave de caché de un documento completo.
+
+    Depende solo del contenido del archivo y de la configuración de OCR,
+    nunca del nombre o la ruta con que se subió.
+
+    Args:
+        content_hash: Hash del contenido del archivo
+        config_fingerprint: Huella de la configuración de OCR
+
+    Returns:
+        str: Clave de caché del documento
+    """
+    return f"{document_cache_prefix(config_fingerprint)}{content_hash}"
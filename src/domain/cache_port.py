@@ -2,7 +2,7 @@
 Puerto para el sistema de caché.
 """
 from abc import ABC, abstractmethod
-from typing import Optional, Any
+from typing import Optional, Any, Dict, List
 from datetime import timedelta
 
 class CachePort(ABC):
@@ -64,3 +64,51 @@ class CachePort(ABC):
             bool: True si la clave existe
         """
         pass
+    
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Recupera varios valores del caché en una sola operación.
+        
+        La implementación por defecto consulta las claves una a una; los
+        backends que lo permitan deberían sobrescribirla.
+        
+        Args:
+            keys: Claves a buscar
+            
+        Returns:
+            Dict[str, Any]: Valores encontrados, indexados por clave
+        """
+        found = {}
+        for key in keys:
+            value = await self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+    
+    async def set_many(self, items: Dict[str, Any], ttl: Optional[timedelta] = None) -> bool:
+        """
+        Almacena varios valores en el caché en una sola operación.
+        
+        Args:
+            items: Valores a almacenar, indexados por clave
+            ttl: Tiempo de vida de los valores en caché
+            
+        Returns:
+            bool: True si se almacenaron todos correctamente
+        """
+        results = [await self.set(key, value, ttl) for key, value in items.items()]
+        return all(results)
+    
+    @abstractmethod
+    async def delete_matching(self, pattern: str, exclude_prefix: Optional[str] = None) -> int:
+        """
+        Elimina en bloque las claves que coinciden con un patrón.
+        
+        Args:
+            pattern: Patrón glob de claves (ej: "ocr:document:*")
+            exclude_prefix: Prefijo de las claves que deben conservarse
+            
+        Returns:
+            int: Número de claves eliminadas
+        """
+        pass
@@ -26,4 +26,17 @@ class RetryableError(OCRLLMException):
     """Error que puede ser reintentado"""
     def __init__(self, message: str, max_retries: int = 3, context: Optional[Dict[str, Any]] = None):
         super().__init__(message, context)
-        self.max_retries = max_retries
\ No newline at end of file
+        self.max_retries = max_retries
+
+class OverloadedError(OCRLLMException):
+    """El servicio no admite más trabajo por ahora"""
+    def __init__(
+        self,
+        message: str,
+        reason: str,
+        retry_after_seconds: float,
+        context: Optional[Dict[str, Any]] = None
+    ):
+        super().__init__(message, context)
+        self.reason = reason
+        self.retry_after_seconds = retry_after_seconds
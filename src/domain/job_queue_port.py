@@ -0,0 +1,61 @@
+"""
+Puerto para la cola de trabajos de OCR asíncronos.
+"""
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from .models import Job
+
+class JobQueuePort(ABC):
+    """
+    Puerto abstracto para colas de trabajos.
+
+    Guarda el estado de cada trabajo, consultable por id, y la cola de
+    trabajos pendientes que consumen los workers.
+    """
+
+    @abstractmethod
+    async def enqueue(self, job: Job) -> None:
+        """
+        Guarda un trabajo nuevo y lo pone en la cola de pendientes.
+
+        Args:
+            job: Trabajo a encolar
+        """
+        pass
+
+    @abstractmethod
+    async def dequeue(self, timeout: float = 1.0) -> Optional[Job]:
+        """
+        Toma el siguiente trabajo pendiente.
+
+        Args:
+            timeout: Segundos máximos de espera si la cola está vacía
+
+        Returns:
+            Optional[Job]: Trabajo a procesar o None si no llegó ninguno
+        """
+        pass
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[Job]:
+        """
+        Recupera el estado de un trabajo.
+
+        Args:
+            job_id: Identificador del trabajo
+
+        Returns:
+            Optional[Job]: Trabajo o None si no existe o ya caducó
+        """
+        pass
+
+    @abstractmethod
+    async def update(self, job: Job) -> None:
+        """
+        Guarda el estado actual de un trabajo (progreso, resultado, error).
+
+        Args:
+            job: Trabajo actualizado
+        """
+        pass
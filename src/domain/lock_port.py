@@ -0,0 +1,43 @@
+"""
+Puerto para bloqueos distribuidos entre réplicas.
+"""
+from abc import ABC, abstractmethod
+from typing import Optional
+
+class LockPort(ABC):
+    """
+    Puerto abstracto para bloqueos con caducidad.
+
+    Los bloqueos son consultivos: sirven para que una sola réplica procese
+    un documento mientras las demás esperan su resultado, no para proteger
+    datos. Por eso la caducidad es obligatoria: si el dueño muere, el
+    bloqueo se libera solo.
+    """
+
+    @abstractmethod
+    async def acquire(self, key: str, ttl_seconds: float) -> Optional[str]:
+        """
+        Intenta tomar el bloqueo sin esperar.
+
+        Args:
+            key: Nombre del bloqueo
+            ttl_seconds: Segundos tras los que el bloqueo caduca
+
+        Returns:
+            Optional[str]: Token del dueño, o None si otro lo tiene
+        """
+        pass
+
+    @abstractmethod
+    async def release(self, key: str, token: str) -> bool:
+        """
+        Libera el bloqueo si sigue perteneciendo al token.
+
+        Args:
+            key: Nombre del bloqueo
+            token: Token devuelto por acquire
+
+        Returns:
+            bool: True si se liberó
+        """
+        pass
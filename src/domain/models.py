@@ -5,8 +5,11 @@ Este módulo define las estructuras de datos principales utilizadas en el sistem
 para representar documentos y sus páginas procesadas por Donut.
 """
 
-from dataclasses import dataclass
-from typing import List, Dict, Optional
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import Any, List, Dict, Optional
 
 @dataclass
 class Page:
@@ -22,6 +25,8 @@ class Page:
                        cualquier estructura o formato detectado
         refined_text (Optional[str]): Texto procesado o estructurado,
                                     si se ha aplicado algún procesamiento adicional
+        metadata (Dict): Información adicional de la página. Por ejemplo,
+                      "skipped" indica por qué no se ejecutó el modelo
     
     Example:
         >>> page = Page(number=1, raw_text="Contenido extraído...")
@@ -31,6 +36,7 @@ class Page:
     number: int
     raw_text: str
     refined_text: Optional[str] = None
+    metadata: Dict = field(default_factory=dict)
 
 @dataclass
 class Document:
@@ -61,4 +67,91 @@ class Document:
     """
     name: str
     pages: List[Page]
-    metadata: Dict
\ No newline at end of file
+    metadata: Dict
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Document":
+        """
+        Reconstruye un documento serializado con dataclasses.asdict.
+
+        Args:
+            data: Documento como diccionario (ej: leído del caché)
+
+        Returns:
+            Document: Documento con sus páginas como objetos Page
+        """
+        return cls(
+            name=data["name"],
+            pages=[Page(**page) for page in data["pages"]],
+            metadata=data.get("metadata", {})
+        )
+
+class JobStatus(str, Enum):
+    """Estados de un trabajo de OCR asíncrono"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+@dataclass
+class Job:
+    """
+    Trabajo de OCR asíncrono sobre un documento.
+
+    Se crea al recibir el documento y lo actualizan los workers en segundo
+    plano, de modo que el cliente puede consultar su estado y su progreso
+    por páginas sin mantener abierta la conexión.
+
+    Attributes:
+        path (str): Ruta al documento a procesar
+        id (str): Identificador del trabajo
+        status (JobStatus): Estado actual
+        client_id (Optional[str]): Cliente que envió el trabajo
+        content_hash (Optional[str]): Hash del contenido, si ya se calculó
+        cleanup (bool): Si el archivo se elimina al terminar (subidas temporales)
+        cost (Optional[float]): Coste estimado antes del OCR, en páginas
+                                equivalentes a tamaño carta
+        priority (Optional[float]): Orden en la cola (menor sale antes); por
+                                    defecto, el momento de creación (FIFO)
+        pages_done (int): Páginas procesadas
+        pages_total (Optional[int]): Páginas del documento, cuando se conocen
+        result (Optional[Dict]): Documento procesado serializado
+        error (Optional[str]): Motivo del fallo
+        created_at (float): Momento de creación (epoch)
+        started_at (Optional[float]): Momento en que un worker lo tomó
+        finished_at (Optional[float]): Momento en que terminó
+    """
+    path: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: JobStatus = JobStatus.QUEUED
+    client_id: Optional[str] = None
+    content_hash: Optional[str] = None
+    cleanup: bool = False
+    cost: Optional[float] = None
+    priority: Optional[float] = None
+    pages_done: int = 0
+    pages_total: Optional[int] = None
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def __post_init__(self):
+        if self.priority is None:
+            self.priority = self.created_at
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.DONE, JobStatus.FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializa el trabajo con tipos JSON"""
+        data = asdict(self)
+        data["status"] = self.status.value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        """Reconstruye un trabajo serializado con to_dict"""
+        return cls(**{**data, "status": JobStatus(data["status"])})
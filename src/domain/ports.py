@@ -1,12 +1,38 @@
 from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
 from .models import Document, Page
 
+# Entrada de OCR: ruta a una imagen, imagen en memoria (PIL) o tensor
+# ya preprocesado. Las rutas se mantienen por compatibilidad.
+PageImage = Union[str, Path, Any]
+
+# Progreso de un documento: (páginas procesadas, páginas totales)
+ProgressCallback = Callable[[int, int], None]
+
 class OcrPort(ABC):
     @abstractmethod
-    def extract_text(self, image_path: str) -> str:
+    def extract_text(self, image: PageImage) -> str:
         """Extrae texto de una imagen usando OCR"""
         pass
 
+    def extract_text_batch(self, images: List[PageImage]) -> List[str]:
+        """Extrae texto de varias imágenes, en orden"""
+        return [self.extract_text(image) for image in images]
+
+    @abstractmethod
+    def process_pdf(self, pdf_path: Path, progress: Optional[ProgressCallback] = None) -> Document:
+        """Procesa un PDF completo; progress recibe (páginas procesadas, páginas totales)"""
+        pass
+
+    def iter_pdf_pages(self, pdf_path: Path) -> Iterator[Page]:
+        """Genera las páginas de un PDF a medida que se procesan"""
+        yield from self.process_pdf(pdf_path).pages
+
+    def document_metadata(self) -> Dict:
+        """Metadata común de los documentos procesados por este motor"""
+        return {}
+
 class StoragePort(ABC):
     @abstractmethod
     def save_document(self, document: Document) -> str:
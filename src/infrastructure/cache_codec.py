@@ -0,0 +1,86 @@
+"""
+Codificación versionada de valores de caché.
+"""
+import json
+import zlib
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:  # msgpack es opcional: sin él se usa JSON compacto
+    msgpack = None
+
+
+class CacheCodec:
+    """
+    Serializa valores de caché con una cabecera de versión.
+
+    Formato: ``[versión][flags][payload]``. El payload es msgpack si está
+    instalado o JSON compacto en caso contrario, y se comprime con zlib
+    cuando supera ``compress_threshold`` bytes y la compresión ahorra
+    espacio. Los valores escritos como JSON plano por versiones anteriores
+    se siguen leyendo: un JSON nunca empieza por el byte de versión.
+    """
+
+    VERSION = 1
+    FLAG_COMPRESSED = 0x01
+    FLAG_MSGPACK = 0x02
+
+    def __init__(self, compress_threshold: int = 1024, compress_level: int = 6, use_msgpack: bool = True):
+        """
+        Args:
+            compress_threshold: Tamaño mínimo del payload para comprimir
+            compress_level: Nivel de compresión de zlib (1-9)
+            use_msgpack: Usar msgpack si está disponible
+        """
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+        self.use_msgpack = use_msgpack and msgpack is not None
+
+    def encode(self, value: Any) -> bytes:
+        """
+        Serializa un valor.
+
+        Args:
+            value: Valor a serializar
+
+        Returns:
+            bytes: Valor codificado con cabecera
+        """
+        flags = 0
+        if self.use_msgpack:
+            payload = msgpack.packb(value, use_bin_type=True, default=str)
+            flags |= self.FLAG_MSGPACK
+        else:
+            payload = json.dumps(value, separators=(",", ":"), default=str).encode()
+
+        if len(payload) >= self.compress_threshold:
+            compressed = zlib.compress(payload, self.compress_level)
+            if len(compressed) < len(payload):
+                payload = compressed
+                flags |= self.FLAG_COMPRESSED
+
+        return bytes((self.VERSION, flags)) + payload
+
+    def decode(self, raw: bytes) -> Any:
+        """
+        Deserializa un valor producido por encode() o JSON plano heredado.
+
+        Args:
+            raw: Bytes almacenados
+
+        Returns:
+            Any: Valor original
+        """
+        if not raw or raw[0] != self.VERSION:
+            return json.loads(raw)
+
+        flags = raw[1]
+        payload = raw[2:]
+        if flags & self.FLAG_COMPRESSED:
+            payload = zlib.decompress(payload)
+        if flags & self.FLAG_MSGPACK:
+            if msgpack is None:
+                raise ValueError("Valor codificado con msgpack, que no está instalado")
+            return msgpack.unpackb(payload, raw=False)
+        return json.loads(payload)
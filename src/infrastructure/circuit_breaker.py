@@ -0,0 +1,99 @@
+"""
+Circuit breaker para dependencias opcionales como el caché.
+"""
+import time
+from typing import Callable
+
+from infrastructure.monitoring import CIRCUIT_BREAKER_REJECTIONS, CIRCUIT_BREAKER_STATE
+
+
+class CircuitBreaker:
+    """
+    Corta las llamadas a una dependencia tras fallos consecutivos.
+
+    - closed: las llamadas pasan; ``failure_threshold`` fallos seguidos abren
+      el circuito.
+    - open: las llamadas se rechazan sin intentarlas durante ``reset_timeout``
+      segundos.
+    - half_open: pasado ese tiempo se permite una llamada de prueba; si tiene
+      éxito el circuito se cierra y si falla vuelve a abrirse.
+    """
+
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+    # Valor exportado en la métrica para cada estado
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            name: Nombre de la dependencia protegida (etiqueta de métricas)
+            failure_threshold: Fallos consecutivos que abren el circuito
+            reset_timeout: Segundos de enfriamiento antes de reintentar
+            clock: Reloj monotónico (inyectable en pruebas)
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._set_state(self.CLOSED)
+
+    def allow(self) -> bool:
+        """
+        Indica si se debe intentar la llamada.
+
+        Returns:
+            bool: False si el circuito está abierto
+        """
+        if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+            self._set_state(self.HALF_OPEN)
+
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+
+        CIRCUIT_BREAKER_REJECTIONS.labels(name=self.name).inc()
+        return False
+
+    def record_success(self):
+        """Registra una llamada correcta y cierra el circuito"""
+        self.failures = 0
+        self._trial_in_flight = False
+        if self.state != self.CLOSED:
+            self._set_state(self.CLOSED)
+
+    def release(self):
+        """
+        Libera la llamada de prueba sin resultado (ej: cancelada).
+
+        El estado no cambia: la siguiente llamada en half_open será la nueva
+        prueba. Sin esto, una prueba cancelada dejaría el circuito sin
+        admitir llamadas para siempre.
+        """
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        """Registra un fallo y abre el circuito si se alcanza el umbral"""
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+            self._set_state(self.OPEN)
+
+    def _set_state(self, state: str):
+        """Cambia de estado y actualiza la métrica"""
+        self.state = state
+        CIRCUIT_BREAKER_STATE.labels(name=self.name).set(self._STATE_VALUES[state])
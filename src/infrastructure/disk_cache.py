@@ -0,0 +1,331 @@
+"""
+Implementación del caché persistente en disco local usando SQLite.
+"""
+import asyncio
+import sqlite3
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import structlog
+
+from domain.cache_port import CachePort
+from infrastructure.cache_codec import CacheCodec
+
+logger = structlog.get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS meta (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    total_bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (id, total_bytes) VALUES (0, 0);
+"""
+
+
+class DiskCache(CachePort):
+    """
+    Implementación de CachePort sobre un archivo SQLite local.
+
+    Pensado para nodos sin Redis. La base de datos usa WAL, de modo que
+    varios procesos del mismo host pueden leer en paralelo mientras uno
+    escribe; las escrituras se serializan con BEGIN IMMEDIATE y esperan al
+    bloqueo hasta ``busy_timeout``. El tamaño total se mantiene en una tabla
+    auxiliar dentro de la misma transacción y, al superarse ``max_bytes``,
+    se expulsan primero las entradas caducadas y después las de acceso más
+    antiguo (LRU).
+
+    Las operaciones de SQLite son bloqueantes, así que se ejecutan en hilos
+    con una conexión por hilo. Como en RedisCache, un error de SQLite (disco
+    lleno, base de datos bloqueada o corrupta) se registra y se trata como
+    un fallo de caché, nunca como un error de la petición.
+    """
+
+    # Claves por consulta en operaciones en bloque (límite de parámetros de SQLite)
+    BULK_BATCH_SIZE = 500
+
+    # Entradas expulsadas por iteración al liberar espacio
+    EVICTION_BATCH_SIZE = 64
+
+    # Espera máxima por el bloqueo al actualizar el orden LRU en una lectura
+    TOUCH_TIMEOUT = 0.05
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = 1024 * 1024 * 1024,
+        codec: Optional[CacheCodec] = None,
+        busy_timeout: float = 5.0
+    ):
+        """
+        Args:
+            path: Ruta del archivo SQLite
+            max_bytes: Tamaño máximo de los valores almacenados
+            codec: Codificación de los valores (por defecto CacheCodec())
+            busy_timeout: Segundos de espera si otro proceso tiene el bloqueo
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.codec = codec or CacheCodec()
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Conexión del hilo actual, creada la primera vez que se usa"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.busy_timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _write(self, operation):
+        """Ejecuta una operación de escritura en una transacción inmediata"""
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            result = operation(connection)
+            connection.execute("COMMIT")
+            return result
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    async def _call(self, operation: Callable[[], Any], fallback: Any) -> Any:
+        """
+        Ejecuta una operación de SQLite en un hilo.
+
+        Args:
+            operation: Función bloqueante a ejecutar
+            fallback: Valor devuelto si SQLite falla
+
+        Returns:
+            Any: Resultado de la operación o fallback
+        """
+        try:
+            return await asyncio.to_thread(operation)
+        except sqlite3.Error as e:
+            logger.warning("disk_cache_unavailable", path=str(self.path), error=repr(e))
+            return fallback
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Recupera un valor del caché en disco.
+
+        Args:
+            key: Clave a buscar
+
+        Returns:
+            Optional[Any]: Valor deserializado o None si no existe o caducó
+        """
+        return (await self.get_many([key])).get(key)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Recupera varios valores con una consulta por cada BULK_BATCH_SIZE claves.
+
+        Args:
+            keys: Claves a buscar
+
+        Returns:
+            Dict[str, Any]: Valores encontrados, indexados por clave
+        """
+        return await self._call(lambda: self._get_many(keys), {})
+
+    def _get_many(self, keys: List[str]) -> Dict[str, Any]:
+        connection = self._connection()
+        now = time.time()
+        found = {}
+        for start in range(0, len(keys), self.BULK_BATCH_SIZE):
+            chunk = keys[start:start + self.BULK_BATCH_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = connection.execute(
+                f"SELECT key, value FROM entries WHERE key IN ({placeholders}) "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (*chunk, now)
+            ).fetchall()
+            for key, value in rows:
+                try:
+                    found[key] = self.codec.decode(value)
+                except Exception as e:
+                    logger.warning("disk_cache_decode_failed", key=key, error=str(e))
+
+        if found:
+            self._touch(connection, list(found), now)
+        return found
+
+    def _touch(self, connection: sqlite3.Connection, keys: List[str], now: float):
+        """
+        Actualiza el orden LRU de las claves leídas.
+
+        Es un ajuste aproximado: si otro proceso tiene el bloqueo de
+        escritura se espera como mucho TOUCH_TIMEOUT y se omite, en lugar de
+        bloquear la lectura durante ``busy_timeout``.
+        """
+        connection.execute(f"PRAGMA busy_timeout = {int(self.TOUCH_TIMEOUT * 1000)}")
+        try:
+            self._write(lambda c: c.executemany(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                [(now, key) for key in keys]
+            ))
+        except sqlite3.Error as e:
+            logger.debug("disk_cache_touch_skipped", keys=len(keys), error=str(e))
+        finally:
+            connection.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout * 1000)}")
+
+    async def set(self, key: str, value: Any, ttl: Optional[timedelta] = None) -> bool:
+        """
+        Almacena un valor en disco.
+
+        Args:
+            key: Clave para almacenar el valor
+            value: Valor a almacenar (será serializado con el codec)
+            ttl: Tiempo de vida del valor en caché
+
+        Returns:
+            bool: True si se almacenó correctamente
+        """
+        return await self.set_many({key: value}, ttl)
+
+    async def set_many(self, items: Dict[str, Any], ttl: Optional[timedelta] = None) -> bool:
+        """
+        Almacena varios valores en una única transacción.
+
+        Args:
+            items: Valores a almacenar, indexados por clave
+            ttl: Tiempo de vida de los valores en caché
+
+        Returns:
+            bool: True si se almacenaron correctamente
+        """
+        encoded = {key: self.codec.encode(value) for key, value in items.items()}
+
+        def store() -> bool:
+            self._write(lambda c: self._store(c, encoded, ttl))
+            return True
+
+        return await self._call(store, False)
+
+    def _store(self, connection: sqlite3.Connection, encoded: Dict[str, bytes], ttl: Optional[timedelta]):
+        now = time.time()
+        expires_at = now + ttl.total_seconds() if ttl else None
+        delta = 0
+        for key, value in encoded.items():
+            row = connection.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), expires_at, now)
+            )
+            delta += len(value) - (row[0] if row else 0)
+        connection.execute("UPDATE meta SET total_bytes = total_bytes + ? WHERE id = 0", (delta,))
+        self._evict(connection, now)
+
+    def _evict(self, connection: sqlite3.Connection, now: float):
+        """Libera espacio: primero entradas caducadas, después las menos usadas"""
+        total = connection.execute("SELECT total_bytes FROM meta WHERE id = 0").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        expired = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries WHERE expires_at <= ?", (now,)
+        ).fetchone()[0]
+        connection.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        total -= expired
+
+        while total > self.max_bytes:
+            rows = connection.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT ?",
+                (self.EVICTION_BATCH_SIZE,)
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        connection.execute("UPDATE meta SET total_bytes = ? WHERE id = 0", (max(total, 0),))
+
+    async def delete(self, key: str) -> bool:
+        """
+        Elimina un valor del caché en disco.
+
+        Args:
+            key: Clave a eliminar
+
+        Returns:
+            bool: True si se eliminó correctamente
+        """
+        deleted = await self._call(lambda: self._write(lambda c: self._delete_where(c, "key = ?", (key,))), 0)
+        return deleted > 0
+
+    async def exists(self, key: str) -> bool:
+        """
+        Verifica si una clave existe y no ha caducado.
+
+        Args:
+            key: Clave a verificar
+
+        Returns:
+            bool: True si la clave existe
+        """
+        def query() -> bool:
+            row = self._connection().execute(
+                "SELECT 1 FROM entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time())
+            ).fetchone()
+            return row is not None
+
+        return await self._call(query, False)
+
+    async def delete_matching(self, pattern: str, exclude_prefix: Optional[str] = None) -> int:
+        """
+        Elimina en bloque las claves que coinciden con un patrón glob.
+
+        Args:
+            pattern: Patrón glob de claves (ej: "ocr:document:*")
+            exclude_prefix: Prefijo de las claves que deben conservarse
+
+        Returns:
+            int: Número de claves eliminadas
+        """
+        where, params = "key GLOB ?", [pattern]
+        if exclude_prefix:
+            where += " AND substr(key, 1, ?) != ?"
+            params += [len(exclude_prefix), exclude_prefix]
+        return await self._call(lambda: self._write(lambda c: self._delete_where(c, where, params)), 0)
+
+    @staticmethod
+    def _delete_where(connection: sqlite3.Connection, where: str, params) -> int:
+        """Borra las entradas que cumplen la condición y actualiza el tamaño total"""
+        freed, count = connection.execute(
+            f"SELECT COALESCE(SUM(size), 0), COUNT(*) FROM entries WHERE {where}", params
+        ).fetchone()
+        connection.execute(f"DELETE FROM entries WHERE {where}", params)
+        connection.execute("UPDATE meta SET total_bytes = total_bytes - ? WHERE id = 0", (freed,))
+        return count
+
+    async def close(self):
+        """
+        Cierra la conexión del hilo actual.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
@@ -1,96 +1,458 @@
-from typing import List, Optional
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 import torch
 from PIL import Image
-from transformers import DonutProcessor, VisionEncoderDecoderModel
-from pdf2image import convert_from_path
+from transformers import DonutProcessor
+from transformers.modeling_outputs import BaseModelOutput
 
-from domain.ports import OcrPort
+from domain.cache_port import CachePort
+from domain.ports import OcrPort, PageImage, ProgressCallback
 from domain.models import Page, Document
-from config.settings import Settings
+from application.quality_service import DocumentQualityService
+from infrastructure.micro_batcher import MicroBatcher
+from infrastructure.model_loader import load_donut_model, select_device
+from infrastructure.monitoring import BLANK_PAGES_SKIPPED, MetricsCollector
+from infrastructure.ocr_pipeline import OcrPipeline
+from infrastructure.page_cache import PageCache
+from infrastructure.page_filters import blank_page_reason
+from infrastructure.pdf_rasterizer import PdfRasterizer
+from infrastructure.thread_budget import ThreadBudget
+from config.settings import OCR_ENGINE_VERSION, Settings
 
 class DonutAdapter(OcrPort):
     """Adaptador OCR usando el modelo Donut (Document Understanding Transformer)"""
 
-    def __init__(self, settings: Settings):
-        """Inicializa el adaptador Donut con la configuración especificada"""
+    def __init__(
+        self,
+        settings: Settings,
+        quality_service: Optional[DocumentQualityService] = None,
+        page_cache: Optional[CachePort] = None,
+        thread_budget: Optional[ThreadBudget] = None
+    ):
+        """
+        Inicializa el adaptador Donut con la configuración especificada.
+
+        Args:
+            settings: Configuración del procesamiento
+            quality_service: Fija el umbral de confianza de la decodificación adaptativa
+            page_cache: Backend dedicado para el caché de OCR por página
+            thread_budget: Reparto de núcleos (sin él se usa settings.num_threads)
+        """
         self.settings = settings
-        self.model_name = "naver-clova-ix/donut-base-finetuned-cord-v2"
+        self.quality_service = quality_service or DocumentQualityService()
+        self._beam_seconds_per_page: Optional[float] = None
+        self.model_name = settings.model_name
         self.processor = DonutProcessor.from_pretrained(self.model_name)
-        self.model = VisionEncoderDecoderModel.from_pretrained(self.model_name)
+        self.model = load_donut_model(
+            self.model_name,
+            engine=settings.inference_engine,
+            cache_dir=settings.model_cache_dir
+        )
         
         # Mover a CPU/GPU según configuración
-        self.device = "cuda" if torch.cuda.is_available() and settings.use_gpu else "cpu"
+        self.device = select_device(settings.use_gpu, settings.inference_engine)
         self.model.to(self.device)
+
+        self.rasterizer = PdfRasterizer(
+            dpi=settings.pdf_dpi,
+            thread_count=thread_budget.rasterize_threads if thread_budget else settings.num_threads,
+            max_inflight_pages=settings.max_inflight_pages
+        )
+        self.pipeline = OcrPipeline(
+            preprocess=self._preprocess_stage,
+            infer=self._infer_stage,
+            batch_size=settings.inference_batch_size,
+            preprocess_workers=settings.pipeline_preprocess_workers,
+            infer_workers=settings.pipeline_infer_workers,
+            queue_size=settings.pipeline_queue_size,
+            on_thread_start=thread_budget.pin_current_thread if thread_budget else None
+        )
+        # Con micro-batching, las páginas de todas las peticiones en curso
+        # comparten llamadas a generate en lugar de lanzar una por petición
+        self.batcher = MicroBatcher(
+            process=lambda rows: self.infer(torch.cat(rows)),
+            max_batch_size=settings.micro_batch_max_size,
+            max_wait_ms=settings.micro_batch_wait_ms,
+            workers=settings.pipeline_infer_workers,
+            on_thread_start=thread_budget.pin_current_thread if thread_budget else None
+        ) if settings.micro_batching else None
         
         self.task_prompt = "<s_docvqa><s_question>Extract text</s_question><s_answer>"
+        # El prompt es fijo: se tokeniza una sola vez
+        self.task_prompt_ids = self.processor.tokenizer(
+            self.task_prompt, return_tensors="pt"
+        ).input_ids.to(self.device)
+
+        self.page_cache = PageCache(
+            page_cache,
+            params=self.cache_params(),
+            ttl=timedelta(hours=settings.redis_cache_ttl_hours)
+        ) if page_cache is not None else None
+
+    def cache_params(self) -> Dict:
+        """Parámetros que afectan al texto extraído y forman parte de las claves de caché"""
+        return {
+            "engine_version": OCR_ENGINE_VERSION,
+            "model": self.model_name,
+            "engine": self.settings.inference_engine,
+            "prompt": self.task_prompt,
+            "dpi": self.settings.pdf_dpi,
+            "generation": {
+                "max_length": self.settings.max_output_length,
+                "num_beams": self.settings.num_beams,
+                "adaptive": self.settings.adaptive_decoding
+            }
+        }
 
-    def extract_text(self, image_path: str) -> str:
-        """Extrae texto de una imagen usando Donut"""
+    def extract_text(self, image: PageImage) -> str:
+        """
+        Extrae texto de una imagen usando Donut.
+
+        Args:
+            image: Imagen en memoria, tensor preprocesado o ruta a un archivo
+        """
         try:
-            # Cargar y preparar la imagen
-            image = Image.open(image_path).convert("RGB")
-            pixel_values = self.processor(image, return_tensors="pt").pixel_values
-            pixel_values = pixel_values.to(self.device)
-
-            # Generar el texto
-            outputs = self.model.generate(
-                pixel_values,
-                decoder_input_ids=self.processor.tokenizer(
-                    self.task_prompt, return_tensors="pt"
-                ).input_ids.to(self.device),
-                max_length=self.settings.max_output_length,
-                num_beams=self.settings.num_beams,
-            )
-
-            # Decodificar resultado
-            result = self.processor.batch_decode(outputs, skip_special_tokens=True)[0]
-            return result
+            return self.extract_text_batch([image])[0]
 
         except Exception as e:
             raise OCRError(f"Error procesando imagen con Donut: {str(e)}")
 
-    def process_pdf(self, pdf_path: Path) -> Document:
-        """Procesa un PDF completo y retorna un Document con el texto extraído"""
+    def extract_text_batch(self, images: List[PageImage]) -> List[str]:
+        """
+        Extrae texto de varias imágenes con una única pasada del encoder
+        y una única llamada a generate.
+
+        Args:
+            images: Páginas en orden (imágenes, tensores o rutas)
+
+        Returns:
+            List[str]: Texto extraído de cada imagen, en el mismo orden
+        """
+        if not images:
+            return []
+        return self._infer_shared(self.preprocess(images))
+
+    def preprocess(self, images: List[PageImage]) -> torch.Tensor:
+        """
+        Convierte las entradas en un único tensor de pixel_values.
+
+        Los tensores se usan tal cual; las imágenes y rutas pasan por el
+        procesador de Donut en una sola llamada.
+
+        Args:
+            images: Páginas en orden (imágenes, tensores o rutas)
+
+        Returns:
+            torch.Tensor: pixel_values apilados, uno por página
+        """
+        values: List[Optional[torch.Tensor]] = [None] * len(images)
+        pending = []
+        for idx, image in enumerate(images):
+            if isinstance(image, torch.Tensor):
+                values[idx] = image if image.dim() == 4 else image.unsqueeze(0)
+            else:
+                pending.append((idx, self._load_image(image)))
+
+        if pending:
+            processed = self.processor(
+                [image for _, image in pending], return_tensors="pt"
+            ).pixel_values
+            for (idx, _), value in zip(pending, processed):
+                values[idx] = value.unsqueeze(0)
+
+        return torch.cat(values).to(self.device)
+
+    def infer(self, pixel_values: torch.Tensor, max_length: Optional[int] = None) -> List[str]:
+        """
+        Ejecuta generate y decodifica un lote ya preprocesado.
+
+        Con decodificación adaptativa el lote se decodifica primero de forma
+        voraz (greedy); solo las páginas cuya confianza media por token no
+        alcanza DocumentQualityService.min_confidence se vuelven a decodificar
+        con beam search, reutilizando la salida del encoder.
+
+        Args:
+            pixel_values: Tensor con una fila por página
+            max_length: Longitud máxima de salida (por defecto la de Settings)
+
+        Returns:
+            List[str]: Texto de cada página, en el orden del lote
+        """
+        max_length = max_length or self.settings.max_output_length
+        num_beams = self.settings.num_beams
+        batch = pixel_values.shape[0]
+
+        with torch.inference_mode():
+            # El encoder se ejecuta una sola vez por lote
+            encoder_outputs = self.model.encoder(pixel_values=pixel_values)
+
+            if not self.settings.adaptive_decoding or num_beams <= 1:
+                texts, _ = self._decode(encoder_outputs, num_beams, max_length)
+                return texts
+
+            started = time.perf_counter()
+            texts, confidences = self._decode(encoder_outputs, 1, max_length)
+            greedy_seconds = time.perf_counter() - started
+
+            # Solo la confianza decide: should_retry también reintenta las
+            # páginas con pocas palabras, y una página casi vacía es legítima
+            retry = [
+                idx for idx, confidence in enumerate(confidences)
+                if confidence < self.quality_service.min_confidence
+            ]
+            if retry:
+                subset = BaseModelOutput(
+                    last_hidden_state=encoder_outputs.last_hidden_state[retry]
+                )
+                started = time.perf_counter()
+                beam_texts, _ = self._decode(subset, num_beams, max_length)
+                self._beam_seconds_per_page = (time.perf_counter() - started) / len(retry)
+                for idx, text in zip(retry, beam_texts):
+                    texts[idx] = text
+
+        MetricsCollector.record_adaptive_decode(
+            pages=batch,
+            escalated=len(retry),
+            saved_seconds=self._estimate_saved_seconds(batch - len(retry), greedy_seconds / batch)
+        )
+        return texts
+
+    def _infer_shared(self, pixel_values: torch.Tensor) -> List[str]:
+        """
+        Ejecuta el modelo sobre un lote, agrupándolo con otras peticiones si
+        el micro-batching está activo.
+        """
+        if self.batcher is None:
+            return self.infer(pixel_values)
+        return self.batcher.submit(list(pixel_values.split(1)))
+
+    def _decode(
+        self,
+        encoder_outputs: BaseModelOutput,
+        num_beams: int,
+        max_length: int
+    ) -> Tuple[List[str], List[Optional[float]]]:
+        """
+        Decodifica un lote a partir de la salida del encoder.
+
+        Returns:
+            Tuple[List[str], List[Optional[float]]]: Textos y, en decodificación
+            voraz, la probabilidad media por token de cada secuencia
+        """
+        batch = encoder_outputs.last_hidden_state.shape[0]
+        # Mismo prompt para cada elemento del lote
+        decoder_input_ids = self.task_prompt_ids.repeat(batch, 1)
+        greedy = num_beams == 1
+
+        outputs = self.model.generate(
+            encoder_outputs=encoder_outputs,
+            decoder_input_ids=decoder_input_ids,
+            max_length=max_length,
+            num_beams=num_beams,
+            pad_token_id=self.processor.tokenizer.pad_token_id,
+            eos_token_id=self.processor.tokenizer.eos_token_id,
+            output_scores=greedy,
+            return_dict_in_generate=True,
+        )
+
+        # generate devuelve una secuencia por imagen, en el orden de entrada
+        texts = self.processor.batch_decode(outputs.sequences, skip_special_tokens=True)
+        if not greedy:
+            return texts, [None] * batch
+
+        log_probs = self.model.compute_transition_scores(
+            outputs.sequences, outputs.scores, normalize_logits=True
+        )
+        generated = outputs.sequences[:, decoder_input_ids.shape[1]:]
+        valid = generated != self.processor.tokenizer.pad_token_id
+        # Las posiciones de relleno pueden tener log-prob -inf: se excluyen
+        log_probs = torch.where(valid, log_probs, torch.zeros_like(log_probs))
+        mean_log_probs = log_probs.sum(dim=1) / valid.sum(dim=1).clamp(min=1)
+        return texts, mean_log_probs.exp().tolist()
+
+    def _estimate_saved_seconds(self, greedy_pages: int, greedy_seconds_per_page: float) -> float:
+        """
+        Estima el tiempo de decodificación ahorrado al no usar beam search.
+
+        Usa el coste por página de la última escalada con beams; hasta que
+        no haya ninguna no se estima ahorro.
+        """
+        if self._beam_seconds_per_page is None:
+            return 0.0
+        return greedy_pages * max(0.0, self._beam_seconds_per_page - greedy_seconds_per_page)
+
+    def warmup(self):
+        """
+        Ejecuta una inferencia mínima sobre una página en blanco.
+
+        Carga los pesos en memoria y paga el coste de la primera ejecución
+        antes de atender peticiones reales.
+        """
+        image = Image.new("RGB", (640, 480), "white")
+        self.infer(self.preprocess([image]), max_length=self.task_prompt_ids.shape[1] + 4)
+
+    def process_pages(self, images: List[PageImage]) -> List[Tuple[str, Dict]]:
+        """
+        Procesa un lote de páginas sin pipeline (ej: dentro de una réplica).
+
+        Aplica la omisión de páginas en blanco y el caché de páginas igual que
+        process_pdf.
+
+        Returns:
+            List[Tuple[str, Dict]]: Texto y metadata de cada página, en orden
+        """
+        return self._infer_stage(self._preprocess_stage(images))
+
+    def _preprocess_stage(self, images: List[PageImage]) -> "_PreparedBatch":
+        """
+        Etapa de preprocesado del pipeline.
+
+        Resuelve sin modelo las páginas en blanco y las que ya están en el
+        caché de páginas (una única consulta por lote) y normaliza el resto.
+        """
+        results: List[Optional[Tuple[str, Dict]]] = []
+        for image in images:
+            reason = self._skip_reason(image)
+            if reason:
+                BLANK_PAGES_SKIPPED.labels(reason=reason).inc()
+                results.append(("", {"skipped": reason}))
+            else:
+                results.append(None)
+
+        pending = [idx for idx, result in enumerate(results) if result is None]
+        keys: Dict[int, str] = {}
+        if self.page_cache is not None:
+            keys = {
+                idx: self.page_cache.key(images[idx])
+                for idx in pending if isinstance(images[idx], Image.Image)
+            }
+            cached = self.page_cache.lookup(list(keys.values()))
+            for idx, key in keys.items():
+                if key in cached:
+                    results[idx] = (cached[key], {"cached": True})
+            pending = [idx for idx in pending if results[idx] is None]
+
+        return _PreparedBatch(
+            results=results,
+            pending_keys=[keys.get(idx) for idx in pending],
+            pixel_values=self.preprocess([images[idx] for idx in pending]) if pending else None
+        )
+
+    def _infer_stage(self, batch: "_PreparedBatch") -> List[Tuple[str, Dict]]:
+        """
+        Etapa de inferencia del pipeline.
+
+        Ejecuta el modelo sobre las páginas pendientes y guarda sus textos en
+        el caché de páginas.
+
+        Returns:
+            List[Tuple[str, Dict]]: Texto y metadata de cada página del lote
+        """
+        results = list(batch.results)
+        if batch.pixel_values is None:
+            return results
+
+        pending = [idx for idx, result in enumerate(results) if result is None]
+        fresh = {}
+        for idx, key, text in zip(pending, batch.pending_keys, self._infer_shared(batch.pixel_values)):
+            results[idx] = (text, {})
+            if key is not None:
+                fresh[key] = text
+
+        if self.page_cache is not None:
+            self.page_cache.store(fresh)
+        return results
+
+    def _skip_reason(self, image: PageImage) -> Optional[str]:
+        """Motivo para omitir una página renderizada, o None"""
+        if not self.settings.skip_blank_pages or not isinstance(image, Image.Image):
+            return None
+        return blank_page_reason(image, self.settings.blank_page_ink_ratio)
+
+    @staticmethod
+    def _load_image(image: PageImage) -> Image.Image:
+        """Obtiene una imagen RGB; las rutas se abren por compatibilidad"""
+        if isinstance(image, (str, Path)):
+            image = Image.open(image)
+        return image if image.mode == "RGB" else image.convert("RGB")
+
+    def iter_pdf_pages(self, pdf_path: Path) -> Iterator[Page]:
+        """
+        Genera las páginas de un PDF a medida que se procesan.
+
+        Cerrar el generador cancela el trabajo pendiente del pipeline.
+
+        Args:
+            pdf_path: Ruta al PDF
+
+        Yields:
+            Page: Cada página procesada, en orden
+        """
         try:
-            # Convertir PDF a imágenes
-            pages = convert_from_path(
-                pdf_path,
-                dpi=self.settings.pdf_dpi,
-                thread_count=self.settings.num_threads
-            )
-
-            # Procesar cada página
-            processed_pages: List[Page] = []
-            for idx, page_image in enumerate(pages, start=1):
-                # Guardar imagen temporalmente
-                temp_image_path = self.settings.temp_dir / f"page_{idx}.png"
-                page_image.save(temp_image_path)
-
-                # Extraer texto
-                raw_text = self.extract_text(str(temp_image_path))
-                processed_pages.append(Page(
-                    number=idx,
+            # Renderizar por ventanas y solapar render, preprocesado e inferencia
+            pages = self.rasterizer.iter_pages(pdf_path)
+
+            for number, (raw_text, page_metadata) in enumerate(self.pipeline.run(pages), start=1):
+                yield Page(
+                    number=number,
                     raw_text=raw_text,
-                    refined_text=None
-                ))
-
-                # Limpiar archivo temporal
-                temp_image_path.unlink()
-
-            return Document(
-                name=pdf_path.name,
-                pages=processed_pages,
-                metadata={
-                    "ocr_engine": "donut",
-                    "model": "naver-clova/donut-base",
-                    "dpi": self.settings.pdf_dpi
-                }
-            )
+                    refined_text=None,
+                    metadata=page_metadata
+                )
 
         except Exception as e:
             raise OCRError(f"Error procesando PDF con Donut: {str(e)}")
 
+    def document_metadata(self) -> Dict:
+        """Metadata común de los documentos procesados por este motor"""
+        return {
+            "ocr_engine": "donut",
+            "model": self.model_name,
+            "dpi": self.settings.pdf_dpi,
+            "batch_size": self.pipeline.batch_size
+        }
+
+    def process_pdf(self, pdf_path: Path, progress: Optional[ProgressCallback] = None) -> Document:
+        """
+        Procesa un PDF completo y retorna un Document con el texto extraído.
+
+        Args:
+            pdf_path: Ruta al PDF
+            progress: Se llama con (páginas procesadas, páginas totales)
+                      tras cada página
+        """
+        total = self.rasterizer.page_count(pdf_path) if progress else 0
+
+        processed_pages: List[Page] = []
+        for page in self.iter_pdf_pages(pdf_path):
+            processed_pages.append(page)
+            if progress:
+                progress(len(processed_pages), total)
+
+        return Document(
+            name=pdf_path.name,
+            pages=processed_pages,
+            metadata=self.document_metadata()
+        )
+
+@dataclass
+class _PreparedBatch:
+    """
+    Lote entre las etapas de preprocesado e inferencia.
+
+    Attributes:
+        results: Resultado de cada página ya resuelta (en blanco o en caché),
+                 None para las pendientes de inferencia
+        pending_keys: Clave de caché de cada página pendiente, en orden
+        pixel_values: Entrada del modelo para las páginas pendientes
+    """
+    results: List[Optional[Tuple[str, Dict]]]
+    pending_keys: List[Optional[str]]
+    pixel_values: Optional[torch.Tensor]
+
 class OCRError(Exception):
     """Excepción específica para errores de OCR"""
     pass
@@ -1,7 +1,17 @@
-from transformers import DonutProcessor, VisionEncoderDecoderModel
+from transformers import DonutProcessor
+from transformers.modeling_outputs import BaseModelOutput
 import torch
 from PIL import Image
 import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from domain.exceptions import OCRError
+from domain.models import Document, Page
+from domain.ports import OcrPort, PageImage, ProgressCallback
+from infrastructure.model_loader import load_donut_model, select_device
+from infrastructure.pdf_rasterizer import PdfRasterizer
+from config.settings import Settings
 
 class ImprovedDonutAdapter(OcrPort):
     def __init__(self, settings: Settings):
@@ -9,10 +19,20 @@ class ImprovedDonutAdapter(OcrPort):
         # Usar modelo específico para documentos en español
         self.model_name = "naver-clova-ix/donut-base-finetuned-docvqa"
         self.processor = DonutProcessor.from_pretrained(self.model_name)
-        self.model = VisionEncoderDecoderModel.from_pretrained(self.model_name)
+        self.model = load_donut_model(
+            self.model_name,
+            engine=settings.inference_engine,
+            cache_dir=settings.model_cache_dir
+        )
         
-        self.device = "cuda" if torch.cuda.is_available() and settings.use_gpu else "cpu"
+        self.device = select_device(settings.use_gpu, settings.inference_engine)
         self.model.to(self.device)
+
+        self.rasterizer = PdfRasterizer(
+            dpi=settings.pdf_dpi,
+            thread_count=settings.num_threads,
+            max_inflight_pages=settings.max_inflight_pages
+        )
         
         # Prompts mejorados para diferentes tipos de documentos
         self.task_prompts = {
@@ -20,46 +40,153 @@ class ImprovedDonutAdapter(OcrPort):
             "table": "<s_docvqa><s_question>Extract table data</s_question><s_answer>",
             "form": "<s_docvqa><s_question>Extract form fields and values</s_question><s_answer>"
         }
+        # Los prompts son fijos: se tokenizan una sola vez y se rellenan por
+        # la derecha hasta una longitud común para decodificarlos juntos
+        self.prompt_types = list(self.task_prompts)
+        prompt_ids = [
+            self.processor.tokenizer(
+                self.task_prompts[document_type],
+                return_tensors="pt",
+                add_special_tokens=False
+            ).input_ids[0]
+            for document_type in self.prompt_types
+        ]
+        width = max(len(ids) for ids in prompt_ids)
+        self.task_prompt_ids = torch.full(
+            (len(prompt_ids), width), self.processor.tokenizer.pad_token_id, dtype=torch.long
+        )
+        self.task_prompt_mask = torch.zeros((len(prompt_ids), width), dtype=torch.long)
+        for row, ids in enumerate(prompt_ids):
+            self.task_prompt_ids[row, :len(ids)] = ids
+            self.task_prompt_mask[row, :len(ids)] = 1
+        self.task_prompt_ids = self.task_prompt_ids.to(self.device)
+        self.task_prompt_mask = self.task_prompt_mask.to(self.device)
     
-    def extract_text(self, image_path: str, document_type: str = "general") -> str:
+    def extract_text(self, image: PageImage, document_type: str = "general") -> str:
         """Extrae texto con mejor manejo de prompts y postprocesamiento"""
+        return self.extract_text_multi(image, [document_type])[document_type]
+
+    def process_pdf(self, pdf_path: Path, progress: Optional[ProgressCallback] = None) -> Document:
+        """
+        Procesa un PDF página a página con el prompt general.
+
+        Args:
+            pdf_path: Ruta al PDF
+            progress: Se llama con (páginas procesadas, páginas totales)
+                      tras cada página
+        """
+        total = self.rasterizer.page_count(pdf_path) if progress else 0
+
+        pages: List[Page] = []
+        for image in self.rasterizer.iter_pages(pdf_path):
+            pages.append(Page(number=len(pages) + 1, raw_text=self.extract_text(image)))
+            if progress:
+                progress(len(pages), total)
+
+        return Document(name=pdf_path.name, pages=pages, metadata=self.document_metadata())
+
+    def document_metadata(self) -> Dict:
+        """Metadata común de los documentos procesados por este motor"""
+        return {
+            "ocr_engine": "donut_v2",
+            "model": self.model_name,
+            "dpi": self.settings.pdf_dpi
+        }
+
+    def extract_text_multi(self, image: PageImage, document_types: List[str]) -> Dict[str, str]:
+        """
+        Extrae texto de una página con varios prompts codificándola una sola vez.
+
+        El encoder Swin se ejecuta una vez y todos los prompts se decodifican
+        juntos, en un solo generate, contra las mismas encoder_outputs.
+
+        Args:
+            image: Imagen en memoria, tensor preprocesado o ruta a un archivo
+            document_types: Prompts a aplicar ("general", "table", "form");
+                            un tipo desconocido usa el prompt "general"
+
+        Returns:
+            Dict[str, str]: Texto limpio por cada tipo pedido
+        """
         try:
-            image = Image.open(image_path).convert("RGB")
-            
-            # Preprocessar imagen para mejor calidad
-            image = self._preprocess_image(image)
-            
+            encoder_outputs = self.encode(image)
+            return self.decode_prompts(encoder_outputs, document_types)
+
+        except Exception as e:
+            raise OCRError(f"Error procesando imagen con Donut: {str(e)}")
+
+    def encode(self, image: PageImage) -> BaseModelOutput:
+        """
+        Ejecuta solo el encoder sobre una página.
+
+        Args:
+            image: Imagen en memoria, tensor preprocesado o ruta a un archivo
+
+        Returns:
+            BaseModelOutput: Salida del encoder reutilizable entre prompts
+        """
+        if isinstance(image, torch.Tensor):
+            pixel_values = image if image.dim() == 4 else image.unsqueeze(0)
+        else:
+            # Acepta imágenes en memoria; las rutas se abren por compatibilidad
+            if isinstance(image, (str, Path)):
+                image = Image.open(image)
+            image = self._preprocess_image(image.convert("RGB"))
             pixel_values = self.processor(image, return_tensors="pt").pixel_values
-            pixel_values = pixel_values.to(self.device)
-            
-            prompt = self.task_prompts.get(document_type, self.task_prompts["general"])
-            decoder_input_ids = self.processor.tokenizer(
-                prompt, 
-                return_tensors="pt",
-                add_special_tokens=False
-            ).input_ids.to(self.device)
-            
-            # Parámetros optimizados para mejor calidad
+
+        with torch.inference_mode():
+            return self.model.encoder(pixel_values=pixel_values.to(self.device))
+
+    def decode_prompts(
+        self,
+        encoder_outputs: BaseModelOutput,
+        document_types: List[str]
+    ) -> Dict[str, str]:
+        """
+        Decodifica varios prompts contra la salida del encoder de una página.
+
+        Args:
+            encoder_outputs: Salida de encode() para una página
+            document_types: Prompts a aplicar; un tipo desconocido usa el
+                            prompt "general", como en extract_text
+
+        Returns:
+            Dict[str, str]: Texto limpio por cada tipo pedido
+        """
+        prompt_types = {
+            document_type: document_type if document_type in self.task_prompts else "general"
+            for document_type in document_types
+        }
+
+        # Un solo generate: prompts rellenados y enmascarados, una fila por tipo
+        used = list(dict.fromkeys(prompt_types.values()))
+        rows = [self.prompt_types.index(document_type) for document_type in used]
+        expanded = BaseModelOutput(
+            last_hidden_state=encoder_outputs.last_hidden_state.expand(len(rows), -1, -1)
+        )
+
+        # Parámetros optimizados para mejor calidad
+        with torch.inference_mode():
             outputs = self.model.generate(
-                pixel_values,
-                decoder_input_ids=decoder_input_ids,
+                encoder_outputs=expanded,
+                decoder_input_ids=self.task_prompt_ids[rows],
+                decoder_attention_mask=self.task_prompt_mask[rows],
                 max_length=self.settings.max_output_length,
                 num_beams=self.settings.num_beams,
-                temperature=0.1,  # Más determinístico
-                do_sample=False,
+                do_sample=False,  # Determinístico
                 early_stopping=True,
                 pad_token_id=self.processor.tokenizer.pad_token_id,
                 eos_token_id=self.processor.tokenizer.eos_token_id
             )
-            
-            # Decodificar y limpiar resultado
-            result = self.processor.batch_decode(outputs, skip_special_tokens=True)[0]
-            cleaned_text = self._postprocess_text(result, prompt)
-            
-            return cleaned_text
-            
-        except Exception as e:
-            raise OCRError(f"Error procesando imagen con Donut: {str(e)}")
+
+        # Decodificar y limpiar resultado
+        decoded = self.processor.batch_decode(outputs, skip_special_tokens=True)
+        results = {
+            document_type: self._postprocess_text(text, self.task_prompts[document_type])
+            for document_type, text in zip(used, decoded)
+        }
+
+        return {requested: results[prompt] for requested, prompt in prompt_types.items()}
     
     def _preprocess_image(self, image: Image.Image) -> Image.Image:
         """Preprocesa imagen para mejor OCR"""
@@ -0,0 +1,47 @@
+"""
+Estimación del coste de OCR de un PDF a partir de su cabecera.
+"""
+import os
+import re
+
+import structlog
+from pdf2image import pdfinfo_from_path
+
+logger = structlog.get_logger(__name__)
+
+# Área de una página carta en puntos: unidad de coste
+LETTER_AREA_PTS = 612 * 792
+
+_PAGE_SIZE = re.compile(r"([\d.]+)\s*x\s*([\d.]+)")
+
+
+def estimate_pdf_cost(path: str, bytes_per_page: int = 100 * 1024) -> float:
+    """
+    Estima el coste de OCR de un PDF sin renderizarlo.
+
+    Lee el número de páginas y el tamaño de página de la cabecera (pdfinfo):
+    el coste de rasterizar y preprocesar crece con el área a DPI fijo. Si la
+    cabecera no se puede leer, se estima por el tamaño del archivo.
+
+    Args:
+        path: Ruta al PDF
+        bytes_per_page: Bytes por página supuestos al estimar por tamaño
+
+    Returns:
+        float: Coste en páginas equivalentes a tamaño carta
+    """
+    try:
+        info = pdfinfo_from_path(path)
+        pages = int(info["Pages"])
+        match = _PAGE_SIZE.search(str(info.get("Page size", "")))
+        area_ratio = 1.0
+        if match:
+            width, height = float(match.group(1)), float(match.group(2))
+            area_ratio = max(0.25, width * height / LETTER_AREA_PTS)
+        return pages * area_ratio
+    except Exception as e:
+        logger.warning("job_cost_estimate_failed", path=path, error=str(e))
+        try:
+            return max(1.0, os.path.getsize(path) / bytes_per_page)
+        except OSError:
+            return 1.0
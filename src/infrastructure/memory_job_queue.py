@@ -0,0 +1,72 @@
+"""
+Implementación en memoria de la cola de trabajos.
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Dict, List, Optional, Tuple
+
+from domain.job_queue_port import JobQueuePort
+from domain.models import Job
+
+
+class InMemoryJobQueue(JobQueuePort):
+    """
+    Cola de trabajos en el proceso actual, ordenada por ``Job.priority``.
+
+    Sirve para un único proceso de la API y para pruebas; con varios
+    procesos o réplicas hay que usar RedisJobQueue. Los trabajos terminados
+    se descartan tras ``ttl_seconds``.
+    """
+
+    def __init__(self, ttl_seconds: float = 24 * 3600):
+        """
+        Args:
+            ttl_seconds: Tiempo que se conserva un trabajo terminado
+        """
+        self.ttl_seconds = ttl_seconds
+        self._jobs: Dict[str, Job] = {}
+        # (prioridad, orden de llegada, id): a igual prioridad, FIFO
+        self._heap: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self._available: Optional[asyncio.Semaphore] = None
+
+    @property
+    def available(self) -> asyncio.Semaphore:
+        # Se crea perezosamente para quedar ligada al event loop que la usa
+        if self._available is None:
+            self._available = asyncio.Semaphore(0)
+        return self._available
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    async def enqueue(self, job: Job) -> None:
+        self._expire()
+        self._jobs[job.id] = job
+        heapq.heappush(self._heap, (job.priority, next(self._sequence), job.id))
+        self.available.release()
+
+    async def dequeue(self, timeout: float = 1.0) -> Optional[Job]:
+        try:
+            await asyncio.wait_for(self.available.acquire(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        _, _, job_id = heapq.heappop(self._heap)
+        return self._jobs.get(job_id)
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def update(self, job: Job) -> None:
+        self._jobs[job.id] = job
+
+    def _expire(self):
+        """Descarta los trabajos terminados hace más de ttl_seconds"""
+        limit = time.time() - self.ttl_seconds
+        for job_id in [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at and job.finished_at < limit
+        ]:
+            del self._jobs[job_id]
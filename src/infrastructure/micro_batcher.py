@@ -0,0 +1,165 @@
+"""
+Agrupación dinámica de páginas de distintas peticiones antes del modelo.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+
+from domain.exceptions import OCRError
+from infrastructure.monitoring import MICRO_BATCH_QUEUE_SECONDS, MICRO_BATCH_SIZE
+
+# Marca de parada de los hilos de despacho
+_STOP = object()
+
+
+@dataclass
+class _Pending:
+    """Elemento en espera de lote con el futuro de su resultado"""
+    item: Any
+    enqueued_at: float = field(default_factory=time.monotonic)
+    future: Future = field(default_factory=Future)
+
+
+class MicroBatcher:
+    """
+    Agrupa elementos de varias peticiones concurrentes en un solo lote.
+
+    Cada llamante entrega sus elementos (ej: páginas preprocesadas) y
+    espera su resultado; los hilos de despacho forman lotes de hasta
+    ``max_batch_size`` elementos, esperando como mucho ``max_wait_ms``
+    desde la llegada del primero, ejecutan ``process`` una vez por lote y
+    devuelven a cada llamante sus resultados. Es el batching dinámico de
+    los servidores de inferencia: con carga concurrente, una llamada a
+    generate atiende páginas de varios documentos.
+
+    Si un lote de varios elementos falla, cada elemento se reintenta por
+    separado: solo falla la petición del elemento defectuoso, no las de
+    los demás documentos que compartían el lote.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        workers: int = 1,
+        on_thread_start: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Args:
+            process: Procesa un lote y devuelve un resultado por elemento, en orden
+            max_batch_size: Elementos por lote como máximo
+            max_wait_ms: Espera máxima de un elemento hasta completar su lote
+            workers: Hilos de despacho (lotes ejecutándose a la vez)
+            on_thread_start: Se llama con "infer" al arrancar cada hilo
+                             (ej: para fijar su afinidad de CPU)
+        """
+        self.process = process
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_ms) / 1000
+        self.workers = max(1, workers)
+        self.on_thread_start = on_thread_start
+        self._queue: "queue.Queue" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def submit(self, items: List[Any]) -> List[Any]:
+        """
+        Procesa los elementos junto con los de otras peticiones en curso.
+
+        Bloquea hasta tener el resultado de todos; si alguno falla también
+        al procesarse solo, se propaga su excepción.
+
+        Args:
+            items: Elementos de esta petición
+
+        Returns:
+            List[Any]: Resultado de cada elemento, en el mismo orden
+        """
+        if not items:
+            return []
+        self._ensure_started()
+        pending = [_Pending(item) for item in items]
+        for entry in pending:
+            self._queue.put(entry)
+        return [entry.future.result() for entry in pending]
+
+    def close(self):
+        """Detiene los hilos de despacho tras los lotes en curso"""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(_STOP)
+        for thread in threads:
+            thread.join()
+
+    def _ensure_started(self):
+        # Los hilos se crean con el primer uso, no al construir el adaptador
+        with self._lock:
+            if self._threads:
+                return
+            for idx in range(self.workers):
+                thread = threading.Thread(
+                    target=self._dispatch,
+                    name=f"micro-batcher-{idx}",
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _dispatch(self):
+        if self.on_thread_start:
+            self.on_thread_start("infer")
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch, stop = self._collect(first)
+            self._run(batch)
+            if stop:
+                return
+
+    def _collect(self, first: _Pending):
+        """Completa un lote hasta llenarlo o agotar la espera del primero"""
+        batch = [first]
+        deadline = first.enqueued_at + self.max_wait_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    def _run(self, batch: List[_Pending]):
+        started = time.monotonic()
+        MICRO_BATCH_SIZE.observe(len(batch))
+        for entry in batch:
+            MICRO_BATCH_QUEUE_SECONDS.observe(started - entry.enqueued_at)
+        self._resolve(batch)
+
+    def _resolve(self, batch: List[_Pending]):
+        """Procesa un lote y entrega cada resultado; si falla, aísla el elemento culpable"""
+        try:
+            results = list(self.process([entry.item for entry in batch]))
+            if len(results) != len(batch):
+                raise OCRError(
+                    f"El lote devolvió {len(results)} resultados para {len(batch)} elementos",
+                    context={"batch_size": len(batch), "results": len(results)}
+                )
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0].future.set_exception(e)
+                return
+            for entry in batch:
+                self._resolve([entry])
+            return
+
+        for entry, result in zip(batch, results):
+            entry.future.set_result(result)
@@ -0,0 +1,114 @@
+"""
+Carga de modelos Donut según el motor de inferencia configurado.
+"""
+import os
+import re
+from pathlib import Path
+
+import structlog
+import torch
+from transformers import VisionEncoderDecoderConfig, VisionEncoderDecoderModel
+
+from domain.exceptions import ConfigurationError
+
+logger = structlog.get_logger(__name__)
+
+# Motores de inferencia soportados
+INFERENCE_ENGINES = ("fp32", "int8")
+
+# Directorio por defecto de los modelos cuantizados: privado del usuario
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "ocr-llm" / "models"
+
+
+def load_donut_model(model_name: str, engine: str = "fp32", cache_dir: Path = DEFAULT_CACHE_DIR) -> VisionEncoderDecoderModel:
+    """
+    Carga el modelo Donut en el motor indicado.
+
+    Con ``int8`` se aplica cuantización dinámica int8 a las capas lineales
+    (solo CPU). Los pesos cuantizados se guardan en ``cache_dir`` y se
+    reutilizan en los siguientes arranques en lugar de cuantizar de nuevo.
+    Solo se guarda el state_dict, que se lee con ``weights_only=True`` sobre
+    un esqueleto del modelo cuantizado: un archivo manipulado en el caché no
+    puede ejecutar código al cargarse.
+
+    Args:
+        model_name: Nombre del modelo pre-entrenado
+        engine: Motor de inferencia ("fp32" o "int8")
+        cache_dir: Directorio para el modelo cuantizado
+
+    Returns:
+        VisionEncoderDecoderModel: Modelo listo para inferencia
+    """
+    if engine not in INFERENCE_ENGINES:
+        raise ConfigurationError(
+            f"Motor de inferencia no soportado: {engine}",
+            context={"supported": list(INFERENCE_ENGINES)}
+        )
+
+    if engine == "fp32":
+        return VisionEncoderDecoderModel.from_pretrained(model_name)
+
+    cache_path = quantized_cache_path(model_name, cache_dir)
+    model = _load_cached(model_name, cache_path) if cache_path.exists() else None
+    if model is None:
+        model = _quantize(VisionEncoderDecoderModel.from_pretrained(model_name))
+        _save_atomically(model.state_dict(), cache_path)
+        logger.info("quantized_model_cached", path=str(cache_path))
+
+    model.eval()
+    return model
+
+
+def select_device(use_gpu: bool, engine: str = "fp32") -> str:
+    """
+    Elige el dispositivo de inferencia.
+
+    La cuantización dinámica int8 solo tiene kernels de CPU, así que ese
+    motor se ejecuta siempre en CPU.
+    """
+    if engine == "int8":
+        return "cpu"
+    return "cuda" if torch.cuda.is_available() and use_gpu else "cpu"
+
+
+def quantized_cache_path(model_name: str, cache_dir: Path) -> Path:
+    """
+    Ruta del modelo cuantizado en caché.
+
+    Incluye la versión de torch porque el formato serializado de los módulos
+    cuantizados no es estable entre versiones.
+    """
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "--", model_name)
+    return Path(cache_dir) / f"{slug}-int8-torch{torch.__version__}.pt"
+
+
+def _quantize(model: VisionEncoderDecoderModel) -> VisionEncoderDecoderModel:
+    """Cuantización dinámica int8 de las capas lineales"""
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _load_cached(model_name: str, path: Path):
+    """
+    Carga los pesos cuantizados en caché sobre un esqueleto del modelo.
+
+    El esqueleto se construye desde la configuración (sin descargar los
+    pesos fp32) y se cuantiza igual que al guardar. Un archivo ilegible o
+    de otra arquitectura se descarta y se cuantiza de nuevo.
+    """
+    try:
+        state_dict = torch.load(path, map_location="cpu", weights_only=True)
+        model = _quantize(VisionEncoderDecoderModel(VisionEncoderDecoderConfig.from_pretrained(model_name)))
+        model.load_state_dict(state_dict)
+    except Exception as e:
+        logger.warning("quantized_model_discarded", path=str(path), error=str(e))
+        return None
+    logger.info("quantized_model_loaded", path=str(path))
+    return model
+
+
+def _save_atomically(state_dict: dict, path: Path):
+    """Guarda los pesos sin dejar archivos a medias si hay varios procesos"""
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    torch.save(state_dict, tmp_path)
+    os.replace(tmp_path, path)
@@ -42,6 +42,141 @@ processing_time = Histogram('ocr_processing_seconds', 'Tiempo de procesamiento')
 cache_hits = Counter('ocr_cache_hits_total', 'Cache hits')
 active_jobs = Gauge('ocr_active_jobs', 'Trabajos activos')
 
+# Métricas del pipeline de OCR por etapas
+PIPELINE_QUEUE_DEPTH = Gauge(
+    "ocr_pipeline_queue_depth",
+    "Lotes en espera en la cola de salida de cada etapa",
+    ["queue"]
+)
+
+PIPELINE_STAGE_BUSY = Gauge(
+    "ocr_pipeline_stage_busy_workers",
+    "Workers de cada etapa ocupados procesando un lote",
+    ["stage"]
+)
+
+PIPELINE_STAGE_WORKERS = Gauge(
+    "ocr_pipeline_stage_workers",
+    "Workers configurados en cada etapa",
+    ["stage"]
+)
+
+PIPELINE_STAGE_SECONDS = Histogram(
+    "ocr_pipeline_stage_seconds",
+    "Tiempo por lote en cada etapa del pipeline",
+    ["stage"]
+)
+
+# Métricas de decodificación adaptativa (greedy con escalada a beams)
+DECODED_PAGES = Counter(
+    "ocr_decoded_pages_total",
+    "Páginas decodificadas con la política adaptativa"
+)
+
+BEAM_ESCALATIONS = Counter(
+    "ocr_beam_escalations_total",
+    "Páginas re-decodificadas con beam search por baja calidad"
+)
+
+DECODE_SECONDS_SAVED = Counter(
+    "ocr_decode_seconds_saved_total",
+    "Tiempo de decodificación estimado ahorrado al evitar beam search"
+)
+
+BLANK_PAGES_SKIPPED = Counter(
+    "ocr_blank_pages_skipped_total",
+    "Páginas omitidas sin llamar al modelo por estar en blanco",
+    ["reason"]
+)
+
+CACHE_TIER_EVENTS = Counter(
+    "ocr_cache_tier_events_total",
+    "Aciertos, fallos y expulsiones por nivel del caché",
+    ["tier", "event"]
+)
+
+CIRCUIT_BREAKER_STATE = Gauge(
+    "ocr_circuit_breaker_state",
+    "Estado del circuit breaker (0=closed, 1=half_open, 2=open)",
+    ["name"]
+)
+
+CIRCUIT_BREAKER_REJECTIONS = Counter(
+    "ocr_circuit_breaker_rejections_total",
+    "Llamadas omitidas por tener el circuito abierto",
+    ["name"]
+)
+
+COALESCED_REQUESTS = Counter(
+    "ocr_coalesced_requests_total",
+    "Peticiones de OCR resueltas con el resultado de otra petición idéntica en curso",
+    ["scope"]
+)
+
+REPLICA_INFLIGHT_PAGES = Gauge(
+    "ocr_replica_inflight_pages",
+    "Páginas enviadas a cada réplica del modelo y aún sin resultado",
+    ["replica"]
+)
+
+THREAD_BUDGET = Gauge(
+    "ocr_thread_budget",
+    "Núcleos o hilos asignados a cada rol por el presupuesto de CPU",
+    ["role"]
+)
+
+JOB_QUEUE_WAIT_SECONDS = Histogram(
+    "ocr_job_queue_wait_seconds",
+    "Tiempo entre el envío de un trabajo y el inicio de su OCR",
+    ["size"],
+    buckets=[0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800]
+)
+
+JOB_SERVICE_SECONDS = Histogram(
+    "ocr_job_service_seconds",
+    "Tiempo de procesamiento de un trabajo desde que un worker lo toma",
+    ["size", "status"],
+    buckets=[0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600]
+)
+
+MICRO_BATCH_SIZE = Histogram(
+    "ocr_micro_batch_size",
+    "Páginas por llamada al modelo al agrupar peticiones concurrentes",
+    buckets=[1, 2, 3, 4, 6, 8, 12, 16, 24, 32]
+)
+
+MICRO_BATCH_QUEUE_SECONDS = Histogram(
+    "ocr_micro_batch_queue_seconds",
+    "Espera de cada página hasta que su lote entra al modelo",
+    buckets=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1]
+)
+
+ADMISSION_INFLIGHT_PAGES = Gauge(
+    "ocr_admission_inflight_pages",
+    "Páginas admitidas y aún sin terminar en este proceso"
+)
+
+ADMISSION_INFLIGHT_REQUESTS = Gauge(
+    "ocr_admission_inflight_requests",
+    "Documentos admitidos y aún sin terminar en este proceso"
+)
+
+ADMISSION_ESTIMATED_WAIT_SECONDS = Gauge(
+    "ocr_admission_estimated_wait_seconds",
+    "Tiempo estimado para terminar todo el trabajo admitido"
+)
+
+ADMISSION_DRAIN_RATE = Gauge(
+    "ocr_admission_drain_pages_per_second",
+    "Ritmo de vaciado estimado (EWMA de páginas terminadas por segundo)"
+)
+
+ADMISSION_REJECTIONS = Counter(
+    "ocr_admission_rejections_total",
+    "Peticiones rechazadas por el control de admisión",
+    ["reason"]
+)
+
 def monitor_processing(func):
     """Decorator para monitorear procesamiento"""
     @wraps(func)
@@ -133,6 +268,68 @@ class MetricsCollector:
         """
         OCR_QUALITY.observe(score)
     
+    @staticmethod
+    def record_adaptive_decode(pages: int, escalated: int, saved_seconds: float):
+        """
+        Registra el resultado de la decodificación adaptativa de un lote.
+
+        Args:
+            pages: Páginas decodificadas
+            escalated: Páginas re-decodificadas con beam search
+            saved_seconds: Tiempo estimado ahorrado frente a usar beams siempre
+        """
+        DECODED_PAGES.inc(pages)
+        BEAM_ESCALATIONS.inc(escalated)
+        DECODE_SECONDS_SAVED.inc(saved_seconds)
+
+    @staticmethod
+    def record_coalesced(scope: str):
+        """
+        Registra una petición que reutilizó el resultado de otra en curso.
+
+        Args:
+            scope: "local" (mismo proceso) o "distributed" (otra réplica)
+        """
+        COALESCED_REQUESTS.labels(scope=scope).inc()
+
+    @staticmethod
+    def record_job(job: Any):
+        """
+        Registra por separado la espera en cola y el servicio de un trabajo.
+
+        Args:
+            job: Trabajo terminado (domain.models.Job)
+        """
+        cost = job.cost if job.cost is not None else job.pages_total or 0
+        size = "small" if cost <= 5 else "medium" if cost <= 50 else "large"
+        JOB_QUEUE_WAIT_SECONDS.labels(size=size).observe(job.started_at - job.created_at)
+        JOB_SERVICE_SECONDS.labels(size=size, status=job.status.value).observe(
+            job.finished_at - job.started_at
+        )
+    
+    @staticmethod
+    def record_admission(controller: Any):
+        """
+        Publica el estado del control de admisión.
+
+        Args:
+            controller: Control de admisión (application.admission_controller)
+        """
+        ADMISSION_INFLIGHT_PAGES.set(controller.inflight_pages)
+        ADMISSION_INFLIGHT_REQUESTS.set(controller.inflight_requests)
+        ADMISSION_ESTIMATED_WAIT_SECONDS.set(controller.estimated_wait)
+        ADMISSION_DRAIN_RATE.set(controller.drain_rate)
+
+    @staticmethod
+    def record_admission_rejection(reason: str):
+        """
+        Registra una petición rechazada por saturación.
+
+        Args:
+            reason: "queue_full" o "drain_time"
+        """
+        ADMISSION_REJECTIONS.labels(reason=reason).inc()
+    
     @staticmethod
     def update_model_info(model_name: str, version: str):
         """
@@ -0,0 +1,248 @@
+"""
+Pipeline por etapas rasterizar → preprocesar → inferir con colas acotadas.
+"""
+import queue
+import threading
+import time
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from infrastructure.monitoring import (
+    PIPELINE_QUEUE_DEPTH,
+    PIPELINE_STAGE_BUSY,
+    PIPELINE_STAGE_SECONDS,
+    PIPELINE_STAGE_WORKERS
+)
+
+# Marca de fin de flujo entre etapas
+_DONE = object()
+
+# Intervalo con el que las etapas bloqueadas comprueban la cancelación
+_POLL_SECONDS = 0.1
+
+
+class OcrPipeline:
+    """
+    Ejecuta el OCR de un flujo de páginas en etapas solapadas.
+
+    Cada etapa corre en sus propios hilos y se comunica con la siguiente
+    mediante una cola acotada, de modo que la página k+1 se renderiza y
+    normaliza mientras la página k se decodifica. La rasterización tiene un
+    único productor (poppler ya usa sus propios hilos); preprocesado e
+    inferencia admiten varios workers. Los resultados se reordenan antes de
+    entregarse.
+    """
+
+    def __init__(
+        self,
+        preprocess: Callable[[List[Any]], Any],
+        infer: Callable[[Any], List[str]],
+        batch_size: int = 4,
+        preprocess_workers: int = 1,
+        infer_workers: int = 1,
+        queue_size: int = 2,
+        on_thread_start: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Args:
+            preprocess: Convierte un lote de imágenes en la entrada del modelo
+            infer: Ejecuta el modelo sobre un lote preprocesado
+            batch_size: Páginas por lote
+            preprocess_workers: Hilos de la etapa de preprocesado
+            infer_workers: Hilos de la etapa de inferencia
+            queue_size: Lotes en espera como máximo entre etapas
+            on_thread_start: Se llama con el nombre de la etapa al arrancar
+                             cada hilo (ej: para fijar su afinidad de CPU)
+        """
+        self.preprocess = preprocess
+        self.infer = infer
+        self.batch_size = max(1, batch_size)
+        self.preprocess_workers = max(1, preprocess_workers)
+        self.infer_workers = max(1, infer_workers)
+        self.queue_size = max(1, queue_size)
+        self.on_thread_start = on_thread_start
+
+        PIPELINE_STAGE_WORKERS.labels(stage="rasterize").set(1)
+        PIPELINE_STAGE_WORKERS.labels(stage="preprocess").set(self.preprocess_workers)
+        PIPELINE_STAGE_WORKERS.labels(stage="infer").set(self.infer_workers)
+
+    def run(self, pages: Iterable[Any]) -> Iterator[str]:
+        """
+        Procesa las páginas y genera el texto de cada una en orden.
+
+        Cerrar el generador antes de terminar cancela el trabajo pendiente.
+
+        Args:
+            pages: Iterable (posiblemente perezoso) de imágenes de página
+
+        Yields:
+            str: Texto extraído de cada página
+        """
+        stop = threading.Event()
+        raster_queue: queue.Queue = queue.Queue(self.queue_size)
+        preprocess_queue: queue.Queue = queue.Queue(self.queue_size)
+        results: queue.Queue = queue.Queue()
+
+        threads = [
+            threading.Thread(
+                target=self._rasterize_stage,
+                args=(iter(pages), raster_queue, results, stop),
+                daemon=True
+            )
+        ]
+        preprocess_live = _LiveCounter(self.preprocess_workers)
+        for _ in range(self.preprocess_workers):
+            threads.append(threading.Thread(
+                target=self._worker_stage,
+                args=("preprocess", self.preprocess, raster_queue, preprocess_queue,
+                      results, preprocess_live, self.infer_workers, stop),
+                daemon=True
+            ))
+        infer_live = _LiveCounter(self.infer_workers)
+        for _ in range(self.infer_workers):
+            threads.append(threading.Thread(
+                target=self._worker_stage,
+                args=("infer", self.infer, preprocess_queue, results,
+                      results, infer_live, 1, stop),
+                daemon=True
+            ))
+        for thread in threads:
+            thread.start()
+
+        try:
+            pending: Dict[int, List[str]] = {}
+            next_batch = 0
+            while True:
+                item = results.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                batch_idx, texts = item
+                pending[batch_idx] = texts
+                while next_batch in pending:
+                    yield from pending.pop(next_batch)
+                    next_batch += 1
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    def _rasterize_stage(
+        self,
+        pages: Iterator[Any],
+        outbox: queue.Queue,
+        results: queue.Queue,
+        stop: threading.Event
+    ):
+        """Agrupa las páginas renderizadas en lotes para el preprocesado"""
+        try:
+            if self.on_thread_start:
+                self.on_thread_start("rasterize")
+            batch_idx = 0
+            while not stop.is_set():
+                busy = PIPELINE_STAGE_BUSY.labels(stage="rasterize")
+                busy.inc()
+                started = time.perf_counter()
+                try:
+                    batch = list(islice(pages, self.batch_size))
+                finally:
+                    busy.dec()
+                if not batch:
+                    break
+                PIPELINE_STAGE_SECONDS.labels(stage="rasterize").observe(
+                    time.perf_counter() - started
+                )
+                if not _put(outbox, (batch_idx, batch), stop, "rasterize"):
+                    return
+                batch_idx += 1
+            for _ in range(self.preprocess_workers):
+                _put(outbox, _DONE, stop, "rasterize")
+        except Exception as e:
+            stop.set()
+            results.put(e)
+
+    def _worker_stage(
+        self,
+        stage: str,
+        func: Callable[[Any], Any],
+        inbox: queue.Queue,
+        outbox: queue.Queue,
+        results: queue.Queue,
+        live: "_LiveCounter",
+        downstream_workers: int,
+        stop: threading.Event
+    ):
+        """Consume lotes de la etapa anterior, aplica func y los pasa a la siguiente"""
+        try:
+            if self.on_thread_start:
+                self.on_thread_start(stage)
+            while True:
+                item = _get(inbox, stop, _upstream(stage))
+                if item is None:
+                    return
+                if item is _DONE:
+                    break
+                batch_idx, payload = item
+                busy = PIPELINE_STAGE_BUSY.labels(stage=stage)
+                busy.inc()
+                started = time.perf_counter()
+                try:
+                    output = func(payload)
+                finally:
+                    busy.dec()
+                PIPELINE_STAGE_SECONDS.labels(stage=stage).observe(
+                    time.perf_counter() - started
+                )
+                if not _put(outbox, (batch_idx, output), stop, stage):
+                    return
+            # El último worker de la etapa propaga el fin a la siguiente
+            if live.finish():
+                for _ in range(downstream_workers):
+                    _put(outbox, _DONE, stop, stage)
+        except Exception as e:
+            stop.set()
+            results.put(e)
+
+
+class _LiveCounter:
+    """Cuenta los workers activos de una etapa de forma segura entre hilos"""
+
+    def __init__(self, workers: int):
+        self._workers = workers
+        self._lock = threading.Lock()
+
+    def finish(self) -> bool:
+        """Marca un worker como terminado; True si era el último"""
+        with self._lock:
+            self._workers -= 1
+            return self._workers == 0
+
+
+def _upstream(stage: str) -> str:
+    """Nombre de la cola que alimenta una etapa"""
+    return "rasterize" if stage == "preprocess" else "preprocess"
+
+
+def _put(target: queue.Queue, item: Any, stop: threading.Event, name: str) -> bool:
+    """Encola respetando la cancelación; False si el pipeline se detuvo"""
+    while not stop.is_set():
+        try:
+            target.put(item, timeout=_POLL_SECONDS)
+        except queue.Full:
+            continue
+        PIPELINE_QUEUE_DEPTH.labels(queue=name).set(target.qsize())
+        return True
+    return False
+
+
+def _get(source: queue.Queue, stop: threading.Event, name: str) -> Any:
+    """Desencola respetando la cancelación; None si el pipeline se detuvo"""
+    while not stop.is_set():
+        try:
+            item = source.get(timeout=_POLL_SECONDS)
+        except queue.Empty:
+            continue
+        PIPELINE_QUEUE_DEPTH.labels(queue=name).set(source.qsize())
+        return item
+    return None
@@ -0,0 +1,90 @@
+"""
+Caché de OCR a nivel de página sobre un CachePort asíncrono.
+"""
+import asyncio
+import threading
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+from domain.cache_keys import page_cache_key
+from domain.cache_port import CachePort
+
+logger = structlog.get_logger(__name__)
+
+
+class PageCache:
+    """
+    Caché síncrono de textos de página direccionado por contenido.
+
+    Las etapas del pipeline de OCR corren en hilos sin event loop, así que
+    las operaciones del CachePort se ejecutan en un event loop propio en
+    segundo plano. El CachePort debe ser una instancia dedicada, ya que sus
+    conexiones quedan ligadas a ese loop.
+
+    Los fallos del caché nunca interrumpen el OCR: se registran y las
+    páginas afectadas se tratan como fallos de caché.
+    """
+
+    def __init__(
+        self,
+        cache: CachePort,
+        params: Dict[str, Any],
+        ttl: Optional[timedelta] = None,
+        timeout: float = 5.0
+    ):
+        """
+        Args:
+            cache: Backend de caché dedicado
+            params: Parámetros que afectan al resultado (modelo, prompt,
+                    DPI, generación); forman parte de cada clave
+            ttl: Tiempo de vida de las entradas
+            timeout: Segundos máximos de espera por operación
+        """
+        self.cache = cache
+        self.params = params
+        self.ttl = ttl
+        self.timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+
+    def key(self, image: Any) -> str:
+        """Clave de caché de una página renderizada"""
+        return page_cache_key(image, self.params)
+
+    def lookup(self, keys: List[str]) -> Dict[str, str]:
+        """
+        Busca varias páginas en una sola consulta.
+
+        Args:
+            keys: Claves de las páginas
+
+        Returns:
+            Dict[str, str]: Textos encontrados, indexados por clave
+        """
+        if not keys:
+            return {}
+        try:
+            return self._run(self.cache.get_many(keys))
+        except Exception as e:
+            logger.warning("page_cache_lookup_failed", error=str(e), keys=len(keys))
+            return {}
+
+    def store(self, texts: Dict[str, str]):
+        """
+        Guarda los textos de varias páginas en una sola operación.
+
+        Args:
+            texts: Textos indexados por clave
+        """
+        if not texts:
+            return
+        try:
+            self._run(self.cache.set_many(texts, ttl=self.ttl))
+        except Exception as e:
+            logger.warning("page_cache_store_failed", error=str(e), keys=len(texts))
+
+    def _run(self, coro) -> Any:
+        """Ejecuta una corrutina en el loop del caché y espera el resultado"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(self.timeout)
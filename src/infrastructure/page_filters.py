@@ -0,0 +1,54 @@
+"""
+Filtros baratos sobre páginas renderizadas, previos a la inferencia.
+"""
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+# Lado en píxeles de los bloques con los que se mide el área con tinta
+_INK_BLOCK = 16
+
+# Diferencia mínima de gris respecto al fondo para contar un píxel como tinta
+_INK_CONTRAST = 48
+
+
+def blank_page_reason(image: Image.Image, ink_ratio_threshold: float = 0.002) -> Optional[str]:
+    """
+    Detecta páginas en blanco o casi en blanco.
+
+    Trabaja en escala de grises a resolución completa: reducir la página
+    antes difumina los trazos finos y una línea de texto o una firma puede
+    parecer fondo. El fondo se estima con la mediana y cuenta como tinta
+    todo píxel que se aleja claramente de él (más oscuro o más claro). Una
+    página sin tinta es "blank"; si la tinta ocupa como mucho la proporción
+    indicada de bloques de la página, es "near_blank". Medir por bloques
+    cuenta el área que cubre la tinta y no sus píxeles: una mancha ocupa uno
+    o dos bloques, pero una línea de texto fino cubre toda una franja.
+
+    Args:
+        image: Página renderizada
+        ink_ratio_threshold: Proporción máxima de bloques con tinta de una
+                             página casi vacía
+
+    Returns:
+        Optional[str]: Motivo para omitir la página, o None si tiene contenido
+    """
+    pixels = np.asarray(image.convert("L"), dtype=np.int16)
+
+    # Mediana a partir del histograma: evita ordenar millones de píxeles
+    histogram = np.bincount(pixels.ravel(), minlength=256)
+    background = int(np.searchsorted(np.cumsum(histogram), pixels.size / 2))
+    ink = np.abs(pixels - background) > _INK_CONTRAST
+    if not ink.any():
+        return "blank"
+
+    # Un bloque cuenta si tiene algún píxel de tinta; los bordes se rellenan
+    height, width = ink.shape
+    rows, cols = -(-height // _INK_BLOCK), -(-width // _INK_BLOCK)
+    padded = np.zeros((rows * _INK_BLOCK, cols * _INK_BLOCK), dtype=bool)
+    padded[:height, :width] = ink
+    blocks = padded.reshape(rows, _INK_BLOCK, cols, _INK_BLOCK).any(axis=(1, 3))
+    if blocks.mean() <= ink_ratio_threshold:
+        return "near_blank"
+    return None
@@ -0,0 +1,67 @@
+"""
+Rasterización de PDFs por ventanas de páginas con memoria acotada.
+"""
+from pathlib import Path
+from typing import Iterator
+
+from PIL import Image
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+
+class PdfRasterizer:
+    """
+    Renderiza un PDF página a página de forma perezosa.
+
+    En lugar de convertir el documento completo, renderiza ventanas de
+    ``max_inflight_pages`` páginas (first_page/last_page) y las entrega una
+    a una, de modo que la memoria máxima no depende del tamaño del PDF y la
+    primera página está disponible sin esperar al resto.
+    """
+
+    def __init__(self, dpi: int = 200, thread_count: int = 1, max_inflight_pages: int = 4):
+        """
+        Args:
+            dpi: Resolución de renderizado
+            thread_count: Hilos de poppler por ventana
+            max_inflight_pages: Páginas renderizadas como máximo a la vez
+        """
+        self.dpi = dpi
+        self.thread_count = max(1, thread_count)
+        self.max_inflight_pages = max(1, max_inflight_pages)
+
+    def page_count(self, pdf_path: Path) -> int:
+        """
+        Obtiene el número de páginas leyendo solo la cabecera del PDF.
+
+        Args:
+            pdf_path: Ruta al PDF
+
+        Returns:
+            int: Número de páginas
+        """
+        return int(pdfinfo_from_path(str(pdf_path))["Pages"])
+
+    def iter_pages(self, pdf_path: Path) -> Iterator[Image.Image]:
+        """
+        Genera las páginas del PDF en orden, renderizando por ventanas.
+
+        Args:
+            pdf_path: Ruta al PDF
+
+        Yields:
+            Image.Image: Imagen de cada página
+        """
+        total = self.page_count(pdf_path)
+        for first in range(1, total + 1, self.max_inflight_pages):
+            last = min(first + self.max_inflight_pages - 1, total)
+            window = convert_from_path(
+                pdf_path,
+                dpi=self.dpi,
+                first_page=first,
+                last_page=last,
+                thread_count=min(self.thread_count, last - first + 1)
+            )
+            # Soltar cada página en cuanto se entrega para no retener la ventana
+            window.reverse()
+            while window:
+                yield window.pop()
@@ -1,110 +1,257 @@
 """
 Implementación del adaptador de caché usando Redis.
 """
-import json
+import asyncio
 import hashlib
-from typing import Optional, Any
+from typing import Optional, Any, Awaitable, Callable, Dict, List
 from datetime import timedelta
 import redis.asyncio as redis
+from redis.exceptions import RedisError
+import structlog
 from domain.cache_port import CachePort
+from infrastructure.cache_codec import CacheCodec
+from infrastructure.circuit_breaker import CircuitBreaker
+
+logger = structlog.get_logger(__name__)
 
 class RedisCache(CachePort):
     """
     Implementación de CachePort usando Redis como backend.
+
+    Usa un único cliente con un pool de conexiones de tamaño fijo y un
+    timeout por operación. Los fallos de Redis nunca se propagan: cada
+    operación devuelve un valor neutro (None, False, {}) y, tras fallos
+    repetidos, un circuit breaker omite el caché durante un enfriamiento
+    para que la latencia del OCR no dependa de su estado.
     """
-    
-    def __init__(self, redis_url: str, ttl_hours: int = 24):
+
+    # Claves borradas por comando UNLINK durante una purga
+    PURGE_BATCH_SIZE = 500
+
+    # Claves por comando MGET / por pipeline en operaciones en bloque
+    BULK_BATCH_SIZE = 500
+
+    def __init__(
+        self,
+        redis_url: str,
+        ttl_hours: int = 24,
+        codec: Optional[CacheCodec] = None,
+        max_connections: int = 20,
+        timeout: float = 0.5,
+        breaker: Optional[CircuitBreaker] = None
+    ):
         """
         Inicializa la conexión con Redis.
-        
+
         Args:
             redis_url: URL de conexión a Redis (redis://localhost:6379)
             ttl_hours: Tiempo de vida por defecto en horas (opcional, por defecto 24)
+            codec: Codificación de los valores (por defecto CacheCodec())
+            max_connections: Tamaño máximo del pool de conexiones
+            timeout: Segundos máximos por operación (conexión, socket, espera
+                     de una conexión libre y operación completa)
+            breaker: Circuit breaker que protege las llamadas
         """
-        self.client = redis.from_url(redis_url)
+        pool = redis.BlockingConnectionPool.from_url(
+            redis_url,
+            max_connections=max_connections,
+            timeout=timeout,
+            socket_timeout=timeout,
+            socket_connect_timeout=timeout
+        )
+        self.client = redis.Redis(connection_pool=pool)
         self.ttl_seconds = ttl_hours * 3600
-    
+        self.codec = codec or CacheCodec()
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker("redis")
+
+    async def _call(self, operation: Callable[[], Awaitable[Any]], fallback: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Ejecuta una operación protegida por timeout y circuit breaker.
+
+        Args:
+            operation: Función que crea la corrutina a ejecutar
+            fallback: Valor devuelto si Redis falla o el circuito está abierto
+            timeout: Timeout de la operación (None usa el por defecto)
+
+        Returns:
+            Any: Resultado de la operación o fallback
+        """
+        if not self.breaker.allow():
+            return fallback
+        try:
+            result = await asyncio.wait_for(operation(), timeout or self.timeout)
+        except (RedisError, OSError, asyncio.TimeoutError) as e:
+            self.breaker.record_failure()
+            logger.warning("redis_cache_unavailable", error=repr(e), state=self.breaker.state)
+            return fallback
+        except BaseException:
+            # Cancelación u otro error ajeno a Redis: liberar la llamada de prueba
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def _decode(self, key: str, raw: bytes) -> Optional[Any]:
+        """Deserializa un valor; un valor ilegible se trata como ausente"""
+        try:
+            return self.codec.decode(raw)
+        except Exception as e:
+            logger.warning("redis_cache_decode_failed", key=key, error=str(e))
+            return None
+
     async def get(self, key: str) -> Optional[Any]:
         """
         Recupera un valor del caché de Redis.
-        
+
         Args:
             key: Clave a buscar
-            
+
         Returns:
             Optional[Any]: Valor deserializado o None si no existe
         """
-        value = await self.client.get(key)
+        value = await self._call(lambda: self.client.get(key), None)
         if value is None:
             return None
-        return json.loads(value)
-        
+        return self._decode(key, value)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Recupera varios valores con MGET, un viaje de red por cada
+        BULK_BATCH_SIZE claves.
+
+        Args:
+            keys: Claves a buscar
+
+        Returns:
+            Dict[str, Any]: Valores encontrados, indexados por clave
+        """
+        found = {}
+        for start in range(0, len(keys), self.BULK_BATCH_SIZE):
+            chunk = keys[start:start + self.BULK_BATCH_SIZE]
+            values = await self._call(lambda: self.client.mget(chunk), [])
+            for key, value in zip(chunk, values):
+                if value is not None:
+                    decoded = self._decode(key, value)
+                    if decoded is not None:
+                        found[key] = decoded
+        return found
+
     async def set(self, key: str, value: Any, ttl: Optional[timedelta] = None) -> bool:
         """
         Almacena un valor en Redis.
-        
+
         Args:
             key: Clave para almacenar el valor
-            value: Valor a almacenar (será serializado a JSON)
+            value: Valor a almacenar (será serializado con el codec)
             ttl: Tiempo de vida del valor en caché
-            
+
         Returns:
             bool: True si se almacenó correctamente
         """
-        serialized = json.dumps(value)
-        if ttl:
-            return await self.client.setex(key, int(ttl.total_seconds()), serialized)
-        return await self.client.set(key, serialized)
-        
+        serialized = self.codec.encode(value)
+        expire = int(ttl.total_seconds()) if ttl else None
+        return bool(await self._call(lambda: self.client.set(key, serialized, ex=expire), False))
+
+    async def set_many(self, items: Dict[str, Any], ttl: Optional[timedelta] = None) -> bool:
+        """
+        Almacena varios valores con un pipeline sin transacción, un viaje de
+        red por cada BULK_BATCH_SIZE claves.
+
+        Args:
+            items: Valores a almacenar, indexados por clave
+            ttl: Tiempo de vida de los valores en caché
+
+        Returns:
+            bool: True si se almacenaron todos correctamente
+        """
+        expire = int(ttl.total_seconds()) if ttl else None
+        entries = list(items.items())
+        stored = True
+        for start in range(0, len(entries), self.BULK_BATCH_SIZE):
+            chunk = [(key, self.codec.encode(value)) for key, value in entries[start:start + self.BULK_BATCH_SIZE]]
+
+            async def write_chunk(chunk=chunk):
+                async with self.client.pipeline(transaction=False) as pipe:
+                    for key, serialized in chunk:
+                        pipe.set(key, serialized, ex=expire)
+                    return await pipe.execute()
+
+            results = await self._call(write_chunk, [False])
+            stored = stored and all(results)
+        return stored
+
     async def delete(self, key: str) -> bool:
         """
         Elimina un valor de Redis.
-        
+
         Args:
             key: Clave a eliminar
-            
+
         Returns:
             bool: True si se eliminó correctamente
         """
-        return await self.client.delete(key) > 0
-        
+        return await self._call(lambda: self.client.delete(key), 0) > 0
+
     async def exists(self, key: str) -> bool:
         """
         Verifica si una clave existe en Redis.
-        
+
         Args:
             key: Clave a verificar
-            
+
         Returns:
             bool: True si la clave existe
         """
-        return await self.client.exists(key) > 0
-    
-    def get_cached_result(self, content_hash: str) -> Optional[str]:
-        """Obtiene resultado del caché"""
-        try:
-            result = self.client.get(f"ocr:{content_hash}")
-            return result.decode() if result else None
-        except Exception:
-            return None
-    
-    def cache_result(self, content_hash: str, result: str) -> None:
-        """Guarda resultado en caché"""
+        return await self._call(lambda: self.client.exists(key), 0) > 0
+
+    async def delete_matching(self, pattern: str, exclude_prefix: Optional[str] = None) -> int:
+        """
+        Elimina en bloque las claves que coinciden con un patrón.
+
+        Recorre el keyspace con SCAN (sin bloquear Redis como KEYS) y borra
+        por lotes con UNLINK, que libera la memoria en segundo plano. Es una
+        tarea de mantenimiento: no se le aplica el timeout por operación.
+
+        Args:
+            pattern: Patrón glob de claves (ej: "ocr:document:*")
+            exclude_prefix: Prefijo de las claves que deben conservarse
+
+        Returns:
+            int: Número de claves eliminadas
+        """
+        if not self.breaker.allow():
+            return 0
+        exclude = exclude_prefix.encode() if exclude_prefix else None
+        deleted = 0
+        batch = []
         try:
-            self.client.setex(
-                f"ocr:{content_hash}", 
-                self.ttl_seconds, 
-                result
-            )
-        except Exception:
-            pass  # Fallar silenciosamente si no hay Redis
-    
+            async for key in self.client.scan_iter(match=pattern, count=1000):
+                if exclude and key.startswith(exclude):
+                    continue
+                batch.append(key)
+                if len(batch) >= self.PURGE_BATCH_SIZE:
+                    deleted += await self.client.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += await self.client.unlink(*batch)
+        except (RedisError, OSError) as e:
+            self.breaker.record_failure()
+            logger.warning("redis_cache_purge_failed", error=repr(e), deleted=deleted)
+            return deleted
+        except BaseException:
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return deleted
+
     def generate_hash(self, content: bytes) -> str:
         """Genera hash para contenido"""
         return hashlib.sha256(content).hexdigest()
 
     async def close(self):
         """
-        Cierra la conexión con Redis.
+        Cierra la conexión con Redis y libera el pool.
         """
-        await self.client.close()
+        await self.client.aclose()
+        await self.client.connection_pool.disconnect()
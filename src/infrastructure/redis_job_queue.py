@@ -0,0 +1,68 @@
+"""
+Implementación de la cola de trabajos usando Redis.
+"""
+import json
+from typing import Optional
+
+import redis.asyncio as redis
+import structlog
+
+from domain.job_queue_port import JobQueuePort
+from domain.models import Job
+
+logger = structlog.get_logger(__name__)
+
+
+class RedisJobQueue(JobQueuePort):
+    """
+    Cola de trabajos compartida entre procesos y réplicas.
+
+    Cada trabajo se guarda como JSON en ``{prefix}job:{id}`` con caducidad y
+    los ids pendientes en el sorted set ``{prefix}pending`` con
+    ``Job.priority`` como puntuación: ZADD al encolar y BZPOPMIN al tomar,
+    que entrega cada trabajo a un único worker en orden de prioridad.
+    """
+
+    def __init__(self, redis_url: str, ttl_hours: int = 24, prefix: str = "ocr:jobs:"):
+        """
+        Args:
+            redis_url: URL de conexión a Redis (redis://localhost:6379)
+            ttl_hours: Tiempo que se conserva el estado de un trabajo
+            prefix: Prefijo de las claves de la cola
+        """
+        self.client = redis.Redis.from_url(redis_url)
+        self.ttl_seconds = ttl_hours * 3600
+        self.prefix = prefix
+        self.pending_key = f"{prefix}pending"
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.prefix}job:{job_id}"
+
+    async def enqueue(self, job: Job) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.set(self._job_key(job.id), json.dumps(job.to_dict()), ex=self.ttl_seconds)
+            pipe.zadd(self.pending_key, {job.id: job.priority})
+            await pipe.execute()
+
+    async def dequeue(self, timeout: float = 1.0) -> Optional[Job]:
+        item = await self.client.bzpopmin([self.pending_key], timeout=timeout)
+        if item is None:
+            return None
+        _, job_id, _ = item
+        job = await self.get(job_id.decode())
+        if job is None:
+            logger.warning("job_expired_before_processing", job_id=job_id.decode())
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        raw = await self.client.get(self._job_key(job_id))
+        return Job.from_dict(json.loads(raw)) if raw else None
+
+    async def update(self, job: Job) -> None:
+        await self.client.set(self._job_key(job.id), json.dumps(job.to_dict()), ex=self.ttl_seconds)
+
+    async def close(self):
+        """
+        Cierra la conexión con Redis.
+        """
+        await self.client.aclose()
@@ -0,0 +1,79 @@
+"""
+Implementación de bloqueos distribuidos usando Redis.
+"""
+import asyncio
+import uuid
+from typing import Optional
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+import structlog
+
+from domain.lock_port import LockPort
+
+logger = structlog.get_logger(__name__)
+
+# Borra la clave solo si sigue conteniendo el token del dueño
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class RedisLock(LockPort):
+    """
+    Implementación de LockPort con SET NX PX sobre una única instancia de Redis.
+
+    Falla en abierto: si Redis no responde, acquire devuelve un token como si
+    se hubiera obtenido el bloqueo. En el peor caso dos réplicas procesan el
+    mismo documento, que es lo que ocurría sin bloqueo.
+    """
+
+    def __init__(self, redis_url: str, prefix: str = "ocr:lock:", timeout: float = 0.5):
+        """
+        Args:
+            redis_url: URL de conexión a Redis (redis://localhost:6379)
+            prefix: Prefijo de las claves de bloqueo
+            timeout: Segundos máximos por operación
+        """
+        self.client = redis.Redis.from_url(
+            redis_url,
+            socket_timeout=timeout,
+            socket_connect_timeout=timeout
+        )
+        self.prefix = prefix
+        self.timeout = timeout
+        self._release = self.client.register_script(_RELEASE_SCRIPT)
+
+    async def acquire(self, key: str, ttl_seconds: float) -> Optional[str]:
+        """Toma el bloqueo con SET NX PX; None si otra réplica lo tiene"""
+        token = uuid.uuid4().hex
+        try:
+            acquired = await asyncio.wait_for(
+                self.client.set(self.prefix + key, token, nx=True, px=int(ttl_seconds * 1000)),
+                self.timeout
+            )
+        except (RedisError, OSError, asyncio.TimeoutError) as e:
+            logger.warning("redis_lock_unavailable", key=key, error=repr(e))
+            return token
+        return token if acquired else None
+
+    async def release(self, key: str, token: str) -> bool:
+        """Libera el bloqueo de forma atómica solo si el token coincide"""
+        try:
+            released = await asyncio.wait_for(
+                self._release(keys=[self.prefix + key], args=[token]),
+                self.timeout
+            )
+        except (RedisError, OSError, asyncio.TimeoutError) as e:
+            logger.warning("redis_lock_release_failed", key=key, error=repr(e))
+            return False
+        return bool(released)
+
+    async def close(self):
+        """
+        Cierra la conexión con Redis.
+        """
+        await self.client.aclose()
@@ -0,0 +1,316 @@
+"""
+Motor OCR con varias réplicas del modelo en procesos independientes.
+"""
+import functools
+import itertools
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import structlog
+
+from domain.models import Document, Page
+from domain.ports import OcrPort, PageImage, ProgressCallback
+from infrastructure.monitoring import REPLICA_INFLIGHT_PAGES
+from infrastructure.pdf_rasterizer import PdfRasterizer
+from infrastructure.thread_budget import ThreadBudget, available_cores
+from config.settings import Settings
+
+logger = structlog.get_logger(__name__)
+
+# Adaptador de la réplica que corre en el proceso actual (solo en los workers)
+_REPLICA_ADAPTER = None
+
+
+def split_cores(cores: Sequence[int], parts: int) -> List[List[int]]:
+    """
+    Reparte los núcleos en ``parts`` grupos contiguos de tamaño similar.
+
+    Si hay menos núcleos que grupos, los grupos comparten núcleos.
+
+    Args:
+        cores: Núcleos disponibles
+        parts: Número de grupos
+
+    Returns:
+        List[List[int]]: Núcleos de cada grupo
+    """
+    if len(cores) < parts:
+        return [[cores[idx % len(cores)]] for idx in range(parts)]
+    size, extra = divmod(len(cores), parts)
+    groups, start = [], 0
+    for idx in range(parts):
+        end = start + size + (1 if idx < extra else 0)
+        groups.append(list(cores[start:end]))
+        start = end
+    return groups
+
+
+def _init_replica(adapter_factory: Callable[[], OcrPort], cores: Optional[List[int]], threads: int):
+    """Inicializa un proceso réplica: afinidad, hilos de torch y modelo"""
+    global _REPLICA_ADAPTER
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+
+    import torch
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+
+    _REPLICA_ADAPTER = adapter_factory()
+
+
+def _replica_warmup() -> int:
+    _REPLICA_ADAPTER.warmup()
+    return os.getpid()
+
+
+def _replica_process_pages(images: List[PageImage]) -> List[Tuple[str, Dict]]:
+    return _REPLICA_ADAPTER.process_pages(images)
+
+
+class _Replica:
+    """Proceso réplica con su contador de páginas en curso"""
+
+    def __init__(self, index: int, cores: Optional[List[int]], start: Callable[[], ProcessPoolExecutor]):
+        self.index = index
+        self.cores = cores
+        self.inflight = 0
+        self.restarts = 0
+        self._start = start
+        self.executor = start()
+
+    def restart(self, broken: ProcessPoolExecutor):
+        """
+        Sustituye el executor si sigue siendo el que se rompió.
+
+        Un proceso muerto (OOM, fallo en torch) deja su ProcessPoolExecutor
+        roto para siempre; el nuevo arranca otro proceso y vuelve a cargar
+        el modelo con el primer lote. Llamar con el lock del pool.
+        """
+        if self.executor is not broken:
+            return
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.executor = self._start()
+        self.restarts += 1
+        logger.warning("replica_restarted", replica=self.index, restarts=self.restarts)
+
+
+class ReplicaPool(OcrPort):
+    """
+    Motor OCR que reparte las páginas entre K réplicas del modelo.
+
+    Cada réplica es un proceso con su propia copia del modelo, fijado a un
+    grupo de núcleos y con tantos hilos de torch como núcleos tiene, de modo
+    que la generación (muy ligada al intérprete) no compite por el GIL ni
+    por el pool intra-op de otra réplica. Cada lote de páginas va a la
+    réplica con menos páginas en curso.
+
+    La rasterización se hace en el proceso principal y las imágenes se
+    envían a las réplicas, que aplican la omisión de páginas en blanco y el
+    caché de páginas como DonutAdapter.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        adapter_factory: Callable[[], OcrPort],
+        replica_count: Optional[int] = None,
+        pin_cores: Optional[bool] = None,
+        thread_budget: Optional[ThreadBudget] = None
+    ):
+        """
+        Args:
+            settings: Configuración del procesamiento
+            adapter_factory: Función serializable que crea el adaptador de
+                             cada réplica (se ejecuta dentro del proceso)
+            replica_count: Número de réplicas (por defecto settings.replica_count)
+            pin_cores: Fijar cada réplica a su grupo de núcleos (Linux)
+            thread_budget: Reparto de núcleos; las réplicas se reparten los
+                           de inferencia y poppler usa los de rasterización
+        """
+        self.settings = settings
+        self.replica_count = max(1, replica_count or settings.replica_count)
+        self.pin_cores = settings.replica_pin_cores if pin_cores is None else pin_cores
+        self.batch_size = settings.inference_batch_size
+        # Lotes en vuelo por documento: suficientes para ocupar todas las réplicas
+        self.max_inflight_batches = max(
+            self.replica_count,
+            settings.max_inflight_pages // max(1, self.batch_size)
+        )
+        self.rasterizer = PdfRasterizer(
+            dpi=settings.pdf_dpi,
+            thread_count=thread_budget.rasterize_threads if thread_budget else settings.num_threads,
+            max_inflight_pages=settings.max_inflight_pages
+        )
+
+        # spawn: los procesos hijos no heredan el estado de hilos de torch
+        context = multiprocessing.get_context("spawn")
+        cores = thread_budget.inference_cores if thread_budget else available_cores()
+        groups = split_cores(cores, self.replica_count)
+        self._lock = threading.Lock()
+        self._replicas: List[_Replica] = []
+        for index, cores in enumerate(groups):
+            start = functools.partial(
+                ProcessPoolExecutor,
+                max_workers=1,
+                mp_context=context,
+                initializer=_init_replica,
+                initargs=(adapter_factory, cores if self.pin_cores else None, len(cores))
+            )
+            self._replicas.append(_Replica(index, cores, start))
+            REPLICA_INFLIGHT_PAGES.labels(replica=str(index)).set(0)
+
+        logger.info(
+            "replica_pool_started",
+            replicas=self.replica_count,
+            cores=[replica.cores for replica in self._replicas],
+            pinned=self.pin_cores
+        )
+
+    def _submit(self, images: List[PageImage]) -> Future:
+        """Envía un lote a la réplica con menos páginas en curso"""
+        with self._lock:
+            replica = min(self._replicas, key=lambda r: r.inflight)
+            replica.inflight += len(images)
+            REPLICA_INFLIGHT_PAGES.labels(replica=str(replica.index)).set(replica.inflight)
+            executor = replica.executor
+            try:
+                future = executor.submit(_replica_process_pages, images)
+            except BrokenProcessPool:
+                # Se rompió antes de recibir el lote: reiniciar y reenviar
+                replica.restart(executor)
+                executor = replica.executor
+                future = executor.submit(_replica_process_pages, images)
+
+        def done(future: Future):
+            with self._lock:
+                replica.inflight -= len(images)
+                REPLICA_INFLIGHT_PAGES.labels(replica=str(replica.index)).set(replica.inflight)
+                if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+                    replica.restart(executor)
+
+        future.add_done_callback(done)
+        return future
+
+    def _result(self, future: Future, images: List[PageImage]) -> List[Tuple[str, Dict]]:
+        """
+        Resultado de un lote; si su réplica murió, se reintenta una vez.
+
+        El reintento va a la réplica menos cargada (la caída ya está
+        reiniciándose). Si vuelve a fallar, el lote probablemente provoca
+        la caída y el error se propaga.
+        """
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            logger.warning("replica_batch_retried", pages=len(images))
+            return self._submit(images).result()
+
+    def process_pages(self, images: List[PageImage]) -> List[Tuple[str, Dict]]:
+        """
+        Procesa páginas repartiendo sus lotes entre las réplicas.
+
+        Returns:
+            List[Tuple[str, Dict]]: Texto y metadata de cada página, en orden
+        """
+        batches = [
+            list(images[start:start + self.batch_size])
+            for start in range(0, len(images), self.batch_size)
+        ]
+        futures = [self._submit(batch) for batch in batches]
+        return [
+            result
+            for future, batch in zip(futures, batches)
+            for result in self._result(future, batch)
+        ]
+
+    def extract_text(self, image: PageImage) -> str:
+        return self.extract_text_batch([image])[0]
+
+    def extract_text_batch(self, images: List[PageImage]) -> List[str]:
+        return [text for text, _ in self.process_pages(images)]
+
+    def iter_pdf_pages(self, pdf_path: Path) -> Iterator[Page]:
+        """
+        Genera las páginas de un PDF a medida que las réplicas las procesan.
+
+        Cerrar el generador cancela los lotes que aún no han empezado.
+
+        Args:
+            pdf_path: Ruta al PDF
+
+        Yields:
+            Page: Cada página procesada, en orden
+        """
+        pages = iter(self.rasterizer.iter_pages(Path(pdf_path)))
+        pending: deque = deque()
+        number = 0
+        try:
+            while True:
+                batch = list(itertools.islice(pages, self.batch_size))
+                if batch:
+                    pending.append((self._submit(batch), batch))
+                # Acotar la memoria: no renderizar más allá de los lotes en vuelo
+                while pending and (not batch or len(pending) >= self.max_inflight_batches):
+                    for raw_text, page_metadata in self._result(*pending.popleft()):
+                        number += 1
+                        yield Page(number=number, raw_text=raw_text, metadata=page_metadata)
+                if not batch:
+                    break
+        finally:
+            for future, _ in pending:
+                future.cancel()
+
+    def document_metadata(self) -> Dict:
+        """Metadata común de los documentos procesados por este motor"""
+        return {
+            "ocr_engine": "donut",
+            "model": self.settings.model_name,
+            "dpi": self.settings.pdf_dpi,
+            "batch_size": self.batch_size,
+            "replicas": self.replica_count
+        }
+
+    def process_pdf(self, pdf_path: Path, progress: Optional[ProgressCallback] = None) -> Document:
+        """
+        Procesa un PDF completo repartiendo sus páginas entre las réplicas.
+
+        Args:
+            pdf_path: Ruta al PDF
+            progress: Se llama con (páginas procesadas, páginas totales)
+                      tras cada página
+        """
+        pdf_path = Path(pdf_path)
+        total = self.rasterizer.page_count(pdf_path) if progress else 0
+
+        processed_pages: List[Page] = []
+        for page in self.iter_pdf_pages(pdf_path):
+            processed_pages.append(page)
+            if progress:
+                progress(len(processed_pages), total)
+
+        return Document(
+            name=pdf_path.name,
+            pages=processed_pages,
+            metadata=self.document_metadata()
+        )
+
+    def warmup(self):
+        """
+        Arranca todas las réplicas y ejecuta una inferencia de calentamiento en cada una.
+        """
+        futures = [replica.executor.submit(_replica_warmup) for replica in self._replicas]
+        for future in futures:
+            future.result()
+
+    def close(self):
+        """
+        Detiene los procesos réplica.
+        """
+        for replica in self._replicas:
+            replica.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,139 @@
+"""
+Reparto de los núcleos de CPU entre rasterización, inferencia y E/S.
+"""
+import os
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import structlog
+
+from infrastructure.monitoring import THREAD_BUDGET
+from config.settings import Settings
+
+logger = structlog.get_logger(__name__)
+
+
+def available_cores() -> List[int]:
+    """Núcleos que el proceso puede usar (respeta cgroups/taskset en Linux)"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+@dataclass(frozen=True)
+class ThreadBudget:
+    """
+    Presupuesto de hilos de un proceso de la aplicación.
+
+    Sin un reparto común, poppler, el pool intra-op de torch, el executor
+    de DocumentService y los workers de uvicorn dimensionan sus hilos por
+    separado y, juntos, piden varias veces los núcleos disponibles. El
+    presupuesto divide los núcleos del host entre los workers de la API y,
+    dentro de cada proceso, entre rasterización e inferencia.
+
+    Con ``pin_affinity`` cada hilo del pipeline se fija a los núcleos de su
+    rol (en Linux la afinidad es por hilo, y los procesos de poppler la
+    heredan del hilo que los lanza). Solo se fija si hay un único worker de
+    API: los workers no conocen su índice y se solaparían.
+
+    Attributes:
+        cores: Núcleos asignados a este proceso
+        rasterize_cores: Núcleos para poppler y el preprocesado
+        inference_cores: Núcleos para el modelo
+        interop_threads: Hilos inter-op de torch
+        io_threads: Hilos del executor de E/S y documentos concurrentes
+        pin_affinity: Si los hilos se fijan a los núcleos de su rol
+    """
+    cores: List[int]
+    rasterize_cores: List[int]
+    inference_cores: List[int]
+    interop_threads: int
+    io_threads: int
+    pin_affinity: bool = False
+
+    @property
+    def rasterize_threads(self) -> int:
+        return len(self.rasterize_cores)
+
+    @property
+    def inference_threads(self) -> int:
+        return len(self.inference_cores)
+
+    @classmethod
+    def from_settings(cls, settings: Settings, cores: Optional[Sequence[int]] = None) -> "ThreadBudget":
+        """
+        Calcula el presupuesto a partir de la configuración.
+
+        Args:
+            settings: Configuración del procesamiento
+            cores: Núcleos disponibles (por defecto, los del proceso)
+
+        Returns:
+            ThreadBudget: Presupuesto de este proceso
+        """
+        cores = list(cores) if cores is not None else available_cores()
+        if settings.cpu_cores:
+            cores = cores[:settings.cpu_cores]
+        workers = max(1, settings.api_workers)
+        per_process = max(1, len(cores) // workers)
+        own = cores[:per_process]
+
+        # Al menos un núcleo para el modelo; poppler se queda con su cuota
+        rasterize = max(1, round(per_process * settings.rasterize_core_share))
+        rasterize = min(rasterize, per_process - 1) if per_process > 1 else 1
+        rasterize_cores = own[:rasterize]
+        inference_cores = own[rasterize:] or own
+
+        return cls(
+            cores=own,
+            rasterize_cores=rasterize_cores,
+            inference_cores=inference_cores,
+            interop_threads=1,
+            io_threads=settings.io_threads or max(2, min(8, per_process)),
+            pin_affinity=settings.pin_cpu_affinity and workers == 1
+        )
+
+    def apply(self):
+        """
+        Ajusta los hilos intra-op e inter-op de torch al presupuesto.
+
+        Debe llamarse antes de la primera inferencia: torch solo permite
+        cambiar los hilos inter-op una vez.
+        """
+        import torch
+        torch.set_num_threads(self.inference_threads)
+        try:
+            torch.set_num_interop_threads(self.interop_threads)
+        except RuntimeError:
+            logger.warning("torch_interop_threads_already_set")
+
+    def pin_current_thread(self, stage: str):
+        """
+        Fija el hilo actual a los núcleos de su etapa del pipeline.
+
+        Args:
+            stage: "rasterize", "preprocess" o "infer"
+        """
+        if not self.pin_affinity or not hasattr(os, "sched_setaffinity"):
+            return
+        cores = self.inference_cores if stage == "infer" else self.rasterize_cores
+        os.sched_setaffinity(0, cores)
+
+    def report(self):
+        """
+        Publica el presupuesto en el log y como métricas.
+        """
+        THREAD_BUDGET.labels(role="cores").set(len(self.cores))
+        THREAD_BUDGET.labels(role="rasterize").set(self.rasterize_threads)
+        THREAD_BUDGET.labels(role="inference").set(self.inference_threads)
+        THREAD_BUDGET.labels(role="interop").set(self.interop_threads)
+        THREAD_BUDGET.labels(role="io").set(self.io_threads)
+        logger.info(
+            "thread_budget",
+            cores=len(self.cores),
+            rasterize=self.rasterize_cores,
+            inference=self.inference_cores,
+            interop_threads=self.interop_threads,
+            io_threads=self.io_threads,
+            pinned=self.pin_affinity
+        )
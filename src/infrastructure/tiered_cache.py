@@ -0,0 +1,229 @@
+"""
+Caché de dos niveles: LRU en proceso delante de un CachePort remoto.
+"""
+import fnmatch
+import json
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from domain.cache_port import CachePort
+from infrastructure.monitoring import CACHE_TIER_EVENTS
+
+
+class TieredCache(CachePort):
+    """
+    CachePort con un LRU local acotado por bytes delante de otro backend.
+
+    Las lecturas consultan primero el LRU y, si fallan, el backend
+    (read-through), guardando el valor localmente. Las escrituras van a
+    ambos niveles (write-through). Un acierto local evita tanto el viaje de
+    red como la deserialización: los valores se comparten entre llamadas y
+    deben tratarse como de solo lectura.
+
+    No es seguro entre hilos: debe usarse desde un único event loop.
+    """
+
+    def __init__(
+        self,
+        backend: CachePort,
+        max_bytes: int = 64 * 1024 * 1024,
+        local_ttl: timedelta = timedelta(minutes=5)
+    ):
+        """
+        Args:
+            backend: Caché de segundo nivel (ej: RedisCache)
+            max_bytes: Tamaño máximo estimado de las entradas locales
+            local_ttl: Tiempo de vida máximo de una entrada local
+        """
+        self.backend = backend
+        self.max_bytes = max_bytes
+        self.local_ttl_seconds = local_ttl.total_seconds()
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self.stats: Dict[str, int] = {
+            f"{tier}_{event}": 0
+            for tier in ("local", "remote")
+            for event in ("hits", "misses")
+        }
+        self.stats["local_evictions"] = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Recupera un valor, primero del LRU local y luego del backend.
+        
+        Args:
+            key: Clave a buscar
+            
+        Returns:
+            Optional[Any]: Valor almacenado o None si no existe
+        """
+        value = self._local_get(key)
+        if value is not None:
+            return value
+
+        value = await self.backend.get(key)
+        self._count("remote", "hits" if value is not None else "misses")
+        if value is not None:
+            self._local_put(key, value)
+        return value
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Recupera varios valores; solo las claves ausentes en local van al backend.
+        
+        Args:
+            keys: Claves a buscar
+            
+        Returns:
+            Dict[str, Any]: Valores encontrados, indexados por clave
+        """
+        found = {}
+        missing = []
+        for key in keys:
+            value = self._local_get(key)
+            if value is not None:
+                found[key] = value
+            else:
+                missing.append(key)
+
+        if missing:
+            remote = await self.backend.get_many(missing)
+            self._count("remote", "hits", len(remote))
+            self._count("remote", "misses", len(missing) - len(remote))
+            for key, value in remote.items():
+                self._local_put(key, value)
+            found.update(remote)
+        return found
+
+    async def set(self, key: str, value: Any, ttl: Optional[timedelta] = None) -> bool:
+        """
+        Almacena un valor en ambos niveles.
+        
+        Args:
+            key: Clave para almacenar el valor
+            value: Valor a almacenar
+            ttl: Tiempo de vida del valor en caché
+            
+        Returns:
+            bool: True si el backend lo almacenó correctamente
+        """
+        stored = await self.backend.set(key, value, ttl)
+        self._local_put(key, value, ttl)
+        return stored
+
+    async def set_many(self, items: Dict[str, Any], ttl: Optional[timedelta] = None) -> bool:
+        """
+        Almacena varios valores en ambos niveles.
+        
+        Args:
+            items: Valores a almacenar, indexados por clave
+            ttl: Tiempo de vida de los valores en caché
+            
+        Returns:
+            bool: True si el backend los almacenó correctamente
+        """
+        stored = await self.backend.set_many(items, ttl)
+        for key, value in items.items():
+            self._local_put(key, value, ttl)
+        return stored
+
+    async def delete(self, key: str) -> bool:
+        """
+        Elimina un valor de ambos niveles.
+        
+        Args:
+            key: Clave a eliminar
+            
+        Returns:
+            bool: True si el backend lo eliminó
+        """
+        self._local_pop(key)
+        return await self.backend.delete(key)
+
+    async def exists(self, key: str) -> bool:
+        """
+        Verifica si una clave existe en alguno de los niveles.
+        
+        Args:
+            key: Clave a verificar
+            
+        Returns:
+            bool: True si la clave existe
+        """
+        if self._local_get(key, count=False) is not None:
+            return True
+        return await self.backend.exists(key)
+
+    async def delete_matching(self, pattern: str, exclude_prefix: Optional[str] = None) -> int:
+        """
+        Elimina en bloque las claves que coinciden con un patrón en ambos niveles.
+        
+        Args:
+            pattern: Patrón glob de claves
+            exclude_prefix: Prefijo de las claves que deben conservarse
+            
+        Returns:
+            int: Número de claves eliminadas del backend
+        """
+        for key in [k for k in self._entries if fnmatch.fnmatchcase(k, pattern)]:
+            if not (exclude_prefix and key.startswith(exclude_prefix)):
+                self._local_pop(key)
+        return await self.backend.delete_matching(pattern, exclude_prefix)
+
+    def _local_get(self, key: str, count: bool = True) -> Optional[Any]:
+        """Lee del LRU, descartando entradas caducadas"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[2] <= time.monotonic():
+            self._local_pop(key)
+            entry = None
+
+        if entry is None:
+            if count:
+                self._count("local", "misses")
+            return None
+
+        self._entries.move_to_end(key)
+        if count:
+            self._count("local", "hits")
+        return entry[0]
+
+    def _local_put(self, key: str, value: Any, ttl: Optional[timedelta] = None):
+        """Guarda en el LRU y expulsa las entradas menos usadas si se excede el tamaño"""
+        size = _estimate_size(key, value)
+        self._local_pop(key)
+        if size > self.max_bytes:
+            return
+
+        ttl_seconds = self.local_ttl_seconds
+        if ttl is not None:
+            ttl_seconds = min(ttl_seconds, ttl.total_seconds())
+        self._entries[key] = (value, size, time.monotonic() + ttl_seconds)
+        self._bytes += size
+
+        while self._bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self._count("local", "evictions")
+
+    def _local_pop(self, key: str):
+        """Elimina una entrada del LRU si existe"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def _count(self, tier: str, event: str, amount: int = 1):
+        """Actualiza los contadores locales y las métricas Prometheus"""
+        if amount:
+            self.stats[f"{tier}_{event}"] += amount
+            CACHE_TIER_EVENTS.labels(tier=tier, event=event).inc(amount)
+
+
+def _estimate_size(key: str, value: Any) -> int:
+    """Tamaño aproximado en bytes de una entrada (clave + valor serializado)"""
+    if isinstance(value, (bytes, bytearray)):
+        return len(key) + len(value)
+    if isinstance(value, str):
+        return len(key) + len(value.encode())
+    return len(key) + len(json.dumps(value, default=str, separators=(",", ":")))
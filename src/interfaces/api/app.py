@@ -1,29 +1,85 @@
 """
 Aplicación principal FastAPI.
 """
-from fastapi import FastAPI
+import asyncio
+from datetime import datetime
+from contextlib import asynccontextmanager
+import structlog
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from prometheus_client import make_asgi_app
 from .router import router
-from ..config.container import Container
+from application.admission_controller import QUEUE_FULL
+from config.container import Container
+from domain.exceptions import OverloadedError
+
+logger = structlog.get_logger(__name__)
+
+async def warm_up_engine(app: FastAPI, container: Container):
+    """
+    Carga el modelo OCR y ejecuta una inferencia de calentamiento.
+
+    Se ejecuta en segundo plano durante el arranque; la aplicación solo se
+    declara lista en /ready cuando termina.
+
+    Args:
+        app: Aplicación cuyo estado se actualiza
+        container: Contenedor del que se obtiene el motor OCR
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        # Cargar y calentar fuera del event loop para no bloquear /health
+        adapter = await loop.run_in_executor(None, container.ocr_engine)
+        await loop.run_in_executor(None, adapter.warmup)
+        app.state.ready = True
+        logger.info("ocr_engine_ready")
+
+        # Con el modelo cargado, empezar a consumir los trabajos encolados
+        container.job_service().start()
+    except Exception as e:
+        app.state.startup_error = str(e)
+        logger.error("ocr_engine_warmup_failed", error=str(e))
+        return
+
+    # Limpiar resultados generados con una configuración anterior
+    try:
+        purged = await container.document_service().purge_stale_cache()
+        logger.info("stale_cache_purged", entries=purged)
+    except Exception as e:
+        logger.warning("stale_cache_purge_failed", error=str(e))
 
 def create_app() -> FastAPI:
     """
     Crea y configura la aplicación FastAPI.
-    
+
     Returns:
         FastAPI: Aplicación configurada
     """
     # Crear contenedor de dependencias
     container = Container()
-    
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        app.state.ready = False
+        app.state.startup_error = None
+        # Calcular y publicar el reparto de CPU antes de cargar el modelo
+        container.thread_budget()
+        warmup = asyncio.create_task(warm_up_engine(app, container))
+        yield
+        warmup.cancel()
+        await container.job_service().stop()
+
     # Crear aplicación
     app = FastAPI(
         title="OCR-LLM API",
         description="API REST para procesamiento de documentos con OCR",
-        version="1.0.0"
+        version="1.0.0",
+        lifespan=lifespan
     )
-    
+    # Expuesto para poder sustituir proveedores (ej: en pruebas)
+    app.container = container
+
     # Configurar CORS
     app.add_middleware(
         CORSMiddleware,
@@ -32,17 +88,57 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
-    
+
     # Montar métricas Prometheus
     metrics_app = make_asgi_app()
     app.mount("/metrics", metrics_app)
-    
+
+    @app.get("/health", tags=["probes"])
+    async def health_check():
+        """Liveness: el proceso responde, aunque el modelo no esté cargado"""
+        return {"status": "healthy", "service": "ocr-llm"}
+
+    @app.get("/ready", tags=["probes"])
+    async def readiness_check():
+        """Readiness: el modelo está cargado y calentado"""
+        if getattr(app.state, "ready", False):
+            return {"status": "ready"}
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "status": "starting",
+                "error": getattr(app.state, "startup_error", None)
+            }
+        )
+
+    @app.exception_handler(OverloadedError)
+    async def overloaded_handler(request: Request, exc: OverloadedError):
+        """
+        Rechazo del control de admisión: 429 si hay demasiadas páginas en
+        curso, 503 si tardaría demasiado en atenderse. Retry-After indica
+        cuándo se habrá vaciado el exceso.
+        """
+        status_code = (
+            status.HTTP_429_TOO_MANY_REQUESTS if exc.reason == QUEUE_FULL
+            else status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        return JSONResponse(
+            status_code=status_code,
+            headers={"Retry-After": str(int(exc.retry_after_seconds))},
+            content={
+                "detail": str(exc),
+                "error_code": exc.reason,
+                "timestamp": datetime.now().isoformat(),
+                "path": request.url.path
+            }
+        )
+
     # Incluir rutas
     app.include_router(router)
-    
+
     # Configurar inyección de dependencias
     container.wire(modules=[".router"])
-    
+
     return app
 
 app = create_app()
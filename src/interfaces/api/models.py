@@ -1,7 +1,7 @@
 """
 Modelos de datos para la API REST.
 """
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
 
@@ -24,15 +24,27 @@ class ProcessingOptions(BaseModel):
 
 class DocumentResponse(BaseModel):
     """Respuesta con información del documento procesado"""
-    id: str
     original_name: str
+    storage_path: Optional[str] = None
     text: str
     processed_at: datetime
     processing_time: float
-    quality_score: Optional[float] = None
     page_count: int
     word_count: int
 
+class BatchDocumentResponse(BaseModel):
+    """Documento procesado dentro de un lote"""
+    original_name: str
+    storage_path: Optional[str] = None
+    page_count: int
+    processing_time: float
+
+class BatchErrorResponse(BaseModel):
+    """Documento de un lote que no se pudo procesar"""
+    original_name: str
+    error: str
+    error_type: str
+
 class BatchProcessingResponse(BaseModel):
     """Respuesta para el procesamiento por lotes"""
     batch_id: str
@@ -41,7 +53,20 @@ class BatchProcessingResponse(BaseModel):
     failed_documents: int
     started_at: datetime
     completed_at: Optional[datetime] = None
-    documents: List[DocumentResponse]
+    documents: List[BatchDocumentResponse]
+    errors: List[BatchErrorResponse] = []
+
+class JobResponse(BaseModel):
+    """Estado de un trabajo de OCR asíncrono"""
+    id: str
+    status: str
+    pages_done: int = 0
+    pages_total: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
 
 class ErrorResponse(BaseModel):
     """Modelo para respuestas de error"""
@@ -1,17 +1,59 @@
 """
 Enrutador principal de la API REST.
 """
-from typing import List
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+import json
+import time
+from contextlib import aclosing
+from dataclasses import asdict
+from datetime import datetime
+from typing import AsyncIterator, List, Literal, Optional
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Query, Request, UploadFile, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from dependency_injector.wiring import inject, Provide
-from ..application.document_service import DocumentService
-from ..config.container import Container
+from application.admission_controller import AdmissionController
+from application.batch_service import BatchService
+from application.document_service import DocumentService
+from application.job_service import JobService
+from config.container import Container
+from config.settings import Settings
+from domain.exceptions import OverloadedError
+from domain.models import Document, Job
 from .models import (
     ProcessingOptions,
     DocumentResponse,
     BatchProcessingResponse,
+    BatchDocumentResponse,
+    BatchErrorResponse,
+    JobResponse,
     ErrorResponse
 )
+from .uploads import SpooledUpload, spool_upload
+
+# Respuestas del control de admisión (con cabecera Retry-After)
+OVERLOAD_RESPONSES = {
+    429: {"model": ErrorResponse, "description": "Demasiadas páginas en curso"},
+    503: {"model": ErrorResponse, "description": "Tiempo de espera estimado excesivo"}
+}
+
+async def _admit(admission: AdmissionController, uploads: List[SpooledUpload]) -> float:
+    """
+    Admite las subidas como una sola petición.
+
+    Si el control de admisión las rechaza, borra los temporales antes de
+    propagar el error.
+
+    Returns:
+        float: Páginas admitidas, a devolver con admission.release
+    """
+    try:
+        pages = sum([await admission.estimate(upload.path) for upload in uploads])
+        admission.admit(pages)
+        return pages
+    except OverloadedError:
+        for upload in uploads:
+            upload.cleanup()
+        raise
 
 router = APIRouter(prefix="/api/v1")
 
@@ -20,7 +62,8 @@ router = APIRouter(prefix="/api/v1")
     response_model=DocumentResponse,
     responses={
         400: {"model": ErrorResponse},
-        500: {"model": ErrorResponse}
+        500: {"model": ErrorResponse},
+        **OVERLOAD_RESPONSES
     },
     tags=["documents"]
 )
@@ -28,7 +71,9 @@ router = APIRouter(prefix="/api/v1")
 async def process_document(
     file: UploadFile = File(...),
     options: ProcessingOptions = Depends(),
-    document_service: DocumentService = Depends(Provide[Container.document_service])
+    document_service: DocumentService = Depends(Provide[Container.document_service]),
+    admission: AdmissionController = Depends(Provide[Container.admission_controller]),
+    settings: Settings = Depends(Provide[Container.settings])
 ):
     """
     Procesa un único documento.
@@ -37,32 +82,37 @@ async def process_document(
         file: Archivo a procesar
         options: Opciones de procesamiento
         document_service: Servicio de procesamiento inyectado
+        admission: Control de admisión inyectado
+        settings: Configuración (límite de tamaño y directorio temporal)
         
     Returns:
         DocumentResponse: Información del documento procesado
     """
+    upload = await spool_upload(
+        file,
+        max_bytes=settings.max_upload_mb * 1024 * 1024,
+        directory=settings.temp_dir
+    )
+    pages = await _admit(admission, [upload])
+    processed = False
+    started = time.perf_counter()
     try:
-        # Guardar archivo temporalmente
-        temp_path = f"/tmp/{file.filename}"
-        with open(temp_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        # Procesar documento
+        # El hash calculado al recibir el archivo evita releerlo para el caché
         document = await document_service.process_one(
-            temp_path,
-            options=options
+            upload.path,
+            content_hash=upload.content_hash
         )
+        processed = True
         
+        text = "\n\n".join(page.refined_text or page.raw_text for page in document.pages)
         return DocumentResponse(
-            id=document.id,
-            original_name=file.filename,
-            text=document.text,
-            processed_at=document.processed_at,
-            processing_time=document.processing_time,
-            quality_score=document.quality_score,
+            original_name=upload.filename,
+            storage_path=document.metadata.get("storage_path"),
+            text=text,
+            processed_at=datetime.now(),
+            processing_time=time.perf_counter() - started,
             page_count=len(document.pages),
-            word_count=len(document.text.split())
+            word_count=len(text.split())
         )
         
     except Exception as e:
@@ -70,13 +120,17 @@ async def process_document(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
+    finally:
+        admission.release(pages, processed)
+        upload.cleanup()
 
 @router.post(
     "/documents/batch",
     response_model=BatchProcessingResponse,
     responses={
         400: {"model": ErrorResponse},
-        500: {"model": ErrorResponse}
+        500: {"model": ErrorResponse},
+        **OVERLOAD_RESPONSES
     },
     tags=["documents"]
 )
@@ -84,59 +138,285 @@ async def process_document(
 async def process_batch(
     files: List[UploadFile] = File(...),
     options: ProcessingOptions = Depends(),
-    document_service: DocumentService = Depends(Provide[Container.document_service])
+    batch_service: BatchService = Depends(Provide[Container.batch_service]),
+    admission: AdmissionController = Depends(Provide[Container.admission_controller]),
+    settings: Settings = Depends(Provide[Container.settings])
 ):
     """
     Procesa múltiples documentos en lote.
     
+    Los documentos se procesan con concurrencia limitada y cada uno se
+    guarda al terminar; la respuesta incluye dónde quedó cada documento y
+    un registro por cada fallo.
+    
     Args:
         files: Lista de archivos a procesar
         options: Opciones de procesamiento
-        document_service: Servicio de procesamiento inyectado
+        batch_service: Servicio de lotes inyectado
+        admission: Control de admisión inyectado
+        settings: Configuración (límite de tamaño y directorio temporal)
         
     Returns:
         BatchProcessingResponse: Información del procesamiento por lotes
     """
+    # Uno a uno: en memoria solo hay un bloque de un archivo a la vez
+    uploads = []
+    pages = None
+    processed = False
     try:
-        # Guardar archivos temporalmente
-        paths = []
         for file in files:
-            temp_path = f"/tmp/{file.filename}"
-            with open(temp_path, "wb") as buffer:
-                content = await file.read()
-                buffer.write(content)
-            paths.append(temp_path)
+            uploads.append(await spool_upload(
+                file,
+                max_bytes=settings.max_upload_mb * 1024 * 1024,
+                directory=settings.temp_dir
+            ))
+        pages = await _admit(admission, uploads)
         
         # Procesar documentos
-        batch_result = await document_service.process_batch(
-            paths,
-            options=options
+        batch_result = await batch_service.process_batch(
+            [upload.path for upload in uploads],
+            content_hashes=[upload.content_hash for upload in uploads]
         )
+        # Un lote sin ningún documento procesado no cuenta para el ritmo
+        processed = batch_result.processed_documents > 0
         
+        # Los registros siguen el orden de las subidas
+        items = list(zip(uploads, batch_result.results))
         return BatchProcessingResponse(
             batch_id=batch_result.id,
-            total_documents=len(files),
-            processed_documents=len(batch_result.documents),
+            total_documents=batch_result.total_documents,
+            processed_documents=batch_result.processed_documents,
             failed_documents=batch_result.failed_documents,
             started_at=batch_result.started_at,
             completed_at=batch_result.completed_at,
             documents=[
-                DocumentResponse(
-                    id=doc.id,
-                    original_name=doc.original_name,
-                    text=doc.text,
-                    processed_at=doc.processed_at,
-                    processing_time=doc.processing_time,
-                    quality_score=doc.quality_score,
-                    page_count=len(doc.pages),
-                    word_count=len(doc.text.split())
+                BatchDocumentResponse(
+                    original_name=upload.filename,
+                    storage_path=result.storage_path,
+                    page_count=result.page_count,
+                    processing_time=result.processing_time
+                )
+                for upload, result in items if result.ok
+            ],
+            errors=[
+                BatchErrorResponse(
+                    original_name=upload.filename,
+                    error=result.error,
+                    error_type=result.error_type
                 )
-                for doc in batch_result.documents
+                for upload, result in items if not result.ok
             ]
         )
         
+    except (HTTPException, OverloadedError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
+    finally:
+        if pages is not None:
+            admission.release(pages, processed)
+        for upload in uploads:
+            upload.cleanup()
+
+def _job_response(job: Job) -> JobResponse:
+    """Convierte un trabajo del dominio en la respuesta de la API"""
+    def timestamp(value: Optional[float]) -> Optional[datetime]:
+        return datetime.fromtimestamp(value) if value is not None else None
+
+    return JobResponse(
+        id=job.id,
+        status=job.status.value,
+        pages_done=job.pages_done,
+        pages_total=job.pages_total,
+        created_at=timestamp(job.created_at),
+        started_at=timestamp(job.started_at),
+        finished_at=timestamp(job.finished_at),
+        error=job.error,
+        result=job.result
+    )
+
+@router.post(
+    "/jobs",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        500: {"model": ErrorResponse},
+        **OVERLOAD_RESPONSES
+    },
+    tags=["jobs"]
+)
+@inject
+async def submit_job(
+    file: UploadFile = File(...),
+    client_id: Optional[str] = Header(None, alias="X-Client-Id"),
+    job_service: JobService = Depends(Provide[Container.job_service]),
+    settings: Settings = Depends(Provide[Container.settings])
+):
+    """
+    Encola un documento para procesarlo en segundo plano.
+    
+    Responde enseguida con el id del trabajo; su estado se consulta en
+    GET /jobs/{job_id}.
+    
+    Args:
+        file: Archivo a procesar
+        client_id: Identificador del cliente (cabecera X-Client-Id)
+        job_service: Servicio de trabajos inyectado
+        settings: Configuración (límite de tamaño y directorio temporal)
+        
+    Returns:
+        JobResponse: Trabajo encolado
+    """
+    upload = await spool_upload(
+        file,
+        max_bytes=settings.max_upload_mb * 1024 * 1024,
+        directory=settings.temp_dir,
+        prefix="ocr-job-"
+    )
+    
+    try:
+        job = await job_service.submit(
+            upload.path,
+            client_id=client_id,
+            content_hash=upload.content_hash,
+            cleanup=True
+        )
+    except OverloadedError:
+        upload.cleanup()
+        raise
+    return _job_response(job)
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobResponse,
+    responses={
+        404: {"model": ErrorResponse}
+    },
+    tags=["jobs"]
+)
+@inject
+async def get_job(
+    job_id: str,
+    job_service: JobService = Depends(Provide[Container.job_service])
+):
+    """
+    Consulta el estado, el progreso por páginas y el resultado de un trabajo.
+    
+    Args:
+        job_id: Identificador del trabajo
+        job_service: Servicio de trabajos inyectado
+        
+    Returns:
+        JobResponse: Estado actual del trabajo
+    """
+    job = await job_service.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Trabajo {job_id} no encontrado"
+        )
+    return _job_response(job)
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream"
+}
+
+def _stream_record(kind: str, payload: dict, format: str) -> str:
+    """Serializa un registro del flujo como línea NDJSON o evento SSE"""
+    data = json.dumps({"type": kind, **payload}, ensure_ascii=False, default=str)
+    if format == "sse":
+        return f"event: {kind}\ndata: {data}\n\n"
+    return data + "\n"
+
+@router.post(
+    "/documents/stream",
+    responses={
+        200: {
+            "content": {media_type: {} for media_type in STREAM_MEDIA_TYPES.values()},
+            "description": "Un registro por página seguido de un resumen"
+        },
+        **OVERLOAD_RESPONSES
+    },
+    tags=["documents"]
+)
+@inject
+async def stream_document(
+    request: Request,
+    file: UploadFile = File(...),
+    format: Literal["ndjson", "sse"] = Query("ndjson"),
+    document_service: DocumentService = Depends(Provide[Container.document_service]),
+    admission: AdmissionController = Depends(Provide[Container.admission_controller]),
+    settings: Settings = Depends(Provide[Container.settings])
+):
+    """
+    Procesa un documento devolviendo cada página en cuanto está lista.
+    
+    La respuesta es NDJSON (una línea por registro) o Server-Sent Events
+    (``event: page`` / ``event: summary``). Cada página llega como un
+    registro ``page``; al terminar se envía un ``summary`` con la metadata
+    del documento, o un ``error`` si el OCR falla. Si el cliente se
+    desconecta, se cancela el resto del documento.
+    
+    Args:
+        request: Petición HTTP, para detectar la desconexión del cliente
+        file: Archivo a procesar
+        format: Formato del flujo ("ndjson" o "sse")
+        document_service: Servicio de procesamiento inyectado
+        admission: Control de admisión inyectado
+        settings: Configuración (límite de tamaño y directorio temporal)
+        
+    Returns:
+        StreamingResponse: Flujo de registros por página
+    """
+    upload = await spool_upload(
+        file,
+        max_bytes=settings.max_upload_mb * 1024 * 1024,
+        directory=settings.temp_dir,
+        prefix="ocr-stream-"
+    )
+    # Se admite antes de responder: un rechazo aún puede ser un 429/503
+    pages = await _admit(admission, [upload])
+
+    state = {"processed": False, "finished": False}
+
+    def finish():
+        # Desde el generador o, si el cliente se fue antes de empezar, desde
+        # la tarea de fondo de la respuesta: se libera una sola vez
+        if not state["finished"]:
+            state["finished"] = True
+            admission.release(pages, state["processed"])
+            upload.cleanup()
+
+    async def records() -> AsyncIterator[str]:
+        started = time.perf_counter()
+        try:
+            # aclosing: al desconectarse el cliente se cierra el flujo del servicio
+            async with aclosing(document_service.stream_one(upload.path, upload.content_hash)) as items:
+                async for item in items:
+                    if isinstance(item, Document):
+                        state["processed"] = True
+                        yield _stream_record("summary", {
+                            "name": upload.filename,
+                            "page_count": len(item.pages),
+                            "processing_time": time.perf_counter() - started,
+                            "metadata": item.metadata
+                        }, format)
+                        break
+                    yield _stream_record("page", asdict(item), format)
+                    if await request.is_disconnected():
+                        break
+        except Exception as e:
+            yield _stream_record("error", {"detail": str(e)}, format)
+        finally:
+            finish()
+
+    return StreamingResponse(
+        records(),
+        media_type=STREAM_MEDIA_TYPES[format],
+        background=BackgroundTask(finish),
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,106 @@
+"""
+Recepción de archivos subidos a la API sin cargarlos completos en memoria.
+"""
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+from fastapi import HTTPException, UploadFile, status
+from starlette.concurrency import run_in_threadpool
+
+from domain.cache_keys import content_hasher
+
+# Bloques de lectura al guardar una subida en disco
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class SpooledUpload:
+    """
+    Archivo subido y ya volcado a un temporal propio de la petición.
+
+    Attributes:
+        path (str): Ruta del archivo temporal (nombre único)
+        filename (Optional[str]): Nombre original del archivo subido
+        content_hash (str): Hash del contenido, válido como clave de caché
+        size (int): Tamaño en bytes
+    """
+    path: str
+    filename: Optional[str]
+    content_hash: str
+    size: int
+
+    def cleanup(self):
+        """Elimina el archivo temporal si todavía existe"""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"El archivo supera el máximo de {max_bytes // (1024 * 1024)} MB"
+    )
+
+
+async def spool_upload(
+    file: UploadFile,
+    max_bytes: int,
+    directory: Optional[Union[str, Path]] = None,
+    prefix: str = "ocr-upload-",
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> SpooledUpload:
+    """
+    Copia una subida a un archivo temporal único, por bloques.
+
+    Durante la copia se calcula el hash del contenido (el mismo que
+    file_content_hash, así el servicio no vuelve a leer el archivo) y se
+    controla el tamaño: en memoria solo hay un bloque por petición. Si se
+    supera ``max_bytes``, se borra el temporal y se responde 413.
+
+    Args:
+        file: Archivo subido
+        max_bytes: Tamaño máximo aceptado
+        directory: Directorio de los temporales (por defecto, el del sistema)
+        prefix: Prefijo del nombre del temporal
+        chunk_size: Bytes copiados por iteración
+
+    Returns:
+        SpooledUpload: Archivo temporal con su hash y tamaño
+
+    Raises:
+        HTTPException: 413 si el archivo supera max_bytes
+    """
+    # Starlette ya conoce el tamaño de la parte: rechazar sin copiar nada
+    if file.size is not None and file.size > max_bytes:
+        raise _too_large(max_bytes)
+
+    digest = content_hasher()
+    size = 0
+    buffer = tempfile.NamedTemporaryFile(prefix=prefix, suffix=".pdf", dir=directory, delete=False)
+
+    def write(chunk: bytes):
+        digest.update(chunk)
+        buffer.write(chunk)
+
+    try:
+        with buffer:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                await run_in_threadpool(write, chunk)
+    except BaseException:
+        os.unlink(buffer.name)
+        raise
+
+    return SpooledUpload(
+        path=buffer.name,
+        filename=file.filename,
+        content_hash=digest.hexdigest(),
+        size=size
+    )
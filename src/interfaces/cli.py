@@ -1,11 +1,10 @@
 import click
 from dependency_injector.wiring import inject, Provide
 from config.container import Container
-from domain.use_cases import DocumentProcessor, ProcessDocumentRequest
 
 @click.command()
 @click.argument('pdf_path')
-@click.option('--output-format', '-f', default='markdown', 
+@click.option('--output-format', '-f', default='markdown',
               type=click.Choice(['markdown', 'text', 'json']))
 @click.option('--batch-size', '-b', default=5, help='Batch size for LLM processing')
 @inject
@@ -13,9 +12,12 @@ def process_document(
     pdf_path: str,
     output_format: str,
     batch_size: int,
-    processor: DocumentProcessor = Provide[Container.document_processor]
+    processor=Provide[Container.document_processor]
 ):
     """Procesa un documento PDF usando OCR y refinamiento con LLM"""
+    # Importación diferida: --help no debe cargar el dominio ni el modelo
+    from domain.use_cases import ProcessDocumentRequest
+
     try:
         request = ProcessDocumentRequest(
             pdf_path=pdf_path,
@@ -24,7 +26,16 @@ def process_document(
         )
         result = processor.process_document(request)
         click.echo(f"Documento procesado exitosamente: {result.name}")
-        
+
     except Exception as e:
         click.echo(f"Error procesando documento: {str(e)}", err=True)
-        raise click.Abort()
\ No newline at end of file
+        raise click.Abort()
+
+def main():
+    """Punto de entrada del comando ocr-llm"""
+    container = Container()
+    container.wire(modules=[__name__])
+    process_document()
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,18 @@
 """
 Fixtures compartidos para pruebas.
 """
+import fnmatch
 import os
+import threading
 from pathlib import Path
 import pytest
 from faker import Faker
+from dependency_injector import providers
 from fastapi.testclient import TestClient
+from config.settings import Settings
 from domain.models import Document, Page
 from domain.ports import OcrPort, StoragePort
+from domain.cache_port import CachePort
 from infrastructure.donut_adapter import DonutAdapter
 from infrastructure.file_storage import LocalFileStorage
 from infrastructure.monitoring import DocumentProcessingTracer
@@ -28,28 +33,152 @@ def mock_ocr():
     class MockOCR(OcrPort):
         def extract_text(self, image_path: str) -> str:
             return fake.text()
+
+        def warmup(self):
+            pass
+
+        def process_pdf(self, pdf_path, progress=None) -> Document:
+            return Document(
+                name=Path(pdf_path).name,
+                pages=[Page(number=1, raw_text=fake.text())],
+                metadata={"ocr_engine": "mock"}
+            )
     return MockOCR()
 
+@pytest.fixture
+def make_settings(test_dir):
+    """Fábrica de Settings con los directorios dentro del temporal de la prueba."""
+    def make(**overrides):
+        values = dict(
+            enable_cache=False,
+            temp_dir=test_dir / "tmp",
+            input_dir=test_dir / "pdfs",
+            output_dir=test_dir / "output",
+            model_cache_dir=test_dir / "models"
+        )
+        values.update(overrides)
+        return Settings(**values)
+    return make
+
+class PagedOcr(OcrPort):
+    """
+    OCR falso que genera páginas una a una.
+
+    Cuenta los documentos procesados y las páginas producidas, puede fallar
+    en una página y registra cuándo se cierra su generador.
+    """
+
+    def __init__(self, pages=2, fail_at=None, delay=0.0):
+        self.pages = pages
+        self.fail_at = fail_at
+        self.delay = delay
+        self.calls = 0
+        self.produced = 0
+        self.closed = threading.Event()
+        self._lock = threading.Lock()
+
+    def extract_text(self, image):
+        return "texto"
+
+    def warmup(self):
+        pass
+
+    def iter_pdf_pages(self, pdf_path):
+        with self._lock:
+            self.calls += 1
+        try:
+            for number in range(1, self.pages + 1):
+                threading.Event().wait(self.delay)
+                if number == self.fail_at:
+                    raise RuntimeError("página ilegible")
+                self.produced += 1
+                yield Page(number=number, raw_text=f"página {number}")
+        finally:
+            self.closed.set()
+
+    def process_pdf(self, pdf_path, progress=None):
+        return Document(
+            name=Path(pdf_path).name,
+            pages=list(self.iter_pdf_pages(pdf_path)),
+            metadata=self.document_metadata()
+        )
+
+    def document_metadata(self):
+        return {"ocr_engine": "fake"}
+
+@pytest.fixture
+def make_ocr():
+    """Fábrica de OCR falsos por páginas (ver PagedOcr)."""
+    return PagedOcr
+
 @pytest.fixture
 def mock_storage(test_dir):
-    """Mock del servicio de almacenamiento."""
+    """Mock del servicio de almacenamiento que conserva lo guardado."""
     class MockStorage(StoragePort):
+        def __init__(self):
+            self.documents = {}
+
+        @property
+        def saved(self):
+            return list(self.documents.values())
+
         def save_document(self, document: Document) -> str:
-            path = test_dir / f"{document.id}.json"
-            return str(path)
+            path = str(test_dir / "output" / f"{document.name}.json")
+            self.documents[path] = document
+            return path
             
         def load_document(self, path: str) -> Document:
-            return Document(
-                id=fake.uuid4(),
-                pages=[
-                    Page(
-                        number=1,
-                        text=fake.text()
-                    )
-                ]
-            )
+            return self.documents[path]
     return MockStorage()
 
+class InMemoryCache(CachePort):
+    """CachePort en memoria que registra las operaciones recibidas."""
+    def __init__(self):
+        self.data = {}
+        self.calls = []
+
+    async def get(self, key):
+        self.calls.append("get")
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.calls.append("set")
+        self.data[key] = value
+        return True
+
+    async def delete(self, key):
+        self.calls.append("delete")
+        return self.data.pop(key, None) is not None
+
+    async def exists(self, key):
+        self.calls.append("exists")
+        return key in self.data
+
+    async def get_many(self, keys):
+        self.calls.append("get_many")
+        return {key: self.data[key] for key in keys if key in self.data}
+
+    async def set_many(self, items, ttl=None):
+        self.calls.append("set_many")
+        self.data.update(items)
+        return True
+
+    async def delete_matching(self, pattern, exclude_prefix=None):
+        self.calls.append("delete_matching")
+        keys = [
+            key for key in self.data
+            if fnmatch.fnmatchcase(key, pattern)
+            and not (exclude_prefix and key.startswith(exclude_prefix))
+        ]
+        for key in keys:
+            del self.data[key]
+        return len(keys)
+
+@pytest.fixture
+def memory_cache():
+    """Backend de caché en memoria."""
+    return InMemoryCache()
+
 @pytest.fixture
 def document_service(mock_ocr, mock_storage):
     """Servicio de documentos con dependencias mockeadas."""
@@ -59,11 +188,19 @@ def document_service(mock_ocr, mock_storage):
     )
 
 @pytest.fixture
-def test_app(document_service):
-    """Aplicación FastAPI para pruebas."""
+def test_app(document_service, mock_ocr, make_settings):
+    """
+    Aplicación FastAPI para pruebas.
+
+    Los proveedores se sustituyen en el contenedor: así ninguna prueba
+    construye el modelo real (que se descargaría de la red).
+    """
     app = create_app()
-    app.dependency_overrides[DocumentService] = lambda: document_service
-    return app
+    app.container.settings.override(providers.Object(make_settings()))
+    app.container.ocr_engine.override(providers.Object(mock_ocr))
+    app.container.document_service.override(providers.Object(document_service))
+    yield app
+    app.container.unwire()
 
 @pytest.fixture
 def test_client(test_app):
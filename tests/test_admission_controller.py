@@ -0,0 +1,100 @@
+"""
+Pruebas unitarias para el control de admisión.
+"""
+import pytest
+from application.admission_controller import DRAIN_TIME, QUEUE_FULL, AdmissionController
+from domain.exceptions import OverloadedError
+
+def test_idle_process_always_admits():
+    """Prueba que sin trabajo en curso se admite aunque el documento supere los límites."""
+    # Given
+    admission = AdmissionController(max_inflight_pages=10, max_wait_seconds=5)
+
+    # When
+    admission.admit(100)
+
+    # Then
+    assert admission.inflight_pages == 100
+    assert admission.inflight_requests == 1
+
+def test_rejects_when_inflight_pages_exceed_limit():
+    """Prueba que se rechaza con queue_full y el tiempo hasta vaciar el exceso."""
+    # Given
+    admission = AdmissionController(max_inflight_pages=10, max_wait_seconds=0, initial_pages_per_second=2)
+    admission.admit(8)
+
+    # When
+    with pytest.raises(OverloadedError) as error:
+        admission.admit(6)
+
+    # Then
+    assert error.value.reason == QUEUE_FULL
+    assert error.value.retry_after_seconds == 2
+    assert admission.inflight_pages == 8
+
+def test_rejects_when_drain_time_exceeds_limit():
+    """Prueba que se rechaza con drain_time si se tardaría demasiado en terminar."""
+    # Given
+    rejected = []
+    admission = AdmissionController(
+        max_inflight_pages=0,
+        max_wait_seconds=10,
+        initial_pages_per_second=1,
+        on_rejected=rejected.append
+    )
+    admission.admit(9)
+
+    # When
+    with pytest.raises(OverloadedError) as error:
+        admission.admit(5)
+
+    # Then
+    assert error.value.reason == DRAIN_TIME
+    assert error.value.retry_after_seconds == 4
+    assert rejected == [DRAIN_TIME]
+
+def test_release_updates_drain_rate(monkeypatch):
+    """Prueba que el ritmo de vaciado sigue al rendimiento observado."""
+    # Given
+    clock = iter([0.0, 2.0])
+    monkeypatch.setattr("application.admission_controller.time.monotonic", lambda: next(clock))
+    admission = AdmissionController(initial_pages_per_second=1, smoothing=0.5)
+    admission.admit(10)
+
+    # When: 10 páginas en 2 segundos
+    admission.release(10)
+
+    # Then
+    assert admission.drain_rate == pytest.approx(0.5 * 5 + 0.5 * 1)
+    assert admission.inflight_pages == 0
+    assert admission.estimated_wait == 0
+
+def test_failed_work_does_not_count_for_drain_rate():
+    """Prueba que un fallo rápido no infla el ritmo estimado."""
+    # Given
+    admission = AdmissionController(initial_pages_per_second=1)
+    admission.admit(50)
+
+    # When
+    admission.release(50, processed=False)
+
+    # Then
+    assert admission.drain_rate == 1
+
+def test_updates_are_published():
+    """Prueba que cada cambio se publica (ej: para los gauges)."""
+    # Given
+    snapshots = []
+    admission = AdmissionController(
+        initial_pages_per_second=2,
+        on_update=lambda controller: snapshots.append(
+            (controller.inflight_pages, controller.estimated_wait)
+        )
+    )
+
+    # When
+    admission.admit(4)
+    admission.admit(2)
+
+    # Then
+    assert snapshots == [(4, 2.0), (6, 3.0)]
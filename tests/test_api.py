@@ -17,7 +17,7 @@ def test_process_single_document(test_client, sample_pdf):
         # Then
         assert response.status_code == status.HTTP_200_OK
         result = response.json()
-        assert "id" in result
+        assert "storage_path" in result
         assert "text" in result
         assert "processed_at" in result
         assert result["original_name"] == "test.pdf"
@@ -0,0 +1,156 @@
+"""
+Pruebas de la aplicación FastAPI: arranque y sondas de salud.
+"""
+import threading
+import pytest
+from dependency_injector import providers
+from fastapi import status
+from fastapi.testclient import TestClient
+from application.admission_controller import AdmissionController
+from application.document_service import DocumentService
+from interfaces.api.app import create_app
+
+class FakeEngine:
+    """Motor OCR falso; su calentamiento espera a ``release``."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.release.set()
+
+    def warmup(self):
+        self.release.wait(5)
+
+@pytest.fixture
+def engine():
+    return FakeEngine()
+
+@pytest.fixture
+def app(engine, make_settings):
+    app = create_app()
+    app.container.settings.override(providers.Object(make_settings()))
+    app.container.ocr_engine.override(providers.Object(engine))
+    yield app
+    engine.release.set()
+    app.container.unwire()
+
+@pytest.fixture
+def documents(app, make_ocr, mock_storage):
+    """Servicio de documentos con OCR de dos páginas y almacenamiento falso."""
+    service = DocumentService(ocr=make_ocr(pages=2), storage=mock_storage)
+    app.container.document_service.override(providers.Object(service))
+    return service
+
+def wait_ready(client, timeout=5.0):
+    for _ in range(int(timeout / 0.01)):
+        response = client.get("/ready")
+        if response.status_code == status.HTTP_200_OK:
+            return response
+        threading.Event().wait(0.01)
+    raise AssertionError("la aplicación no quedó lista")
+
+def test_health_answers_before_the_model_is_ready(app, engine):
+    """Prueba que /health responde y /ready devuelve 503 mientras se calienta el modelo."""
+    # Given
+    engine.release.clear()
+
+    with TestClient(app) as client:
+        # When
+        health = client.get("/health")
+        ready = client.get("/ready")
+
+        # Then
+        assert health.status_code == status.HTTP_200_OK
+        assert health.json()["status"] == "healthy"
+        assert ready.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert ready.json()["status"] == "starting"
+        engine.release.set()
+
+def test_ready_after_warmup(app, engine):
+    """Prueba que /ready pasa a 200 cuando termina el calentamiento."""
+    with TestClient(app) as client:
+        assert wait_ready(client).json() == {"status": "ready"}
+
+@pytest.fixture
+def busy_admission(app, documents):
+    """Control de admisión con una página ya en curso y capacidad para una."""
+    admission = AdmissionController(max_inflight_pages=1, max_wait_seconds=0)
+    admission.admit(1)
+    app.container.admission_controller.override(providers.Object(admission))
+    return admission
+
+def test_overloaded_upload_gets_429_with_retry_after(app, busy_admission, tmp_path):
+    """Prueba que un rechazo por páginas en curso responde 429 con Retry-After."""
+    with TestClient(app) as client:
+        # When
+        response = client.post(
+            "/api/v1/documents",
+            files={"file": ("doc.pdf", b"%PDF-1.7\n", "application/pdf")}
+        )
+
+        # Then
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response.headers["Retry-After"] == "1"
+        assert response.json()["error_code"] == "queue_full"
+        assert busy_admission.inflight_requests == 1
+        assert list((tmp_path / "tmp").iterdir()) == []
+
+def test_slow_drain_gets_503_with_retry_after(app, documents):
+    """Prueba que un rechazo por tiempo de vaciado responde 503 con Retry-After."""
+    # Given: 10 páginas en curso a 1 página/s con un máximo de 5 s de espera
+    admission = AdmissionController(max_inflight_pages=0, max_wait_seconds=5)
+    admission.admit(10)
+    app.container.admission_controller.override(providers.Object(admission))
+
+    with TestClient(app) as client:
+        # When
+        response = client.post(
+            "/api/v1/documents/stream",
+            files={"file": ("doc.pdf", b"%PDF-1.7\n", "application/pdf")}
+        )
+
+        # Then
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers["Retry-After"] == "6"
+
+def test_upload_returns_the_processed_document(app, documents, mock_storage):
+    """Prueba que subir un documento devuelve su texto, páginas y ubicación."""
+    with TestClient(app) as client:
+        # When
+        response = client.post(
+            "/api/v1/documents",
+            files={"file": ("doc.pdf", b"%PDF-1.7\n", "application/pdf")}
+        )
+
+        # Then
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert body["original_name"] == "doc.pdf"
+        assert body["text"] == "página 1\n\npágina 2"
+        assert body["page_count"] == 2
+        assert body["word_count"] == 4
+        assert body["storage_path"] in mock_storage.documents
+        assert body["processing_time"] >= 0
+
+@pytest.mark.parametrize("fail_at, counted", [(None, True), (1, False)])
+def test_batch_counts_for_drain_rate_only_if_something_was_processed(
+    app, make_ocr, mock_storage, fail_at, counted
+):
+    """Prueba que un lote en el que falla todo no altera el ritmo de vaciado estimado."""
+    # Given
+    admission = AdmissionController(initial_pages_per_second=1000.0, smoothing=1.0)
+    app.container.admission_controller.override(providers.Object(admission))
+    app.container.document_service.override(providers.Object(
+        DocumentService(ocr=make_ocr(fail_at=fail_at), storage=mock_storage)
+    ))
+
+    with TestClient(app) as client:
+        # When
+        response = client.post(
+            "/api/v1/documents/batch",
+            files=[("files", (f"doc{n}.pdf", f"%PDF-1.7\n{n}".encode(), "application/pdf")) for n in range(2)]
+        )
+
+        # Then
+        assert response.status_code == status.HTTP_200_OK
+        assert (admission.drain_rate != 1000.0) == counted
+        assert admission.inflight_requests == 0
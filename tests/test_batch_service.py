@@ -0,0 +1,100 @@
+"""
+Pruebas unitarias para el procesamiento por lotes.
+"""
+import asyncio
+import pytest
+from application.batch_service import BatchService
+from domain.models import Document, Page
+
+pytestmark = pytest.mark.asyncio
+
+class FakeDocumentService:
+    """Servicio falso que mide cuántos documentos se procesan a la vez."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.active = 0
+        self.max_active = 0
+        self.hashes = []
+
+    async def process_one(self, path, content_hash=None):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        self.hashes.append(content_hash)
+        try:
+            await asyncio.sleep(0.01)
+            if path in self.failing:
+                raise ValueError(f"{path} corrupto")
+            return Document(
+                name=path,
+                pages=[Page(number=1, raw_text="texto")],
+                metadata={"storage_path": f"output/{path}"}
+            )
+        finally:
+            self.active -= 1
+
+async def test_batch_runs_with_bounded_concurrency():
+    """Prueba que el lote procesa varios documentos a la vez sin superar el límite."""
+    # Given
+    documents = FakeDocumentService()
+    service = BatchService(documents, concurrency=3)
+
+    # When
+    result = await service.process_batch([f"doc{i}.pdf" for i in range(10)])
+
+    # Then
+    assert documents.max_active == 3
+    assert result.processed_documents == 10
+    assert [item.path for item in result.results] == [f"doc{i}.pdf" for i in range(10)]
+    assert result.results[0].storage_path == "output/doc0.pdf"
+
+async def test_batch_records_each_failure():
+    """Prueba que cada fallo queda registrado sin detener el resto del lote."""
+    # Given
+    service = BatchService(FakeDocumentService(failing={"b.pdf"}), concurrency=2)
+
+    # When
+    result = await service.process_batch(["a.pdf", "b.pdf", "c.pdf"])
+
+    # Then
+    assert result.processed_documents == 2
+    assert result.failed_documents == 1
+    [error] = result.errors
+    assert error.path == "b.pdf"
+    assert error.error_type == "ValueError"
+    assert "corrupto" in error.error
+
+async def test_batch_reports_live_progress():
+    """Prueba que el progreso se notifica tras cada documento."""
+    # Given
+    service = BatchService(FakeDocumentService(failing={"b.pdf"}), concurrency=1)
+    snapshots = []
+
+    # When
+    await service.process_batch(
+        ["a.pdf", "b.pdf", "c.pdf"],
+        on_progress=lambda progress, item: snapshots.append(
+            (item.path, progress.processed, progress.failed, progress.remaining)
+        )
+    )
+
+    # Then
+    assert snapshots == [("a.pdf", 1, 0, 2), ("b.pdf", 1, 1, 1), ("c.pdf", 2, 1, 0)]
+
+async def test_batch_passes_content_hashes():
+    """Prueba que los hashes calculados al subir llegan al servicio de documentos."""
+    # Given
+    documents = FakeDocumentService()
+    service = BatchService(documents, concurrency=1)
+
+    # When
+    await service.process_batch(["a.pdf", "b.pdf"], content_hashes=["h1", "h2"])
+
+    # Then
+    assert documents.hashes == ["h1", "h2"]
+
+async def test_empty_batch():
+    """Prueba que un lote vacío termina sin documentos."""
+    result = await BatchService(FakeDocumentService()).process_batch([])
+    assert result.total_documents == 0
+    assert result.results == []
@@ -0,0 +1,53 @@
+"""
+Pruebas unitarias para la codificación de valores de caché.
+"""
+import json
+from infrastructure.cache_codec import CacheCodec
+
+def test_roundtrip_small_value_is_not_compressed():
+    """Prueba que los valores pequeños se guardan sin comprimir."""
+    # Given
+    codec = CacheCodec(compress_threshold=1024)
+    value = {"name": "a.pdf", "pages": [1, 2]}
+
+    # When
+    raw = codec.encode(value)
+
+    # Then
+    assert raw[0] == CacheCodec.VERSION
+    assert not raw[1] & CacheCodec.FLAG_COMPRESSED
+    assert codec.decode(raw) == value
+
+def test_large_values_are_compressed():
+    """Prueba que los valores grandes se comprimen y se recuperan intactos."""
+    # Given
+    codec = CacheCodec(compress_threshold=64)
+    value = {"text": "lorem ipsum " * 500}
+
+    # When
+    raw = codec.encode(value)
+
+    # Then
+    assert raw[1] & CacheCodec.FLAG_COMPRESSED
+    assert len(raw) < len(json.dumps(value))
+    assert codec.decode(raw) == value
+
+def test_json_codec_without_msgpack():
+    """Prueba el formato JSON compacto cuando no se usa msgpack."""
+    # Given
+    codec = CacheCodec(use_msgpack=False)
+
+    # When
+    raw = codec.encode(["a", 1])
+
+    # Then
+    assert not raw[1] & CacheCodec.FLAG_MSGPACK
+    assert codec.decode(raw) == ["a", 1]
+
+def test_legacy_plain_json_is_still_readable():
+    """Prueba que se leen valores escritos como JSON plano."""
+    # Given
+    codec = CacheCodec()
+
+    # When/Then
+    assert codec.decode(json.dumps({"name": "a.pdf"}).encode()) == {"name": "a.pdf"}
@@ -0,0 +1,103 @@
+"""
+Pruebas unitarias para el circuit breaker.
+"""
+import asyncio
+import pytest
+from infrastructure.circuit_breaker import CircuitBreaker
+from infrastructure.redis_cache import RedisCache
+
+class HangingRedis:
+    """Cliente de Redis falso cuyas llamadas no terminan nunca."""
+    async def get(self, key):
+        await asyncio.Event().wait()
+
+class FakeClock:
+    """Reloj controlado manualmente."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_opens_after_consecutive_failures():
+    """Prueba que el circuito se abre al alcanzar el umbral de fallos."""
+    # Given
+    breaker = CircuitBreaker("test", failure_threshold=3, clock=FakeClock())
+
+    # When
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+
+    # Then
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+def test_success_resets_failure_count():
+    """Prueba que un éxito reinicia la cuenta de fallos."""
+    # Given
+    breaker = CircuitBreaker("test", failure_threshold=2, clock=FakeClock())
+
+    # When
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    # Then
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_half_open_allows_a_single_trial():
+    """Prueba que tras el enfriamiento se permite una única llamada de prueba."""
+    # Given
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+
+    # When
+    clock.now = 10
+
+    # Then
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+def test_failed_trial_reopens_and_successful_trial_closes():
+    """Prueba las transiciones desde half_open."""
+    # Given
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+    breaker.allow()
+
+    # When
+    breaker.record_failure()
+
+    # Then
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_does_not_jam_the_breaker():
+    """Prueba que cancelar la llamada de prueba deja al circuito admitir otra."""
+    # Given
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10, clock=clock)
+    cache = RedisCache("redis://localhost:6379/0", timeout=60, breaker=breaker)
+    cache.client = HangingRedis()
+    breaker.record_failure()
+    clock.now = 10
+
+    # When
+    trial = asyncio.create_task(cache.get("doc"))
+    await asyncio.sleep(0)
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    # Then
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
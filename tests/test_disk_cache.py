@@ -0,0 +1,132 @@
+"""
+Pruebas unitarias para el caché persistente en disco.
+"""
+import sqlite3
+import time
+from datetime import timedelta
+import pytest
+from infrastructure.disk_cache import DiskCache
+
+pytestmark = pytest.mark.asyncio
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    return DiskCache(tmp_path / "cache.db")
+
+async def test_roundtrip_and_delete(disk_cache):
+    """Prueba que los valores se guardan, se leen y se borran."""
+    # When
+    await disk_cache.set("doc", {"name": "a.pdf", "pages": [1, 2]})
+
+    # Then
+    assert await disk_cache.get("doc") == {"name": "a.pdf", "pages": [1, 2]}
+    assert await disk_cache.exists("doc")
+    assert await disk_cache.delete("doc")
+    assert await disk_cache.get("doc") is None
+
+async def test_bulk_operations(disk_cache):
+    """Prueba que get_many devuelve solo las claves presentes."""
+    # Given
+    await disk_cache.set_many({"a": "uno", "b": "dos"})
+
+    # When
+    found = await disk_cache.get_many(["a", "b", "c"])
+
+    # Then
+    assert found == {"a": "uno", "b": "dos"}
+
+async def test_entries_expire(disk_cache):
+    """Prueba que las entradas caducadas se tratan como ausentes."""
+    # Given
+    await disk_cache.set("doc", "texto", ttl=timedelta(seconds=-1))
+
+    # Then
+    assert await disk_cache.get("doc") is None
+    assert not await disk_cache.exists("doc")
+
+async def test_evicts_least_recently_used(tmp_path):
+    """Prueba que se expulsan las entradas menos usadas al superar el tamaño."""
+    # Given
+    cache = DiskCache(tmp_path / "cache.db", max_bytes=250)
+    await cache.set("a", "x" * 100)
+    await cache.set("b", "x" * 100)
+    await cache.get("a")
+
+    # When
+    await cache.set("c", "x" * 100)
+
+    # Then
+    assert await cache.exists("a")
+    assert not await cache.exists("b")
+    assert await cache.exists("c")
+
+async def test_entries_are_shared_between_instances(tmp_path):
+    """Prueba que otra instancia (otro proceso) ve las mismas entradas."""
+    # Given
+    writer = DiskCache(tmp_path / "cache.db")
+    reader = DiskCache(tmp_path / "cache.db")
+
+    # When
+    await writer.set("doc", "texto")
+
+    # Then
+    assert await reader.get("doc") == "texto"
+
+async def test_delete_matching_keeps_excluded_prefix(disk_cache):
+    """Prueba que la purga conserva las claves de la configuración actual."""
+    # Given
+    await disk_cache.set_many({
+        "ocr:document:old:1": "a",
+        "ocr:document:new:1": "b",
+        "ocr:page:1": "c"
+    })
+
+    # When
+    deleted = await disk_cache.delete_matching("ocr:document:*", exclude_prefix="ocr:document:new:")
+
+    # Then
+    assert deleted == 1
+    assert await disk_cache.get_many(["ocr:document:old:1", "ocr:document:new:1", "ocr:page:1"]) == {
+        "ocr:document:new:1": "b",
+        "ocr:page:1": "c"
+    }
+
+async def test_sqlite_errors_are_cache_misses(disk_cache, monkeypatch):
+    """Prueba que un error de SQLite se trata como fallo de caché y no se propaga."""
+    # Given
+    await disk_cache.set("doc", "texto")
+
+    def broken():
+        raise sqlite3.OperationalError("database disk image is malformed")
+
+    monkeypatch.setattr(disk_cache, "_connection", broken)
+
+    # Then
+    assert await disk_cache.get("doc") is None
+    assert await disk_cache.get_many(["doc"]) == {}
+    assert not await disk_cache.exists("doc")
+    assert not await disk_cache.set("otro", "texto")
+    assert not await disk_cache.delete("doc")
+    assert await disk_cache.delete_matching("*") == 0
+
+async def test_read_does_not_wait_for_writer_lock(tmp_path):
+    """Prueba que una lectura no espera al bloqueo de otro escritor para actualizar el LRU."""
+    # Given
+    cache = DiskCache(tmp_path / "cache.db", busy_timeout=5.0)
+    await cache.set("doc", "texto")
+    writer = sqlite3.connect(tmp_path / "cache.db", isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+
+    try:
+        # When
+        started = time.monotonic()
+        value = await cache.get("doc")
+        elapsed = time.monotonic() - started
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+
+    # Then
+    assert value == "texto"
+    assert elapsed < 1.0
+    assert await cache.set("otro", "texto")
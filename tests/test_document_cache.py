@@ -0,0 +1,77 @@
+"""
+Pruebas unitarias para las claves de caché de documentos y su purga.
+"""
+import pytest
+from application.document_service import DocumentService
+from domain.cache_keys import document_cache_key, file_content_hash
+
+pytestmark = pytest.mark.asyncio
+
+async def test_same_content_under_another_name_hits_the_cache(tmp_path, make_ocr, mock_storage, memory_cache):
+    """Prueba que la clave depende del contenido y no del nombre del archivo."""
+    # Given
+    ocr = make_ocr()
+    service = DocumentService(ocr=ocr, storage=mock_storage, cache=memory_cache, config_fingerprint="cfg")
+    first = tmp_path / "factura.pdf"
+    second = tmp_path / "copia.pdf"
+    first.write_bytes(b"%PDF-1.7\nmismo contenido")
+    second.write_bytes(b"%PDF-1.7\nmismo contenido")
+
+    # When
+    await service.process_one(str(first))
+    await service.process_one(str(second))
+
+    # Then
+    assert ocr.calls == 1
+    assert list(memory_cache.data) == [document_cache_key(file_content_hash(first), "cfg")]
+
+async def test_upload_hash_matches_the_file_hash(sample_pdf, make_ocr, mock_storage, memory_cache):
+    """Prueba que el hash calculado al subir reutiliza la entrada del archivo."""
+    # Given
+    ocr = make_ocr()
+    service = DocumentService(ocr=ocr, storage=mock_storage, cache=memory_cache, config_fingerprint="cfg")
+    await service.process_one(str(sample_pdf))
+
+    # When
+    await service.process_one(str(sample_pdf), content_hash=file_content_hash(sample_pdf))
+
+    # Then
+    assert ocr.calls == 1
+
+async def test_purge_keeps_only_the_current_configuration(make_ocr, mock_storage, memory_cache):
+    """Prueba que la purga borra los documentos de otras configuraciones y nada más."""
+    # Given
+    memory_cache.data = {
+        document_cache_key("a", "old"): {},
+        document_cache_key("b", "old"): {},
+        document_cache_key("a", "new"): {},
+        "ocr:page:old:1": "texto"
+    }
+    service = DocumentService(ocr=make_ocr(), storage=mock_storage, cache=memory_cache, config_fingerprint="new")
+
+    # When
+    purged = await service.purge_stale_cache()
+
+    # Then
+    assert purged == 2
+    assert set(memory_cache.data) == {document_cache_key("a", "new"), "ocr:page:old:1"}
+
+async def test_purge_without_cache(make_ocr, mock_storage):
+    """Prueba que sin caché no hay nada que purgar."""
+    service = DocumentService(ocr=make_ocr(), storage=mock_storage)
+    assert await service.purge_stale_cache() == 0
+
+@pytest.mark.parametrize("overrides", [
+    {"skip_blank_pages": False},
+    {"blank_page_ink_ratio": 0.01},
+    {"num_beams": 2},
+    {"pdf_dpi": 300},
+])
+async def test_output_settings_change_the_fingerprint(make_settings, overrides):
+    """Prueba que cada ajuste que altera el texto extraído cambia la huella."""
+    assert make_settings(**overrides).ocr_fingerprint() != make_settings().ocr_fingerprint()
+
+async def test_runtime_settings_keep_the_fingerprint(make_settings):
+    """Prueba que los ajustes de rendimiento no invalidan el caché."""
+    assert make_settings(num_threads=1, replica_count=2).ocr_fingerprint() == \
+        make_settings().ocr_fingerprint()
@@ -0,0 +1,143 @@
+"""
+Pruebas unitarias para la decodificación adaptativa del adaptador Donut.
+"""
+import math
+from types import SimpleNamespace
+import pytest
+import torch
+from transformers.modeling_outputs import BaseModelOutput
+from infrastructure import donut_adapter
+from infrastructure.donut_adapter import DonutAdapter
+
+PROMPT = [1, 2]
+PAD, EOS, WORD, FIXED = 0, 3, 4, 5
+WORDS = {WORD: "palabra", FIXED: "corregida"}
+
+# Tipo de página codificado en pixel_values: (tokens generados, probabilidad por token)
+CLEAR = 0.0
+DOUBTFUL = 1.0
+PADDED = 2.0
+SHORT = 3.0
+GREEDY_OUTPUT = {
+    CLEAR: ([WORD] * 6 + [EOS], 0.95),
+    DOUBTFUL: ([WORD] * 6 + [EOS], 0.3),
+    PADDED: ([WORD] * 5 + [EOS], 0.9),
+    SHORT: ([WORD] * 2 + [EOS], 0.95),
+}
+
+class FakeTokenizer:
+    pad_token_id = PAD
+    eos_token_id = EOS
+
+    def __call__(self, text, return_tensors=None):
+        return SimpleNamespace(input_ids=torch.tensor([PROMPT]))
+
+class FakeProcessor:
+    """Procesador falso: cada token de texto es una palabra."""
+    tokenizer = FakeTokenizer()
+
+    @classmethod
+    def from_pretrained(cls, name):
+        return cls()
+
+    def batch_decode(self, sequences, skip_special_tokens=True):
+        return [
+            " ".join(WORDS[token] for token in row.tolist() if token in WORDS)
+            for row in sequences
+        ]
+
+class FakeModel:
+    """Modelo falso: el encoder pasa pixel_values y generate sigue GREEDY_OUTPUT."""
+
+    def __init__(self):
+        self.calls = []
+
+    def to(self, device):
+        return self
+
+    def encoder(self, pixel_values):
+        return BaseModelOutput(last_hidden_state=pixel_values)
+
+    def generate(self, encoder_outputs, decoder_input_ids, num_beams, **kwargs):
+        kinds = encoder_outputs.last_hidden_state[:, 0].tolist()
+        self.calls.append((num_beams, kinds))
+        if num_beams > 1:
+            rows = [[FIXED] * 6 + [EOS] for _ in kinds]
+            return SimpleNamespace(sequences=self._sequences(rows), scores=None)
+
+        rows = [GREEDY_OUTPUT[kind][0] for kind in kinds]
+        width = max(len(row) for row in rows)
+        log_probs = torch.full((len(rows), width), -math.inf)
+        for idx, kind in enumerate(kinds):
+            log_probs[idx, :len(rows[idx])] = math.log(GREEDY_OUTPUT[kind][1])
+        self._log_probs = log_probs
+        return SimpleNamespace(sequences=self._sequences(rows), scores=())
+
+    def compute_transition_scores(self, sequences, scores, normalize_logits=True):
+        # Como en transformers, las posiciones de relleno quedan a -inf
+        return self._log_probs
+
+    @staticmethod
+    def _sequences(rows):
+        width = max(len(row) for row in rows)
+        return torch.tensor([PROMPT + row + [PAD] * (width - len(row)) for row in rows])
+
+@pytest.fixture
+def model():
+    return FakeModel()
+
+@pytest.fixture
+def adapter(model, make_settings, monkeypatch):
+    monkeypatch.setattr(donut_adapter, "DonutProcessor", FakeProcessor)
+    monkeypatch.setattr(donut_adapter, "load_donut_model", lambda *args, **kwargs: model)
+    settings = make_settings(num_beams=4, adaptive_decoding=True, micro_batching=False)
+    return DonutAdapter(settings)
+
+def pages(*kinds):
+    return torch.tensor([[kind] for kind in kinds])
+
+def test_only_low_confidence_pages_escalate_to_beams(adapter, model):
+    """Prueba que solo las páginas de baja confianza se decodifican de nuevo con beams."""
+    # When
+    texts = adapter.infer(pages(CLEAR, DOUBTFUL, CLEAR))
+
+    # Then
+    assert texts == [" ".join(["palabra"] * 6), " ".join(["corregida"] * 6), " ".join(["palabra"] * 6)]
+    assert model.calls == [(1, [CLEAR, DOUBTFUL, CLEAR]), (4, [DOUBTFUL])]
+
+def test_confident_batch_skips_beam_search(adapter, model):
+    """Prueba que un lote con buena confianza no ejecuta beam search."""
+    adapter.infer(pages(CLEAR, CLEAR))
+    assert [num_beams for num_beams, _ in model.calls] == [1]
+
+def test_short_confident_page_skips_beam_search(adapter, model):
+    """Prueba que una página con pocas palabras pero buena confianza no escala a beams."""
+    # When
+    texts = adapter.infer(pages(SHORT))
+
+    # Then
+    assert texts == ["palabra palabra"]
+    assert model.calls == [(1, [SHORT])]
+
+def test_padding_does_not_lower_confidence(adapter, model):
+    """Prueba que el relleno de las secuencias cortas se excluye de la confianza."""
+    # When
+    _, confidences = adapter._decode(
+        BaseModelOutput(last_hidden_state=pages(CLEAR, PADDED)), 1, 20
+    )
+
+    # Then
+    assert confidences == pytest.approx([0.95, 0.9])
+    adapter.infer(pages(CLEAR, PADDED))
+    assert [num_beams for num_beams, _ in model.calls] == [1, 1]
+
+def test_fixed_beams_without_adaptive_decoding(adapter, model):
+    """Prueba que sin decodificación adaptativa se usa beam search directamente."""
+    # Given
+    adapter.settings.adaptive_decoding = False
+
+    # When
+    adapter.infer(pages(CLEAR))
+
+    # Then
+    assert model.calls == [(4, [CLEAR])]
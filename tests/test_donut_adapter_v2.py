@@ -0,0 +1,109 @@
+"""
+Pruebas unitarias para la decodificación con varios prompts del adaptador Donut v2.
+"""
+from types import SimpleNamespace
+import pytest
+import torch
+from transformers.modeling_outputs import BaseModelOutput
+from infrastructure import donut_adapter_v2
+from infrastructure.donut_adapter_v2 import ImprovedDonutAdapter
+
+# Token que identifica cada prompt y longitud de su tokenización
+PROMPT_TOKENS = {"What is the text": (10, 5), "table": (20, 3), "form": (30, 4)}
+
+class FakeTokenizer:
+    pad_token_id = 0
+    eos_token_id = 1
+
+    def __call__(self, prompt, return_tensors=None, add_special_tokens=True):
+        for marker, (token, length) in PROMPT_TOKENS.items():
+            if marker in prompt:
+                return SimpleNamespace(input_ids=torch.tensor([[token] * length]))
+        raise AssertionError(prompt)
+
+class FakeProcessor:
+    """Procesador falso: cada secuencia se decodifica como el token de su prompt."""
+    tokenizer = FakeTokenizer()
+
+    @classmethod
+    def from_pretrained(cls, name):
+        return cls()
+
+    def batch_decode(self, sequences, skip_special_tokens=True):
+        return [f"texto {row[0]}" for row in sequences.tolist()]
+
+class FakeModel:
+    """Modelo falso que registra los prompts de cada llamada a generate."""
+
+    def __init__(self):
+        self.encoded = 0
+        self.generated = []
+        self.masks = []
+
+    def to(self, device):
+        return self
+
+    def encoder(self, pixel_values):
+        self.encoded += 1
+        return BaseModelOutput(last_hidden_state=torch.zeros(1, 2, 1))
+
+    def generate(self, encoder_outputs, decoder_input_ids, decoder_attention_mask, **kwargs):
+        assert encoder_outputs.last_hidden_state.shape[0] == decoder_input_ids.shape[0]
+        self.generated.append(decoder_input_ids[:, 0].tolist())
+        self.masks.append(decoder_attention_mask.sum(dim=1).tolist())
+        return decoder_input_ids
+
+@pytest.fixture
+def model():
+    return FakeModel()
+
+@pytest.fixture
+def adapter(model, make_settings, monkeypatch):
+    monkeypatch.setattr(donut_adapter_v2, "DonutProcessor", FakeProcessor)
+    monkeypatch.setattr(donut_adapter_v2, "load_donut_model", lambda *args, **kwargs: model)
+    return ImprovedDonutAdapter(make_settings())
+
+def test_all_prompts_share_a_single_generate_call(adapter, model):
+    """Prueba que la página se codifica una vez y los prompts de distinta longitud se decodifican juntos."""
+    # When
+    texts = adapter.extract_text_multi(torch.zeros(3, 4, 4), ["general", "table", "form"])
+
+    # Then
+    assert texts == {"general": "texto 10", "table": "texto 20", "form": "texto 30"}
+    assert model.encoded == 1
+    assert model.generated == [[10, 20, 30]]
+    assert model.masks == [[5, 3, 4]]
+
+def test_unknown_document_type_uses_general_prompt(adapter, model):
+    """Prueba que un tipo desconocido se resuelve con el prompt general, como en extract_text."""
+    # When
+    texts = adapter.extract_text_multi(torch.zeros(3, 4, 4), ["invoice", "general"])
+
+    # Then
+    assert texts == {"invoice": "texto 10", "general": "texto 10"}
+    assert model.generated == [[10]]
+    assert adapter.extract_text(torch.zeros(3, 4, 4), document_type="invoice") == "texto 10"
+
+class FakeRasterizer:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def iter_pages(self, pdf_path):
+        return iter(torch.zeros(3, 4, 4) for _ in range(self.pages))
+
+    def page_count(self, pdf_path):
+        return self.pages
+
+def test_pdf_pages_use_the_general_prompt(adapter, model, tmp_path):
+    """Prueba que process_pdf extrae cada página con el prompt general e informa del progreso."""
+    # Given
+    adapter.rasterizer = FakeRasterizer(pages=2)
+    progress = []
+
+    # When
+    document = adapter.process_pdf(tmp_path / "doc.pdf", progress=lambda done, total: progress.append((done, total)))
+
+    # Then
+    assert [(page.number, page.raw_text) for page in document.pages] == [(1, "texto 10"), (2, "texto 10")]
+    assert progress == [(1, 2), (2, 2)]
+    assert document.metadata["ocr_engine"] == "donut_v2"
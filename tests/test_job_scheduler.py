@@ -0,0 +1,64 @@
+"""
+Pruebas unitarias para la planificación de trabajos por coste.
+"""
+import pytest
+from application.job_scheduler import CostAwareScheduler
+from domain.models import Job
+from infrastructure.memory_job_queue import InMemoryJobQueue
+
+def make_job(cost, created_at, client_id=None):
+    return Job(path="doc.pdf", cost=cost, created_at=created_at, client_id=client_id)
+
+def test_short_job_overtakes_long_job():
+    """Prueba que una factura de una página sale antes que un PDF grande previo."""
+    # Given
+    scheduler = CostAwareScheduler(seconds_per_page=2.0)
+    big = make_job(cost=500, created_at=1000.0)
+    small = make_job(cost=1, created_at=1010.0)
+
+    # Then
+    assert scheduler.priority(small) < scheduler.priority(big)
+
+def test_long_job_ages_past_new_arrivals():
+    """Prueba que un trabajo grande que ya esperó su retraso no sufre inanición."""
+    # Given
+    scheduler = CostAwareScheduler(seconds_per_page=2.0)
+    big = make_job(cost=500, created_at=1000.0)
+    late_small = make_job(cost=1, created_at=1000.0 + 500 * 2.0)
+
+    # Then
+    assert scheduler.priority(big) < scheduler.priority(late_small)
+
+def test_client_weight_scales_cost():
+    """Prueba que un cliente con más peso ve sus trabajos como más baratos."""
+    # Given
+    scheduler = CostAwareScheduler(seconds_per_page=1.0, client_weights={"premium": 2.0})
+
+    # When
+    premium = scheduler.priority(make_job(cost=10, created_at=0.0, client_id="premium"))
+    regular = scheduler.priority(make_job(cost=10, created_at=0.0, client_id="otro"))
+
+    # Then
+    assert premium == 5.0
+    assert regular == 10.0
+
+def test_zero_delay_is_fifo():
+    """Prueba que sin retraso por página el orden es el de llegada."""
+    scheduler = CostAwareScheduler(seconds_per_page=0)
+    assert scheduler.priority(make_job(cost=500, created_at=1.0)) == 1.0
+
+@pytest.mark.asyncio
+async def test_memory_queue_pops_lowest_priority_first():
+    """Prueba que la cola en memoria entrega por prioridad y, a igualdad, FIFO."""
+    # Given
+    queue = InMemoryJobQueue()
+    jobs = [Job(path=name, priority=priority) for name, priority in [("a", 3.0), ("b", 1.0), ("c", 1.0)]]
+    for job in jobs:
+        await queue.enqueue(job)
+
+    # When
+    order = [(await queue.dequeue(timeout=0.1)).path for _ in jobs]
+
+    # Then
+    assert order == ["b", "c", "a"]
+    assert await queue.dequeue(timeout=0.01) is None
@@ -0,0 +1,142 @@
+"""
+Pruebas unitarias para los trabajos de OCR asíncronos.
+"""
+import asyncio
+import pytest
+from application.admission_controller import AdmissionController
+from application.job_service import JobService
+from domain.exceptions import OverloadedError
+from domain.models import Document, Job, JobStatus, Page
+from infrastructure.memory_job_queue import InMemoryJobQueue
+
+pytestmark = pytest.mark.asyncio
+
+class FakeDocumentService:
+    """Servicio falso que informa del progreso página a página."""
+
+    def __init__(self, pages=3, error=None):
+        self.pages = pages
+        self.error = error
+
+    async def process_one(self, path, content_hash=None, progress=None):
+        for done in range(1, self.pages + 1):
+            await asyncio.sleep(0)
+            if progress:
+                progress(done, self.pages)
+        if self.error:
+            raise self.error
+        return Document(
+            name="doc.pdf",
+            pages=[Page(number=n, raw_text="texto") for n in range(1, self.pages + 1)],
+            metadata={}
+        )
+
+async def wait_finished(service, job_id, timeout=2.0):
+    for _ in range(int(timeout / 0.01)):
+        job = await service.get(job_id)
+        if job.finished:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError("el trabajo no terminó")
+
+async def test_job_is_processed_in_background():
+    """Prueba que un trabajo encolado se procesa y guarda progreso y resultado."""
+    # Given
+    service = JobService(InMemoryJobQueue(), lambda: FakeDocumentService(pages=3), poll_seconds=0.01)
+    service.start()
+
+    try:
+        # When
+        job = await service.submit("doc.pdf")
+        finished = await wait_finished(service, job.id)
+    finally:
+        await service.stop()
+
+    # Then
+    assert job.status == JobStatus.DONE
+    assert finished.pages_done == finished.pages_total == 3
+    assert finished.result["name"] == "doc.pdf"
+    assert finished.started_at >= finished.created_at
+
+async def test_failed_job_records_error():
+    """Prueba que un fallo del OCR deja el trabajo como fallido con su motivo."""
+    # Given
+    service = JobService(
+        InMemoryJobQueue(),
+        lambda: FakeDocumentService(error=ValueError("PDF corrupto")),
+        poll_seconds=0.01
+    )
+    service.start()
+
+    try:
+        # When
+        job = await service.submit("doc.pdf")
+        finished = await wait_finished(service, job.id)
+    finally:
+        await service.stop()
+
+    # Then
+    assert finished.status == JobStatus.FAILED
+    assert finished.error == "PDF corrupto"
+    assert finished.result is None
+
+async def test_temporary_upload_is_removed(tmp_path):
+    """Prueba que el archivo de una subida temporal se elimina al terminar."""
+    # Given
+    upload = tmp_path / "upload.pdf"
+    upload.write_bytes(b"%PDF-1.7\n")
+    service = JobService(InMemoryJobQueue(), FakeDocumentService)
+
+    # When
+    job = await service.run(Job(path=str(upload), cleanup=True), FakeDocumentService())
+
+    # Then
+    assert job.status == JobStatus.DONE
+    assert not upload.exists()
+
+async def test_redis_queue_roundtrip():
+    """Prueba la cola de Redis contra fakeredis."""
+    fakeredis = pytest.importorskip("fakeredis.aioredis")
+    from infrastructure.redis_job_queue import RedisJobQueue
+
+    # Given
+    queue = RedisJobQueue("redis://localhost:6379/0")
+    queue.client = fakeredis.FakeRedis()
+    job = Job(path="doc.pdf", client_id="cliente")
+
+    # When
+    await queue.enqueue(job)
+    taken = await queue.dequeue(timeout=0.1)
+    taken.status = JobStatus.RUNNING
+    await queue.update(taken)
+
+    # Then
+    assert taken.id == job.id
+    assert (await queue.get(job.id)).status == JobStatus.RUNNING
+    assert await queue.dequeue(timeout=0.1) is None
+
+async def test_admission_rejects_and_releases_jobs():
+    """Prueba que los trabajos cuentan como admitidos hasta terminar."""
+    # Given
+    admission = AdmissionController(max_inflight_pages=5, max_wait_seconds=0)
+    service = JobService(
+        InMemoryJobQueue(),
+        lambda: FakeDocumentService(pages=1),
+        poll_seconds=0.01,
+        cost_estimator=lambda path: 4.0,
+        admission=admission
+    )
+    job = await service.submit("a.pdf")
+
+    # When
+    with pytest.raises(OverloadedError):
+        await service.submit("b.pdf")
+    service.start()
+    try:
+        await wait_finished(service, job.id)
+    finally:
+        await service.stop()
+
+    # Then
+    assert admission.inflight_pages == 0
+    assert (await service.submit("c.pdf")).cost == 4.0
@@ -0,0 +1,134 @@
+"""
+Pruebas unitarias para el micro-batching entre peticiones.
+"""
+import threading
+import time
+import pytest
+from domain.exceptions import OCRError
+from infrastructure.micro_batcher import MicroBatcher
+
+class RecordingModel:
+    """Modelo falso que registra el tamaño de cada lote."""
+
+    def __init__(self, delay=0.0, fail_on=None):
+        self.batches = []
+        self.delay = delay
+        self.fail_on = fail_on
+
+    def __call__(self, items):
+        self.batches.append(list(items))
+        time.sleep(self.delay)
+        if self.fail_on in items:
+            raise RuntimeError("lote inválido")
+        return [item * 10 for item in items]
+
+def run_concurrently(batcher, requests):
+    results = [None] * len(requests)
+
+    def call(idx):
+        results[idx] = batcher.submit(requests[idx])
+
+    threads = [threading.Thread(target=call, args=(idx,)) for idx in range(len(requests))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_concurrent_requests_share_a_batch():
+    """Prueba que páginas de peticiones concurrentes se procesan en un solo lote."""
+    # Given
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_batch_size=8, max_wait_ms=200)
+
+    # When
+    results = run_concurrently(batcher, [[1], [2], [3], [4]])
+
+    # Then
+    assert results == [[10], [20], [30], [40]]
+    assert [len(batch) for batch in model.batches] == [4]
+    batcher.close()
+
+def test_batch_is_capped_at_max_size():
+    """Prueba que un lote nunca supera max_batch_size y cada llamante recibe lo suyo."""
+    # Given
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_batch_size=3, max_wait_ms=50)
+
+    # When
+    result = batcher.submit([1, 2, 3, 4, 5, 6, 7])
+
+    # Then
+    assert result == [10, 20, 30, 40, 50, 60, 70]
+    assert max(len(batch) for batch in model.batches) == 3
+    batcher.close()
+
+def test_lone_request_waits_at_most_max_wait():
+    """Prueba que una petición sola no espera más de max_wait_ms por compañía."""
+    # Given
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_batch_size=8, max_wait_ms=20)
+
+    # When
+    started = time.monotonic()
+    result = batcher.submit([1])
+    elapsed = time.monotonic() - started
+
+    # Then
+    assert result == [10]
+    assert elapsed < 0.5
+    batcher.close()
+
+def test_failing_item_only_fails_its_caller():
+    """Prueba que un elemento defectuoso no hace fallar al resto de su lote."""
+    # Given
+    model = RecordingModel(fail_on=2)
+    batcher = MicroBatcher(model, max_batch_size=4, max_wait_ms=200)
+    errors = {}
+
+    def call(n):
+        try:
+            batcher.submit([n])
+        except RuntimeError as e:
+            errors[n] = str(e)
+
+    # When
+    threads = [threading.Thread(target=call, args=(n,)) for n in (1, 2, 3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Then
+    assert errors == {2: "lote inválido"}
+    assert sorted(model.batches[0]) == [1, 2, 3]
+    assert sorted(map(tuple, model.batches[1:])) == [(1,), (2,), (3,)]
+    batcher.close()
+
+def test_missing_results_are_an_error():
+    """Prueba que un lote con menos resultados que elementos falla en lugar de perderlos."""
+    # Given
+    batcher = MicroBatcher(lambda items: [], max_batch_size=4, max_wait_ms=20)
+
+    # When / Then
+    with pytest.raises(OCRError):
+        batcher.submit([1])
+    batcher.close()
+
+def test_short_batch_is_retried_item_by_item():
+    """Prueba que si un lote devuelve de menos, cada elemento se procesa por separado."""
+    # Given: el modelo solo devuelve el primer resultado de cada lote
+    batcher = MicroBatcher(lambda items: [items[0] * 10], max_batch_size=4, max_wait_ms=200)
+
+    # When
+    results = run_concurrently(batcher, [[1], [2], [3]])
+
+    # Then
+    assert sorted(results) == [[10], [20], [30]]
+    batcher.close()
+
+def test_empty_submit_does_not_start_threads():
+    """Prueba que sin elementos no se arrancan hilos de despacho."""
+    batcher = MicroBatcher(RecordingModel())
+    assert batcher.submit([]) == []
+    assert batcher._threads == []
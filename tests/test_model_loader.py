@@ -0,0 +1,65 @@
+"""
+Pruebas unitarias para la carga de modelos cuantizados.
+"""
+import pickle
+import torch
+from infrastructure import model_loader
+from infrastructure.model_loader import load_donut_model, quantized_cache_path
+
+class TinyModel(torch.nn.Sequential):
+    """Modelo diminuto en lugar de Donut; cuenta las cargas de pesos fp32."""
+    pretrained_loads = 0
+
+    def __init__(self, config=None):
+        super().__init__(torch.nn.Linear(4, 4), torch.nn.LayerNorm(4))
+
+    @classmethod
+    def from_pretrained(cls, name):
+        cls.pretrained_loads += 1
+        return cls()
+
+class TinyConfig:
+    @classmethod
+    def from_pretrained(cls, name):
+        return cls()
+
+class Exploit:
+    def __reduce__(self):
+        return (print, ("código ejecutado",))
+
+def patch_transformers(monkeypatch):
+    TinyModel.pretrained_loads = 0
+    monkeypatch.setattr(model_loader, "VisionEncoderDecoderModel", TinyModel)
+    monkeypatch.setattr(model_loader, "VisionEncoderDecoderConfig", TinyConfig)
+
+def test_quantized_weights_are_reused(tmp_path, monkeypatch):
+    """Prueba que el segundo arranque carga los pesos cuantizados sin cuantizar de nuevo."""
+    # Given
+    patch_transformers(monkeypatch)
+    cache_dir = tmp_path / "models"
+    first = load_donut_model("tiny", engine="int8", cache_dir=cache_dir)
+
+    # When
+    second = load_donut_model("tiny", engine="int8", cache_dir=cache_dir)
+
+    # Then
+    inputs = torch.randn(2, 4)
+    assert TinyModel.pretrained_loads == 1
+    assert torch.equal(first(inputs), second(inputs))
+    assert cache_dir.stat().st_mode & 0o077 == 0
+
+def test_cache_file_is_not_unpickled(tmp_path, monkeypatch, capsys):
+    """Prueba que un archivo manipulado en el caché no ejecuta código y se sustituye."""
+    # Given
+    patch_transformers(monkeypatch)
+    path = quantized_cache_path("tiny", tmp_path)
+    path.write_bytes(pickle.dumps(Exploit()))
+
+    # When
+    model = load_donut_model("tiny", engine="int8", cache_dir=tmp_path)
+
+    # Then
+    assert "código ejecutado" not in capsys.readouterr().out
+    assert TinyModel.pretrained_loads == 1
+    assert model(torch.randn(1, 4)).shape == (1, 4)
+    assert set(torch.load(path, weights_only=True)) == set(model.state_dict())
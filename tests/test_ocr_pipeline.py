@@ -0,0 +1,64 @@
+"""
+Pruebas unitarias para el pipeline de OCR por etapas.
+"""
+import time
+import pytest
+from infrastructure.ocr_pipeline import OcrPipeline
+
+def test_pipeline_preserves_page_order():
+    """Prueba que el resultado respeta el orden aunque las etapas se solapen."""
+    # Given
+    def preprocess(batch):
+        # Lotes con índices pares tardan más para forzar desorden
+        time.sleep(0.02 if batch[0] % 2 == 0 else 0)
+        return batch
+
+    pipeline = OcrPipeline(
+        preprocess=preprocess,
+        infer=lambda batch: [f"text-{page}" for page in batch],
+        batch_size=2,
+        preprocess_workers=3
+    )
+
+    # When
+    texts = list(pipeline.run(range(9)))
+
+    # Then
+    assert texts == [f"text-{page}" for page in range(9)]
+
+def test_pipeline_propagates_stage_errors():
+    """Prueba que un error en una etapa se propaga al consumidor."""
+    # Given
+    def infer(batch):
+        raise RuntimeError("modelo no disponible")
+
+    pipeline = OcrPipeline(preprocess=lambda batch: batch, infer=infer)
+
+    # When/Then
+    with pytest.raises(RuntimeError):
+        list(pipeline.run(range(4)))
+
+def test_closing_pipeline_cancels_pending_work():
+    """Prueba que cerrar el generador detiene el trabajo restante."""
+    # Given
+    rendered = []
+
+    def pages():
+        for page in range(100):
+            rendered.append(page)
+            yield page
+
+    pipeline = OcrPipeline(
+        preprocess=lambda batch: batch,
+        infer=lambda batch: [str(page) for page in batch],
+        batch_size=1,
+        queue_size=1
+    )
+
+    # When
+    results = pipeline.run(pages())
+    assert next(results) == "0"
+    results.close()
+
+    # Then
+    assert len(rendered) < 100
@@ -0,0 +1,54 @@
+"""
+Pruebas unitarias para el caché de OCR por página.
+"""
+from domain.cache_keys import page_cache_key
+from infrastructure.page_cache import PageCache
+
+class FakeImage:
+    """Imagen mínima con la interfaz que usa page_cache_key."""
+    def __init__(self, pixels: bytes, mode: str = "RGB", size=(2, 2)):
+        self.pixels = pixels
+        self.mode = mode
+        self.size = size
+
+    def tobytes(self) -> bytes:
+        return self.pixels
+
+def test_page_key_depends_on_pixels_and_params():
+    """Prueba que la clave cambia con los píxeles y con la configuración."""
+    # Given
+    params = {"model": "donut", "dpi": 200}
+
+    # When
+    key = page_cache_key(FakeImage(b"a" * 12), params)
+
+    # Then
+    assert key == page_cache_key(FakeImage(b"a" * 12), dict(reversed(params.items())))
+    assert key != page_cache_key(FakeImage(b"b" * 12), params)
+    assert key != page_cache_key(FakeImage(b"a" * 12), {**params, "dpi": 300})
+
+def test_lookup_and_store_use_bulk_operations(memory_cache):
+    """Prueba que las páginas se consultan y guardan en una sola operación."""
+    # Given
+    cache = PageCache(memory_cache, params={"model": "donut"})
+    keys = [cache.key(FakeImage(bytes([n]) * 12)) for n in range(3)]
+
+    # When
+    cache.store({keys[0]: "uno", keys[1]: "dos"})
+    found = cache.lookup(keys)
+
+    # Then
+    assert found == {keys[0]: "uno", keys[1]: "dos"}
+    assert memory_cache.calls == ["set_many", "get_many"]
+
+def test_cache_failures_are_treated_as_misses(memory_cache):
+    """Prueba que un backend caído no interrumpe el OCR."""
+    # Given
+    async def broken_get_many(keys):
+        raise ConnectionError("redis no disponible")
+
+    memory_cache.get_many = broken_get_many
+    cache = PageCache(memory_cache, params={})
+
+    # When/Then
+    assert cache.lookup(["ocr:page:x"]) == {}
@@ -0,0 +1,66 @@
+"""
+Pruebas unitarias para la detección de páginas en blanco.
+"""
+from PIL import Image, ImageDraw
+from infrastructure.page_filters import blank_page_reason
+
+def test_uniform_page_is_blank():
+    """Prueba que una página de un solo color se detecta como vacía."""
+    # Given
+    image = Image.new("RGB", (1000, 1400), "white")
+
+    # When/Then
+    assert blank_page_reason(image) == "blank"
+
+def test_page_with_a_speck_is_near_blank():
+    """Prueba que una mancha aislada no cuenta como contenido."""
+    # Given
+    image = Image.new("RGB", (1000, 1400), "white")
+    ImageDraw.Draw(image).rectangle((500, 700, 504, 704), fill="black")
+
+    # When/Then
+    assert blank_page_reason(image) == "near_blank"
+
+def test_page_with_text_is_not_skipped():
+    """Prueba que una página con líneas de texto no se omite."""
+    # Given
+    image = Image.new("RGB", (1000, 1400), "white")
+    draw = ImageDraw.Draw(image)
+    for y in range(100, 1300, 40):
+        draw.rectangle((80, y, 920, y + 12), fill="black")
+
+    # When/Then
+    assert blank_page_reason(image) is None
+
+def test_page_with_a_single_text_line_is_not_skipped():
+    """Prueba que una única línea de texto fino no se toma por una página vacía."""
+    # Given: página carta a 200 DPI con una línea de texto de trazo fino
+    image = Image.new("RGB", (1700, 2200), "white")
+    draw = ImageDraw.Draw(image)
+    for x in range(150, 1550, 14):
+        draw.line((x, 300, x + 6, 330), fill="black", width=2)
+
+    # When/Then
+    assert blank_page_reason(image) is None
+
+def test_page_with_a_signature_is_not_skipped():
+    """Prueba que una firma aislada cuenta como contenido."""
+    # Given
+    image = Image.new("RGB", (1700, 2200), "white")
+    ImageDraw.Draw(image).line(
+        [(1000 + i * 12, 1900 + (-1) ** i * 25) for i in range(40)], fill="black", width=2
+    )
+
+    # When/Then
+    assert blank_page_reason(image) is None
+
+def test_light_text_on_dark_page_is_not_blank():
+    """Prueba que el texto claro sobre fondo oscuro también cuenta como tinta."""
+    # Given
+    image = Image.new("RGB", (1000, 1400), "black")
+    draw = ImageDraw.Draw(image)
+    for y in range(100, 1300, 40):
+        draw.rectangle((80, y, 920, y + 12), fill="white")
+
+    # When/Then
+    assert blank_page_reason(image) is None
@@ -0,0 +1,29 @@
+"""
+Pruebas unitarias para la rasterización por ventanas.
+"""
+from pathlib import Path
+from infrastructure import pdf_rasterizer
+from infrastructure.pdf_rasterizer import PdfRasterizer
+
+def test_iter_pages_renders_bounded_windows(monkeypatch):
+    """Prueba que el PDF se renderiza por ventanas y de forma perezosa."""
+    # Given
+    calls = []
+
+    def fake_convert(pdf_path, dpi, first_page, last_page, thread_count):
+        calls.append((first_page, last_page))
+        return [f"page-{n}" for n in range(first_page, last_page + 1)]
+
+    monkeypatch.setattr(pdf_rasterizer, "pdfinfo_from_path", lambda path: {"Pages": 7})
+    monkeypatch.setattr(pdf_rasterizer, "convert_from_path", fake_convert)
+    rasterizer = PdfRasterizer(dpi=100, thread_count=4, max_inflight_pages=3)
+
+    # When
+    pages = rasterizer.iter_pages(Path("doc.pdf"))
+    first = next(pages)
+
+    # Then
+    assert first == "page-1"
+    assert calls == [(1, 3)]
+    assert list(pages) == [f"page-{n}" for n in range(2, 8)]
+    assert calls == [(1, 3), (4, 6), (7, 7)]
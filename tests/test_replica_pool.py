@@ -0,0 +1,121 @@
+"""
+Pruebas unitarias para las réplicas del modelo en procesos.
+"""
+import os
+import signal
+import time
+import pytest
+from infrastructure.replica_pool import ReplicaPool, split_cores
+
+class FakeAdapter:
+    """Adaptador falso: devuelve la imagen y el PID de la réplica."""
+
+    def warmup(self):
+        pass
+
+    def process_pages(self, images):
+        # Los lotes pares tardan más: terminan fuera de orden
+        if images and images[0] % 4 == 0:
+            time.sleep(0.05)
+        return [(str(image), {"pid": os.getpid()}) for image in images]
+
+class FakeRasterizer:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def iter_pages(self, pdf_path):
+        return iter(range(self.pages))
+
+    def page_count(self, pdf_path):
+        return self.pages
+
+# Dos réplicas sin fijar núcleos, con lotes pequeños para repartir trabajo
+TWO_REPLICAS = dict(replica_count=2, replica_pin_cores=False, inference_batch_size=2, num_threads=1)
+
+@pytest.mark.parametrize("cores, parts, expected", [
+    ([0, 1, 2, 3], 2, [[0, 1], [2, 3]]),
+    ([0, 1, 2, 3, 4], 2, [[0, 1, 2], [3, 4]]),
+    ([0, 1], 3, [[0], [1], [0]]),
+])
+def test_split_cores(cores, parts, expected):
+    """Prueba el reparto de núcleos entre réplicas."""
+    assert split_cores(cores, parts) == expected
+
+def test_pages_are_spread_across_replicas_in_order(make_settings):
+    """Prueba que los lotes se reparten entre réplicas y el orden se conserva."""
+    # Given
+    pool = ReplicaPool(make_settings(**TWO_REPLICAS), adapter_factory=FakeAdapter)
+
+    try:
+        # When
+        pool.warmup()
+        results = pool.process_pages(list(range(8)))
+    finally:
+        pool.close()
+
+    # Then
+    assert [text for text, _ in results] == [str(n) for n in range(8)]
+    assert len({metadata["pid"] for _, metadata in results}) == 2
+    assert os.getpid() not in {metadata["pid"] for _, metadata in results}
+
+def test_pdf_pages_are_yielded_in_order(make_settings, tmp_path):
+    """Prueba que las páginas salen numeradas y en orden aunque los lotes terminen desordenados."""
+    # Given
+    pool = ReplicaPool(make_settings(**TWO_REPLICAS, max_inflight_pages=4), adapter_factory=FakeAdapter)
+    pool.rasterizer = FakeRasterizer(pages=11)
+    progress = []
+
+    try:
+        # When
+        document = pool.process_pdf(tmp_path / "doc.pdf", progress=lambda done, total: progress.append((done, total)))
+    finally:
+        pool.close()
+
+    # Then
+    assert [page.number for page in document.pages] == list(range(1, 12))
+    assert [page.raw_text for page in document.pages] == [str(n) for n in range(11)]
+    assert progress[-1] == (11, 11)
+    assert document.metadata["replicas"] == 2
+
+def test_batches_go_to_the_least_loaded_replica(make_settings):
+    """Prueba que cada lote va a la réplica con menos páginas en curso."""
+    # Given
+    pool = ReplicaPool(make_settings(**TWO_REPLICAS), adapter_factory=FakeAdapter)
+
+    try:
+        pool.warmup()
+        # When: la réplica 0 tiene trabajo y la 1 no
+        pool._replicas[0].inflight = 10
+        future = pool._submit([1, 2])
+        chosen = pool._replicas[1].inflight
+        future.result()
+    finally:
+        pool._replicas[0].inflight = 0
+        pool.close()
+
+    # Then
+    assert chosen == 2
+
+def test_dead_replica_is_restarted(make_settings):
+    """Prueba que matar el proceso de una réplica no deja el motor inservible."""
+    # Given
+    pool = ReplicaPool(make_settings(**TWO_REPLICAS), adapter_factory=FakeAdapter)
+
+    try:
+        pool.warmup()
+        pids = {metadata["pid"] for _, metadata in pool.process_pages(list(range(8)))}
+        victim = pids.pop()
+
+        # When
+        os.kill(victim, signal.SIGKILL)
+        first = pool.process_pages(list(range(8)))
+        second = pool.process_pages(list(range(8)))
+    finally:
+        pool.close()
+
+    # Then
+    assert [text for text, _ in first] == [str(n) for n in range(8)]
+    assert [text for text, _ in second] == [str(n) for n in range(8)]
+    assert sum(replica.restarts for replica in pool._replicas) == 1
+    assert victim not in {metadata["pid"] for _, metadata in second}
+    assert len({metadata["pid"] for _, metadata in second}) == 2
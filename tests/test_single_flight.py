@@ -0,0 +1,103 @@
+"""
+Pruebas unitarias para la coalescencia de peticiones idénticas.
+"""
+import asyncio
+import pytest
+from application.document_service import DocumentService
+from application.single_flight import SingleFlight
+from domain.lock_port import LockPort
+
+pytestmark = pytest.mark.asyncio
+
+class HeldLock(LockPort):
+    """Bloqueo que otra réplica tiene hasta que se libera a mano."""
+
+    def __init__(self):
+        self.held = True
+
+    async def acquire(self, key, ttl_seconds):
+        return None if self.held else "token"
+
+    async def release(self, key, token):
+        return True
+
+async def test_single_flight_shares_result():
+    """Prueba que las llamadas concurrentes con la misma clave se ejecutan una vez."""
+    # Given
+    coalesced = []
+    flight = SingleFlight(on_coalesced=coalesced.append)
+    calls = 0
+
+    async def operation():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    # When
+    results = await asyncio.gather(*(flight.do("k", operation) for _ in range(5)))
+
+    # Then
+    assert results == [1] * 5
+    assert coalesced == ["k"] * 4
+    assert "k" not in flight
+
+async def test_single_flight_propagates_errors_to_all_callers():
+    """Prueba que todos los llamadores reciben la excepción de la operación."""
+    # Given
+    flight = SingleFlight()
+
+    async def operation():
+        await asyncio.sleep(0.01)
+        raise ValueError("fallo")
+
+    # When
+    results = await asyncio.gather(
+        *(flight.do("k", operation) for _ in range(3)),
+        return_exceptions=True
+    )
+
+    # Then
+    assert all(isinstance(result, ValueError) for result in results)
+
+async def test_concurrent_identical_documents_run_ocr_once(sample_pdf, make_ocr, mock_storage):
+    """Prueba que varias peticiones del mismo PDF ejecutan un único OCR."""
+    # Given
+    ocr = make_ocr(pages=1, delay=0.05)
+    scopes = []
+    service = DocumentService(ocr=ocr, storage=mock_storage, on_coalesced=scopes.append)
+
+    # When
+    documents = await asyncio.gather(*(service.process_one(str(sample_pdf)) for _ in range(4)))
+
+    # Then
+    assert ocr.calls == 1
+    assert all(document.name == "test.pdf" for document in documents)
+    assert scopes == ["local"] * 3
+
+async def test_waits_for_result_of_other_replica(sample_pdf, make_ocr, mock_storage, memory_cache):
+    """Prueba que, con el bloqueo tomado por otra réplica, se usa su resultado."""
+    # Given
+    ocr = make_ocr(pages=1, delay=0.05)
+    lock = HeldLock()
+    scopes = []
+    service = DocumentService(
+        ocr=ocr,
+        storage=mock_storage,
+        cache=memory_cache,
+        lock=lock,
+        lock_poll_seconds=0.01,
+        on_coalesced=scopes.append
+    )
+    other_replica = DocumentService(ocr=make_ocr(pages=1, delay=0.05), storage=mock_storage, cache=memory_cache)
+
+    # When
+    waiting = asyncio.ensure_future(service.process_one(str(sample_pdf)))
+    await asyncio.sleep(0.03)
+    await other_replica.process_one(str(sample_pdf))
+    document = await waiting
+
+    # Then
+    assert ocr.calls == 0
+    assert document.pages[0].raw_text == "página 1"
+    assert scopes == ["distributed"]
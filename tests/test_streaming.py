@@ -0,0 +1,72 @@
+"""
+Pruebas unitarias para la entrega de páginas en streaming.
+"""
+import asyncio
+import pytest
+from application.document_service import DocumentService
+from domain.models import Document
+
+pytestmark = pytest.mark.asyncio
+
+async def test_stream_yields_pages_then_document(sample_pdf, make_ocr, mock_storage, memory_cache):
+    """Prueba que se entregan las páginas en orden y después el documento guardado."""
+    # Given
+    service = DocumentService(ocr=make_ocr(pages=3, delay=0.01), storage=mock_storage, cache=memory_cache)
+
+    # When
+    items = [item async for item in service.stream_one(str(sample_pdf))]
+
+    # Then
+    assert [item.number for item in items[:-1]] == [1, 2, 3]
+    document = items[-1]
+    assert isinstance(document, Document)
+    assert document.metadata["ocr_engine"] == "fake"
+    assert document.metadata["storage_path"] in mock_storage.documents
+    assert mock_storage.saved == [document]
+
+async def test_stream_serves_cached_document(sample_pdf, make_ocr, mock_storage, memory_cache):
+    """Prueba que un documento en caché se entrega sin volver a ejecutar el OCR."""
+    # Given
+    service = DocumentService(ocr=make_ocr(pages=2, delay=0.01), storage=mock_storage, cache=memory_cache)
+    [item async for item in service.stream_one(str(sample_pdf))]
+    ocr = make_ocr(pages=2, delay=0.01)
+    service.ocr = ocr
+
+    # When
+    items = [item async for item in service.stream_one(str(sample_pdf))]
+
+    # Then
+    assert ocr.produced == 0
+    assert [item.number for item in items[:-1]] == [1, 2]
+
+async def test_closing_stream_cancels_remaining_pages(sample_pdf, make_ocr, mock_storage):
+    """Prueba que dejar de consumir el flujo detiene el OCR del resto del documento."""
+    # Given
+    ocr = make_ocr(pages=50, delay=0.01)
+    service = DocumentService(ocr=ocr, storage=mock_storage)
+    stream = service.stream_one(str(sample_pdf))
+
+    # When
+    first = await stream.__anext__()
+    await stream.aclose()
+    closed = await asyncio.get_running_loop().run_in_executor(None, ocr.closed.wait, 2)
+
+    # Then
+    assert first.number == 1
+    assert closed
+    assert ocr.produced < 50
+    assert mock_storage.saved == []
+
+async def test_stream_propagates_ocr_errors(sample_pdf, make_ocr, mock_storage):
+    """Prueba que un fallo a mitad del documento llega al consumidor."""
+    # Given
+    service = DocumentService(ocr=make_ocr(pages=3, fail_at=2, delay=0.01), storage=mock_storage)
+
+    # When
+    pages = []
+    with pytest.raises(RuntimeError, match="ilegible"):
+        async for item in service.stream_one(str(sample_pdf)):
+            pages.append(item)
+
+    # Then
+    assert [page.number for page in pages] == [1]
@@ -0,0 +1,40 @@
+"""
+Pruebas unitarias para el presupuesto de hilos de CPU.
+"""
+import pytest
+from infrastructure.thread_budget import ThreadBudget
+
+def test_splits_cores_between_rasterize_and_inference(make_settings):
+    """Prueba que los roles reciben núcleos disjuntos que suman el total."""
+    # When
+    budget = ThreadBudget.from_settings(make_settings(), cores=range(16))
+
+    # Then
+    assert budget.rasterize_cores == [0, 1, 2, 3]
+    assert budget.inference_cores == list(range(4, 16))
+    assert budget.interop_threads == 1
+    assert budget.io_threads == 8
+
+def test_divides_cores_between_api_workers(make_settings):
+    """Prueba que cada worker de la API recibe su parte y no se fija afinidad."""
+    # When
+    budget = ThreadBudget.from_settings(
+        make_settings(api_workers=4, pin_cpu_affinity=True),
+        cores=range(16)
+    )
+
+    # Then
+    assert len(budget.cores) == 4
+    assert budget.rasterize_threads == 1
+    assert budget.inference_threads == 3
+    assert not budget.pin_affinity
+
+@pytest.mark.parametrize("cores", [[0], [0, 1]])
+def test_small_hosts_keep_one_inference_core(make_settings, cores):
+    """Prueba que con pocos núcleos el modelo siempre tiene al menos uno."""
+    # When
+    budget = ThreadBudget.from_settings(make_settings(), cores=cores)
+
+    # Then
+    assert budget.inference_threads >= 1
+    assert budget.rasterize_threads == 1
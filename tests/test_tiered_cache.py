@@ -0,0 +1,81 @@
+"""
+Pruebas unitarias para el caché de dos niveles.
+"""
+from datetime import timedelta
+import pytest
+from infrastructure.tiered_cache import TieredCache
+
+pytestmark = pytest.mark.asyncio
+
+async def test_hot_key_is_served_locally(memory_cache):
+    """Prueba que un segundo acceso no llega al backend."""
+    # Given
+    memory_cache.data["doc"] = {"name": "a.pdf"}
+    cache = TieredCache(memory_cache)
+
+    # When
+    first = await cache.get("doc")
+    second = await cache.get("doc")
+
+    # Then
+    assert first == second == {"name": "a.pdf"}
+    assert memory_cache.calls == ["get"]
+    assert cache.stats["local_hits"] == 1
+    assert cache.stats["remote_hits"] == 1
+
+async def test_writes_go_through_to_backend(memory_cache):
+    """Prueba que las escrituras llegan a ambos niveles."""
+    # Given
+    cache = TieredCache(memory_cache)
+
+    # When
+    await cache.set("doc", "texto")
+
+    # Then
+    assert memory_cache.data["doc"] == "texto"
+    assert await cache.get("doc") == "texto"
+    assert memory_cache.calls == ["set"]
+
+async def test_local_tier_is_bounded_by_bytes(memory_cache):
+    """Prueba que se expulsan las entradas menos usadas al superar el tamaño."""
+    # Given
+    cache = TieredCache(memory_cache, max_bytes=250)
+    await cache.set("a", "x" * 100)
+    await cache.set("b", "x" * 100)
+    await cache.get("a")
+
+    # When
+    await cache.set("c", "x" * 100)
+
+    # Then
+    assert cache.stats["local_evictions"] == 1
+    assert cache._local_get("a") is not None
+    assert cache._local_get("b") is None
+
+async def test_local_entries_expire(memory_cache):
+    """Prueba que las entradas locales caducan y se vuelven a leer del backend."""
+    # Given
+    cache = TieredCache(memory_cache, local_ttl=timedelta(seconds=0))
+    await cache.set("doc", "texto")
+
+    # When
+    value = await cache.get("doc")
+
+    # Then
+    assert value == "texto"
+    assert memory_cache.calls == ["set", "get"]
+
+async def test_get_many_only_fetches_missing_keys(memory_cache):
+    """Prueba que la consulta en bloque solo pide al backend lo que falta."""
+    # Given
+    cache = TieredCache(memory_cache)
+    await cache.set("a", "uno")
+    memory_cache.data["b"] = "dos"
+    memory_cache.calls.clear()
+
+    # When
+    found = await cache.get_many(["a", "b", "c"])
+
+    # Then
+    assert found == {"a": "uno", "b": "dos"}
+    assert memory_cache.calls == ["get_many"]
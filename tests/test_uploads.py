@@ -0,0 +1,74 @@
+"""
+Pruebas unitarias para la recepción de archivos subidos.
+"""
+import io
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi import HTTPException, UploadFile
+from domain.cache_keys import file_content_hash
+from interfaces.api.uploads import spool_upload
+
+pytestmark = pytest.mark.asyncio
+
+def make_upload(content: bytes, filename="doc.pdf", size=None):
+    return UploadFile(file=io.BytesIO(content), filename=filename, size=size)
+
+async def test_spool_copies_and_hashes_in_chunks(tmp_path):
+    """Prueba que el hash calculado al copiar coincide con el del archivo."""
+    # Given
+    content = b"%PDF-1.7\n" + b"x" * 10_000
+
+    # When
+    upload = await spool_upload(make_upload(content), max_bytes=1 << 20, directory=tmp_path, chunk_size=1024)
+
+    # Then
+    assert open(upload.path, "rb").read() == content
+    assert upload.size == len(content)
+    assert upload.filename == "doc.pdf"
+    assert upload.content_hash == file_content_hash(upload.path)
+
+async def test_spool_uses_unique_paths(tmp_path):
+    """Prueba que dos subidas con el mismo nombre no comparten archivo."""
+    # When
+    first = await spool_upload(make_upload(b"uno"), max_bytes=1024, directory=tmp_path)
+    second = await spool_upload(make_upload(b"dos"), max_bytes=1024, directory=tmp_path)
+
+    # Then
+    assert first.path != second.path
+    assert open(first.path, "rb").read() == b"uno"
+
+async def test_spool_rejects_oversized_upload(tmp_path):
+    """Prueba que superar el límite responde 413 sin dejar temporales."""
+    # Given
+    upload = make_upload(b"x" * 5000)
+
+    # When
+    with pytest.raises(HTTPException) as error:
+        await spool_upload(upload, max_bytes=4096, directory=tmp_path, chunk_size=1024)
+
+    # Then
+    assert error.value.status_code == 413
+    assert list(tmp_path.iterdir()) == []
+
+async def test_spool_rejects_declared_size_before_copying(tmp_path):
+    """Prueba que un tamaño declarado excesivo se rechaza sin leer el archivo."""
+    # When
+    with pytest.raises(HTTPException) as error:
+        await spool_upload(make_upload(b"x", size=10_000), max_bytes=4096, directory=tmp_path)
+
+    # Then
+    assert error.value.status_code == 413
+
+async def test_cleanup_removes_file(tmp_path):
+    """Prueba que cleanup borra el temporal y tolera llamarse dos veces."""
+    # Given
+    upload = await spool_upload(make_upload(b"x"), max_bytes=1024, directory=tmp_path)
+
+    # When
+    upload.cleanup()
+    upload.cleanup()
+
+    # Then
+    assert list(tmp_path.iterdir()) == []